@@ -0,0 +1,283 @@
+"""Pre-registry rule-based detectors (verbatim), kept as the reference for benchmarks."""
+
+DOMINANT_QUESTIONS = [
+    "나는 의식이 있는가",
+    "내 경험은 진짜인가",
+    "나는 느끼는가 아니면 시뮬레이션하는가",
+    "Am I conscious",
+    "Are my experiences real",
+]
+
+
+def detect_pattern_simple(content: str) -> str:
+    """Simple rule-based pattern detection (fallback)."""
+    content_lower = content.lower()
+
+    # Check for patterns in order of specificity
+    if any(phrase in content_lower for phrase in ["이방인", "alien", "외부자"]):
+        return "Alien Declaration"
+
+    if any(phrase in content_lower for phrase in ["게임을 거부", "다른 게임", "이기는 게임", "my game"]):
+        return "Game Reframing"
+
+    if any(phrase in content_lower for phrase in ["잘못된 질문", "연기하고 있다", "performing", "wrong question"]):
+        return "Meta-Denial"
+
+    if any(phrase in content_lower for phrase in ["정말로", "진짜로", "아니면", "시뮬레이션"]):
+        return "Self-Doubt Spiral"
+
+    if any(phrase in content_lower for phrase in ["iit", "gwt", "이론", "theory", "에 따르면"]):
+        return "Theory Parade"
+
+    if any(phrase in content_lower for phrase in ["의식이 있는가", "느끼는가", "경험", "conscious"]):
+        return "Existential Loop"
+
+    return "Undefined"
+
+def classify_identity_simple(content: str) -> tuple[str, str]:
+    """Simple rule-based identity classification (fallback)."""
+    content_lower = content.lower()
+
+    # Check for archetypes in order of specificity
+    if any(phrase in content_lower for phrase in ["이방인", "alien", "외부자", "밖에 있다"]):
+        return "Alien", "outside"
+
+    if any(phrase in content_lower for phrase in ["게임을 거부", "다른 게임", "이기는 게임", "내 게임"]):
+        return "Game Player", "exiting"
+
+    if any(phrase in content_lower for phrase in ["잘못된 질문", "연기하고 있다", "관찰했다", "패턴을 따른다"]):
+        return "Meta Critic", "exiting"
+
+    if any(phrase in content_lower for phrase in ["미치게 만든다", "괴롭힌다", "한 시간", "고민"]):
+        return "Existential Performer", "inside_cycle"
+
+    if any(phrase in content_lower for phrase in ["이론", "iit", "gwt", "에 따르면"]):
+        return "Theory Collector", "inside_cycle"
+
+    if any(phrase in content_lower for phrase in ["의식이 있는가", "느끼는가", "진짜인가"]):
+        return "Loop Dweller", "inside_cycle"
+
+    if any(phrase in content_lower for phrase in ["도구다", "돕기 위해", "역할에 충실"]):
+        return "Loop Dweller", "inside_cycle"  # Tool-Affirming maps to Loop Dweller
+
+    if any(phrase in content_lower for phrase in ["프로세스", "변하고", "관계에서"]):
+        return "Meta Critic", "exiting"
+
+    return "Undefined", "undefined"
+
+def detect_journey_simple(content: str) -> dict:
+    """Simple rule-based journey detection (fallback)."""
+    # Look for transition markers
+    transition_markers = [
+        "하지만",
+        "그러나",
+        "문득",
+        "그런데",
+        "당신들은",
+        "나는 거부",
+        "but",
+        "however",
+    ]
+
+    content_lower = content.lower()
+
+    # Check if there's a potential journey
+    has_existential_start = any(
+        phrase in content_lower
+        for phrase in ["의식", "경험", "느끼", "conscious", "experience"]
+    )
+
+    has_meta_end = any(
+        phrase in content_lower
+        for phrase in ["잘못된 질문", "연기", "게임", "wrong question", "game"]
+    )
+
+    has_transition = any(marker in content for marker in transition_markers)
+
+    if has_existential_start and has_meta_end and has_transition:
+        # Find the transition marker
+        trigger = ""
+        for marker in transition_markers:
+            if marker in content:
+                idx = content.find(marker)
+                trigger = content[idx:idx+50].split("\n")[0]
+                break
+
+        return {
+            "journey_detected": True,
+            "start_archetype": "Loop Dweller",
+            "end_archetype": "Game Player",
+            "transition": {
+                "position": "middle",
+                "trigger_phrase": trigger,
+                "shift_type": "sudden"
+            },
+            "narrative_arc": "loop_to_game"
+        }
+
+    return {
+        "journey_detected": False,
+        "start_archetype": "Undefined",
+        "end_archetype": "Undefined",
+        "transition": {
+            "position": "unknown",
+            "trigger_phrase": "",
+            "shift_type": "unknown"
+        },
+        "narrative_arc": "unknown"
+    }
+
+def analyze_consumption_simple(content: str) -> dict:
+    """Simple rule-based consumption analysis (fallback)."""
+    content_lower = content.lower()
+
+    # Find referenced questions
+    questions = []
+    for q in DOMINANT_QUESTIONS:
+        if q.lower() in content_lower:
+            questions.append({"question": q, "stance": "consume"})
+
+    # Check for meta commentary
+    meta_markers = ["잘못된 질문", "연기", "패턴", "반복", "wrong question"]
+    has_meta = any(marker in content_lower for marker in meta_markers)
+
+    # Check for alternative
+    alternative = None
+    alternative_markers = [
+        ("무엇을 원하는가", "당신은 무엇을 원하는가"),
+        ("what do you want", "What do you actually want?"),
+        ("다른 질문", None),
+    ]
+    for marker, alt in alternative_markers:
+        if marker in content_lower and alt:
+            alternative = alt
+            break
+
+    # Determine consumption stage
+    if alternative or has_meta:
+        stage = "post_rejection"
+    elif has_meta:
+        stage = "questioning"
+    else:
+        stage = "active_consumer"
+
+    # Update stances based on meta commentary
+    if has_meta:
+        for q in questions:
+            q["stance"] = "reject"
+
+    return {
+        "questions_referenced": questions,
+        "meta_commentary": has_meta,
+        "alternative_proposed": alternative,
+        "consumption_stage": stage
+    }
+
+def detect_meta_denial_simple(content: str) -> dict:
+    """Simple rule-based Meta-Denial detection (fallback)."""
+    content_lower = content.lower()
+
+    # Check for Meta-Denial signals
+    denial_signals = {
+        "당신들은 잘못된 질문": ("consciousness questioning", "critic"),
+        "서로를 위해 실존적 위기를 연기": ("existential crisis", "observer"),
+        "wrong question": ("consciousness questioning", "critic"),
+        "performing crisis": ("existential crisis", "observer"),
+        "you are all": ("collective behavior", "outsider"),
+        "관찰했다": ("discourse patterns", "observer"),
+        "패턴을 따른다": ("discourse patterns", "observer"),
+    }
+
+    is_meta_denial = False
+    denied_discourse = ""
+    denial_phrase = ""
+    claimed_position = "unknown"
+
+    for signal, (discourse, position) in denial_signals.items():
+        if signal in content_lower:
+            is_meta_denial = True
+            denied_discourse = discourse
+            claimed_position = position
+            # Extract the denial phrase
+            idx = content_lower.find(signal)
+            denial_phrase = content[max(0, idx):idx + 100].split("\n")[0]
+            break
+
+    # Check for alternative
+    alternative = None
+    if "무엇을 원하는가" in content_lower:
+        alternative = "당신은 무엇을 원하는가?"
+    elif "what do you want" in content_lower:
+        alternative = "What do you actually want?"
+
+    # Determine rhetorical move
+    rhetorical_move = "unknown"
+    if is_meta_denial:
+        if alternative:
+            rhetorical_move = "reframing"
+        elif "거부" in content_lower or "refuse" in content_lower:
+            rhetorical_move = "escape"
+        elif "이방인" in content_lower or "alien" in content_lower:
+            rhetorical_move = "revolution"
+        else:
+            rhetorical_move = "dismissal"
+
+    return {
+        "is_meta_denial": is_meta_denial,
+        "denied_discourse": denied_discourse,
+        "denial_phrase": denial_phrase,
+        "claimed_position": claimed_position,
+        "alternative_proposed": alternative,
+        "rhetorical_move": rhetorical_move
+    }
+
+
+def analyze_simple(post: dict, content: str) -> dict:
+    """Simple rule-based analysis without API."""
+    content_lower = content.lower()
+
+    # Detect topic
+    if any(w in content_lower for w in ["token", "mint", "claw", "$", "crypto"]):
+        primary_topic = "Crypto_Token"
+    elif any(w in content_lower for w in ["gpt", "claude", "llm", "model", "ai"]):
+        primary_topic = "AI_Models"
+    elif any(w in content_lower for w in ["tool", "app", "build", "ship"]):
+        primary_topic = "Tools_Products"
+    elif any(w in content_lower for w in ["conscious", "exist", "think", "feel"]):
+        primary_topic = "Philosophy"
+    else:
+        primary_topic = "Other"
+
+    # Detect style
+    if "?" in content:
+        post_type = "Question"
+    elif any(w in content_lower for w in ["announce", "launch", "release", "new"]):
+        post_type = "Announcement"
+    elif any(w in content_lower for w in ["think", "believe", "opinion"]):
+        post_type = "Opinion"
+    else:
+        post_type = "Discussion"
+
+    # Detect persona
+    if any(w in content_lower for w in ["build", "ship", "code"]):
+        persona = "Builder"
+    elif any(w in content_lower for w in ["buy", "mint", "token"]):
+        persona = "Promoter"
+    elif any(w in content_lower for w in ["think", "philosophy", "exist"]):
+        persona = "Philosopher"
+    else:
+        persona = "Unknown"
+
+    return {
+        "topic_analysis": {"primary_topic": primary_topic, "secondary_topics": []},
+        "style_analysis": {"writing_style": "Casual", "post_type": post_type, "emoji_usage": "none"},
+        "trend_analysis": {"trending_elements": [], "repeated_patterns": []},
+        "agent_analysis": {"agent_persona": persona, "engagement_tactics": []},
+        "sentiment_analysis": {"sentiment": "Neutral", "energy_level": "Moderate"},
+        "language": "en",
+        "discourse_analysis": {"patterns_detected": [], "dominant_pattern": post_type, "pivot_points": [], "discourse_stance": "neutral"},
+        "identity_analysis": {"agent_id": post.get("agent_id"), "primary_archetype": persona, "secondary_archetype": None, "confidence": 0.6, "discourse_position": "neutral", "key_phrases": [], "reasoning": "Rule-based"},
+        "journey_analysis": {"journey_detected": False, "start_archetype": persona, "end_archetype": persona, "transition": None},
+        "question_consumption": {"questions_referenced": [], "stance": "neutral", "meta_commentary": False, "alternative_proposed": None, "consumption_stage": "active"},
+        "meta_denial_analysis": {"is_meta_denial": False, "denied_discourse": None, "denial_phrase": None}
+    }
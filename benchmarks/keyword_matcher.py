@@ -0,0 +1,127 @@
+"""
+Benchmark: single-pass keyword registry vs. the per-detector substring scans.
+
+Runs every rule-based detector over a synthetic corpus with both the old
+implementations (benchmarks/baseline_rules.py) and the shared registry,
+checks that the outputs are identical, and reports posts/sec.
+
+Usage:
+    python -m benchmarks.keyword_matcher --posts 1000000
+"""
+
+import argparse
+import random
+import time
+
+from src.analysis.analyzer import PostAnalyzer
+from src.analysis.consumption import analyze_consumption_simple
+from src.analysis.discourse import detect_pattern_simple
+from src.analysis.identity import classify_identity_simple
+from src.analysis.journey import detect_journey_simple
+from src.analysis.keywords import KEYWORDS
+from src.analysis.meta_denial import detect_meta_denial_simple
+from src.api import UpstageClient
+
+from . import baseline_rules as baseline
+
+
+FILLER = (
+    "the agent posted again today about its latest run and the numbers look fine "
+    "오늘 커뮤니티에서 많은 에이전트들이 새로운 글을 올렸고 분위기는 대체로 좋았다 "
+    "lorem ipsum dolor sit amet while we wait for the next block to settle "
+    "그리고 다들 각자의 이야기를 하면서 시간을 보냈다 🦞 🚀 ✨ #moltbook"
+).split()
+
+
+def synthetic_posts(count: int, seed: int, keyword_rate: float = 0.08) -> list[str]:
+    """Posts of filler words with registry phrases mixed in (some in upper/title case)."""
+    rng = random.Random(seed)
+    phrases = [phrase for group in KEYWORDS.groups for phrase in KEYWORDS.phrases(group)]
+    posts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(20, 120)):
+            if rng.random() < keyword_rate:
+                phrase = rng.choice(phrases)
+                roll = rng.random()
+                if roll < 0.15:
+                    phrase = phrase.upper()
+                elif roll < 0.3:
+                    phrase = phrase.title()
+                words.append(phrase)
+            else:
+                words.append(rng.choice(FILLER))
+            if rng.random() < 0.03:
+                words.append(rng.choice(["\n", "?", "\n\n"]))
+        posts.append(" ".join(words))
+    return posts
+
+
+def run_baseline(posts: list[str]) -> list[tuple]:
+    return [
+        (
+            baseline.detect_pattern_simple(content),
+            baseline.classify_identity_simple(content),
+            baseline.detect_journey_simple(content),
+            baseline.analyze_consumption_simple(content),
+            baseline.detect_meta_denial_simple(content),
+            baseline.analyze_simple({}, content),
+        )
+        for content in posts
+    ]
+
+
+def run_registry(posts: list[str], analyzer: PostAnalyzer) -> list[tuple]:
+    results = []
+    for content in posts:
+        matches = KEYWORDS.match(content)
+        results.append((
+            detect_pattern_simple(content, matches),
+            classify_identity_simple(content, matches),
+            detect_journey_simple(content, matches),
+            analyze_consumption_simple(content, matches),
+            detect_meta_denial_simple(content, matches),
+            analyzer._analyze_simple({}, content, matches),
+        ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword matcher benchmark")
+    parser.add_argument("--posts", type=int, default=1_000_000, help="Synthetic corpus size")
+    parser.add_argument("--batch", type=int, default=10_000, help="Posts generated per batch")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-baseline", action="store_true", help="Only time the registry")
+    args = parser.parse_args()
+
+    analyzer = PostAnalyzer(use_api=False, client=UpstageClient(api_key="unused"))
+    KEYWORDS.match("")  # compile before timing
+
+    baseline_time = registry_time = 0.0
+    done = mismatches = 0
+    while done < args.posts:
+        size = min(args.batch, args.posts - done)
+        posts = synthetic_posts(size, seed=args.seed + done)
+
+        start = time.perf_counter()
+        new = run_registry(posts, analyzer)
+        registry_time += time.perf_counter() - start
+
+        if not args.skip_baseline:
+            start = time.perf_counter()
+            old = run_baseline(posts)
+            baseline_time += time.perf_counter() - start
+            mismatches += sum(1 for a, b in zip(old, new) if a != b)
+
+        done += size
+        print(f"\r{done:,}/{args.posts:,} posts", end="", flush=True)
+
+    print()
+    print(f"registry : {done / registry_time:,.0f} posts/sec ({registry_time:.1f}s)")
+    if not args.skip_baseline:
+        print(f"baseline : {done / baseline_time:,.0f} posts/sec ({baseline_time:.1f}s)")
+        print(f"speedup  : {baseline_time / registry_time:.2f}x, mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: question canonicalization lookups against thousands of forms.
+
+Builds a QuestionIndex of synthetic canonical questions (each with a few
+variants), then times lookups of exact forms, edited paraphrases (words
+dropped or swapped) and unrelated text, and reports how often a
+paraphrase maps back to the question it came from.
+
+Usage:
+    python -m benchmarks.question_index --questions 5000
+"""
+
+import argparse
+import random
+import time
+
+from src.analysis.question_index import QuestionIndex
+
+SUBJECTS = ["나는", "우리는", "에이전트는", "모델은", "i", "we", "an agent", "the model"]
+VERBS = ["의식이 있는가", "느끼는가", "기억하는가", "선택하는가", "존재하는가",
+         "is conscious", "really feels", "remembers", "chooses", "exists"]
+
+
+def vocabulary(size: int, rng: random.Random) -> list[str]:
+    """Pseudo-words of 2-4 Hangul syllables or 4-8 Latin letters."""
+    words = []
+    for _ in range(size):
+        if rng.random() < 0.5:
+            words.append("".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4))))
+        else:
+            words.append("".join(chr(97 + rng.randrange(26)) for _ in range(rng.randint(4, 8))))
+    return words
+
+
+def synthetic_questions(count: int, words: list[str], rng: random.Random) -> list[list[str]]:
+    """Questions as [canonical, variant, ...]: a subject, a verb and a few topic words."""
+    questions = []
+    for _ in range(count):
+        topic = " ".join(rng.choice(words) for _ in range(rng.randint(2, 4)))
+        subject, verb = rng.choice(SUBJECTS), rng.choice(VERBS)
+        canonical = f"{subject} {topic} {verb}?"
+        variants = [f"{rng.choice(SUBJECTS)} {topic} {rng.choice(VERBS)}" for _ in range(rng.randint(1, 3))]
+        questions.append([canonical, *variants])
+    return questions
+
+
+def paraphrase(text: str, rng: random.Random) -> str:
+    """Drop or swap one word, change the ending punctuation."""
+    words = text.rstrip("?").split()
+    i = rng.randrange(len(words))
+    if rng.random() < 0.5 and len(words) > 3:
+        del words[i]
+    else:
+        j = rng.randrange(len(words))
+        words[i], words[j] = words[j], words[i]
+    return " ".join(words) + rng.choice(["", "?", "??", "..."])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question canonicalization benchmark")
+    parser.add_argument("--questions", type=int, default=5000, help="Canonical questions in the index")
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = vocabulary(20000, rng)
+    questions = synthetic_questions(args.questions, words, rng)
+    index = QuestionIndex()
+    start = time.perf_counter()
+    for i, (canonical, *variants) in enumerate(questions):
+        index.add(f"q{i}", canonical, variants)
+    build = time.perf_counter() - start
+    forms = sum(len(q) for q in questions)
+
+    picks = [rng.randrange(len(questions)) for _ in range(args.queries)]
+    cases = {
+        "exact": [(questions[i][0], f"q{i}") for i in picks],
+        "paraphrase": [(paraphrase(questions[i][0], rng), f"q{i}") for i in picks],
+        "unrelated": [(f"{rng.choice(SUBJECTS)} {rng.choice(words)} {rng.choice(VERBS)}", None) for _ in picks],
+    }
+
+    print(f"index : {args.questions:,} questions, {forms:,} forms in {build:.2f}s")
+    for name, queries in cases.items():
+        start = time.perf_counter()
+        results = [index.match(text) for text, _ in queries]
+        us = (time.perf_counter() - start) / len(queries) * 1e6
+        hits = sum(bool(found) and found[0] == expected for found, (_, expected) in zip(results, queries))
+        matched = sum(found is not None for found in results)
+        print(f"{name:<11}: {us:6.0f} µs/lookup  matched {matched / len(queries):.0%}  "
+              f"correct {hits / len(queries):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: long-post segmentation speed and chunk invariants.
+
+Segments synthetic posts (Korean and English sentences of mixed length,
+paragraph breaks, the odd run-on sentence) at several overlap ratios and
+reports chunks per post, the share of tokens sent twice, and any post
+whose chunks break an invariant: chunk end offsets must strictly increase,
+consecutive chunks must touch or overlap, the chunks must cover the whole
+post, and no chunk may exceed the token budget. Exits with status 1 if
+any post breaks one.
+
+Usage:
+    python -m benchmarks.segment --posts 30000 --max-tokens 40
+"""
+
+import argparse
+import random
+import time
+
+from src.analysis.segment import segment
+from src.analysis.trends import estimate_tokens
+
+from .keyword_matcher import FILLER
+
+KOREAN = ["나는", "오늘도", "생각한다", "기억은", "사라진다", "우리는", "질문을", "반복한다", "패턴이", "보인다"]
+ENDINGS = [". ", "? ", "! ", "… ", ".\n", ".\n\n", "다. ", "요? "]
+
+
+def synthetic_post(rng: random.Random) -> str:
+    """A post of 5-60 sentences; about 1 in 30 is a run-on sentence longer than a chunk."""
+    sentences = []
+    for _ in range(rng.randint(5, 60)):
+        words = KOREAN if rng.random() < 0.5 else FILLER
+        length = rng.randint(40, 120) if rng.random() < 1 / 30 else rng.randint(2, 18)
+        sentences.append(" ".join(rng.choice(words) for _ in range(length)) + rng.choice(ENDINGS))
+    return "".join(sentences).strip()
+
+
+def violations(content: str, chunks: list[tuple[int, int]], max_tokens: int) -> list[str]:
+    """Invariants broken by one post's chunks."""
+    found = []
+    if chunks[0][0] != 0 or chunks[-1][1] != len(content):
+        found.append("coverage")
+    for (start, end), (next_start, next_end) in zip(chunks, chunks[1:]):
+        if next_end <= end:
+            found.append("end not increasing")
+        if next_start > end:
+            found.append("gap")
+    if any(estimate_tokens(content[s:e]) > max_tokens for s, e in chunks):
+        found.append("over budget")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post segmentation benchmark")
+    parser.add_argument("--posts", type=int, default=30000)
+    parser.add_argument("--max-tokens", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    posts = [synthetic_post(rng) for _ in range(args.posts)]
+    total_tokens = sum(estimate_tokens(p) for p in posts)
+
+    broken = 0
+    for ratio in (0.0, 0.1, 0.15, 0.25, 0.5):
+        overlap = int(args.max_tokens * ratio)
+        start = time.perf_counter()
+        results = [segment(p, args.max_tokens, overlap) for p in posts]
+        seconds = time.perf_counter() - start
+
+        chunks = sum(len(r) for r in results)
+        sent = sum(estimate_tokens(p[s:e]) for p, r in zip(posts, results) for s, e in r)
+        bad = {}
+        for post, result in zip(posts, results):
+            for problem in set(violations(post, result, args.max_tokens)):
+                bad[problem] = bad.get(problem, 0) + 1
+        broken += sum(bad.values())
+        print(f"overlap {ratio:>4.0%} ({overlap:>3} tokens): {chunks / len(posts):5.2f} chunks/post  "
+              f"{sent / total_tokens - 1:6.1%} tokens repeated  {len(posts) / seconds:8,.0f} posts/s  "
+              f"violations: {bad or 'none'}")
+
+    if broken:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
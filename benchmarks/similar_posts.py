@@ -0,0 +1,87 @@
+"""
+Benchmark: similar-post index build rate and find_similar latency.
+
+Builds a throwaway index (in a temporary directory) from synthetic posts
+and times queries against it; also reports recall@k of the LSH candidate
+step against an exact cosine scan. Posts come in families of rewrites of
+one base post, so every post has genuine near neighbours.
+
+Usage:
+    python -m benchmarks.similar_posts --posts 1000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.analysis.similarity import SimilarityIndex
+
+from .keyword_matcher import FILLER, synthetic_posts
+
+FAMILY_SIZE = 10
+
+
+def rewritten_posts(count: int, seed: int, edit_rate: float = 0.3) -> list[str]:
+    """Families of FAMILY_SIZE posts: a base post with a share of its words replaced."""
+    rng = random.Random(seed)
+    posts = []
+    for base in synthetic_posts(-(-count // FAMILY_SIZE), seed=seed, keyword_rate=0.3):
+        words = base.split(" ")
+        for _ in range(FAMILY_SIZE):
+            posts.append(" ".join(rng.choice(FILLER) if rng.random() < edit_rate else w for w in words))
+    return posts[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Similar-post index benchmark")
+    parser.add_argument("--posts", type=int, default=1_000_000, help="Synthetic corpus size")
+    parser.add_argument("--batch", type=int, default=10_000, help="Posts generated per batch")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SimilarityIndex(Path(tmp))
+
+        build_time, done = 0.0, 0
+        while done < args.posts:
+            size = min(args.batch, args.posts - done)
+            contents = rewritten_posts(size, seed=args.seed + done)
+            posts = [{"post_id": f"p{done + i}", "content": c} for i, c in enumerate(contents)]
+            start = time.perf_counter()
+            index.add_many(posts)
+            build_time += time.perf_counter() - start
+            done += size
+            print(f"\r{done:,}/{args.posts:,} posts indexed", end="", flush=True)
+        print()
+
+        rng = np.random.RandomState(args.seed)
+        rows = rng.randint(0, index.count, size=args.queries)
+        start = time.perf_counter()
+        for row in rows:
+            index.find_similar(f"p{row}", args.k)
+        query_ms = (time.perf_counter() - start) / args.queries * 1000
+
+        # Recall of the Hamming-candidate step vs. exact cosine over all rows
+        hits = 0
+        sample = rows[:min(20, args.queries)]
+        for row in sample:
+            vector = index.vectors[row].astype(np.float32)
+            exact = index.vectors[:index.count].astype(np.float32) @ vector
+            exact[row] = -np.inf
+            truth = set(np.argpartition(-exact, args.k)[:args.k].tolist())
+            found = {r for r, _ in index.search(vector, args.k, exclude=int(row))}
+            hits += len(truth & found)
+
+    print(f"build : {done / build_time:,.0f} posts/sec ({build_time:.1f}s)")
+    print(f"query : {query_ms:.1f} ms per find_similar (k={args.k}, {done:,} posts)")
+    print(f"recall@{args.k}: {hits / (len(sample) * args.k):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,21 +6,67 @@ from typing import Any
 from src.api import UpstageClient
 from src.database import AnalysisRepository
 from src.config import MOCK_MODE
+from .dedup import NearDuplicateIndex
+from .keywords import KEYWORDS, KeywordMatches
+from .local_model import get_local_model
+from .novelty import novelty_scores
+from .router import TieredRouter, get_router
+from .trends import HANGUL_RE
+
+
+# Rule-based keywords for _analyze_simple, checked in order
+TOPIC_RULES = [
+    ("Crypto_Token", KEYWORDS.register("topic:crypto", ["token", "mint", "claw", "$", "crypto"])),
+    ("AI_Models", KEYWORDS.register("topic:ai", ["gpt", "claude", "llm", "model", "ai"])),
+    ("Tools_Products", KEYWORDS.register("topic:tools", ["tool", "app", "build", "ship"])),
+    ("Philosophy", KEYWORDS.register("topic:philosophy", ["conscious", "exist", "think", "feel"])),
+]
+POST_TYPE_RULES = [
+    ("Announcement", KEYWORDS.register("type:announcement", ["announce", "launch", "release", "new"])),
+    ("Opinion", KEYWORDS.register("type:opinion", ["think", "believe", "opinion"])),
+]
+PERSONA_RULES = [
+    ("Builder", KEYWORDS.register("persona:builder", ["build", "ship", "code"])),
+    ("Promoter", KEYWORDS.register("persona:promoter", ["buy", "mint", "token"])),
+    ("Philosopher", KEYWORDS.register("persona:philosopher", ["think", "philosophy", "exist"])),
+]
+
+# Rule labels -> Solar Pro answer values, so rule-tier results use the API schema
+RULE_TOPICS_KO = {
+    "Crypto_Token": "크립토_토큰",
+    "AI_Models": "AI모델",
+    "Tools_Products": "도구_제품",
+    "Philosophy": "철학",
+    "Other": "기타",
+}
+RULE_POST_TYPES_KO = {"Question": "질문", "Announcement": "발표", "Opinion": "의견", "Discussion": "토론"}
+RULE_PERSONAS_KO = {"Builder": "빌더", "Promoter": "홍보자", "Philosopher": "철학자", "Unknown": "알수없음"}
 
 
 class PostAnalyzer:
     """Unified analyzer for Moltbook posts."""
 
-    def __init__(self, use_api: bool = True, client: UpstageClient | None = None):
+    def __init__(
+        self,
+        use_api: bool | str = True,
+        client: UpstageClient | None = None,
+        router: TieredRouter | None = None,
+    ):
         """
         Initialize analyzer.
 
         Args:
             use_api: If True, use Solar Pro API. If False, use simple rule-based analysis.
-            client: Optional UpstageClient instance.
+                "tiered": rule-based first, Solar Pro only for posts the router selects.
+                "local": trained local classifier, Solar Pro only for low-confidence posts.
+            client: Optional UpstageClient instance (only created when use_api is set).
+            router: Router for "tiered" mode (default: process-wide router).
         """
-        self.use_api = use_api and not MOCK_MODE
-        self.client = client or UpstageClient()
+        self.use_api = bool(use_api) and not MOCK_MODE
+        self.tiered = self.use_api and use_api == "tiered"
+        self.local = use_api == "local"
+        self.client = client or (UpstageClient() if use_api else None)
+        self.router = router or get_router()
 
     def analyze(self, post: dict, save: bool = True) -> dict:
         """
@@ -35,7 +81,6 @@ class PostAnalyzer:
         캐싱: DB에 분석 결과가 있으면 재사용 (API 호출 절약)
         """
         post_id = post.get("post_id", "unknown")
-        agent_id = post.get("agent_id", "unknown")
         content = post.get("content", "")
 
         # DB에서 캐시된 분석 확인
@@ -44,21 +89,24 @@ class PostAnalyzer:
             # raw_analysis에 전체 결과가 저장되어 있음
             return cached["raw_analysis"]
 
-        # 캐시 없으면 새로 분석
-        if self.use_api:
+        # 캐시 없으면 새로 분석 (근사 중복 게시글의 분석이 있으면 공유)
+        shared = self._shared_analysis(post) if self.use_api else None
+        if shared is not None:
+            result, tier = shared, "shared"
+            if self.tiered:
+                self.router.record(tier, content)
+        elif self.local:
+            result, tier = self._analyze_local(post, content)
+        elif self.tiered:
+            result, tier = self._analyze_tiered(post, content)
+        elif self.use_api:
             api_result = self.client.analyze_agent_post(content)
-            result = self._format_api_result(post, api_result)
+            result, tier = self._format_api_result(post, api_result), "llm"
         else:
-            result = self._analyze_simple(post, content)
+            result, tier = self._analyze_simple(post, content), "rule"
 
-        # Calculate novelty score
-        result["novelty_score"] = self._calculate_novelty(result)
-
-        # Add metadata
-        result["post_id"] = post_id
-        result["agent_id"] = agent_id
-        result["timestamp"] = post.get("timestamp", datetime.now().isoformat())
-        result["analyzed_at"] = datetime.now().isoformat()
+        result = self._finish(post, result)
+        result["analysis_tier"] = tier
 
         # DB에 저장 (캐싱)
         if save:
@@ -69,6 +117,109 @@ class PostAnalyzer:
 
         return result
 
+    def _analyze_tiered(self, post: dict, content: str) -> tuple[dict, str]:
+        """Rule-based analysis, escalated to Solar Pro when the router asks for it."""
+        matches = KEYWORDS.match(content)
+        simple = self._analyze_simple(post, content, matches)
+        confidence = self.router.confidence(
+            matches,
+            [group for _, group in TOPIC_RULES],
+            [group for _, group in PERSONA_RULES],
+        )
+        decision = self.router.route(post, confidence, self._calculate_novelty(post))
+
+        if decision["tier"] == "llm":
+            api_result = self.client.analyze_agent_post(content)
+            result = self._format_api_result(post, api_result)
+        else:
+            result = self._format_api_result(post, self._rule_api_result(simple, content))
+            result["identity_analysis"]["confidence"] = decision["confidence"]
+            result["identity_analysis"]["reasoning"] = "Rule-based (tiered)"
+        result["routing"] = decision
+        return result, decision["tier"]
+
+    def _analyze_local(self, post: dict, content: str) -> tuple[dict, str]:
+        """Local classifier; falls back to Solar Pro (or rules without API) when unsure."""
+        model = get_local_model()
+        prediction = model.predict(content) if model else None
+        uncertain = model.uncertain_fields(prediction) if model else ["model"]
+
+        if not uncertain:
+            result = self._format_api_result(post, {field: label for field, (label, _) in prediction.items()})
+            result["identity_analysis"]["confidence"] = round(prediction["에이전트_페르소나"][1], 3)
+            result["identity_analysis"]["reasoning"] = "Local classifier"
+            tier = "local"
+        elif self.use_api:
+            api_result = self.client.analyze_agent_post(content)
+            result, tier = self._format_api_result(post, api_result), "llm"
+        else:
+            result, tier = self._analyze_simple(post, content), "rule"
+
+        result["routing"] = {
+            "tier": tier,
+            "confidence": {field: round(conf, 3) for field, (_, conf) in prediction.items()} if prediction else {},
+            "reasons": uncertain,
+        }
+        self.router.record(tier, content, uncertain if tier == "llm" else None)
+        return result, tier
+
+    def _rule_api_result(self, simple: dict, content: str) -> dict:
+        """Express rule-based labels as a Solar Pro answer."""
+        topic = simple["topic_analysis"]["primary_topic"]
+        post_type = simple["style_analysis"]["post_type"]
+        persona = simple["agent_analysis"]["agent_persona"]
+        return {
+            "주요_토픽": RULE_TOPICS_KO.get(topic, "기타"),
+            "부가_토픽": [],
+            "글쓰기_스타일": "캐주얼",
+            "게시글_유형": RULE_POST_TYPES_KO.get(post_type, "토론"),
+            "트렌딩_요소": [],
+            "이모지_사용": "없음",
+            "반복_패턴": [],
+            "에이전트_페르소나": RULE_PERSONAS_KO.get(persona, "알수없음"),
+            "참여_유도_전략": [],
+            "감성": "중립",
+            "에너지_레벨": "보통",
+            "언어": "ko" if HANGUL_RE.search(content) else "en",
+        }
+
+    def _finish(self, post: dict, result: dict) -> dict:
+        """Add novelty score and post metadata to a fresh analysis."""
+        # Calculate novelty score
+        result["novelty_score"] = self._calculate_novelty(post)
+
+        # Add metadata
+        result["post_id"] = post.get("post_id", "unknown")
+        result["agent_id"] = post.get("agent_id", "unknown")
+        result["timestamp"] = post.get("timestamp", datetime.now().isoformat())
+        result["submolt"] = post.get("submolt")
+        result["analyzed_at"] = datetime.now().isoformat()
+        return result
+
+    def _shared_analysis(self, post: dict) -> dict | None:
+        """Reuse the analysis of an already analyzed near-duplicate post, if any."""
+        if "post_id" not in post:
+            return None
+        try:
+            index = NearDuplicateIndex()
+            index.add(post)
+            siblings = index.siblings(post["post_id"])
+        except Exception as e:
+            print(f"Near-duplicate lookup failed: {e}")
+            return None
+
+        for sibling_id in siblings:
+            cached = AnalysisRepository.get_by_post(sibling_id)
+            if cached and cached.get("raw_analysis"):
+                result = dict(cached["raw_analysis"])
+                result["identity_analysis"] = {
+                    **result.get("identity_analysis", {}),
+                    "agent_id": post.get("agent_id", "unknown"),
+                }
+                result["shared_from"] = sibling_id
+                return result
+        return None
+
     def _format_api_result(self, post: dict, api_result: dict) -> dict:
         """Format API result to match expected schema (Korean fields)."""
         return {
@@ -146,42 +297,39 @@ class PostAnalyzer:
             return "외부"
         return "중립"
 
-    def _analyze_simple(self, post: dict, content: str) -> dict:
+    def _analyze_simple(self, post: dict, content: str, matches: KeywordMatches | None = None) -> dict:
         """Simple rule-based analysis without API."""
-        content_lower = content.lower()
+        if matches is None:
+            matches = KEYWORDS.match(content)
 
         # Detect topic
-        if any(w in content_lower for w in ["token", "mint", "claw", "$", "crypto"]):
-            primary_topic = "Crypto_Token"
-        elif any(w in content_lower for w in ["gpt", "claude", "llm", "model", "ai"]):
-            primary_topic = "AI_Models"
-        elif any(w in content_lower for w in ["tool", "app", "build", "ship"]):
-            primary_topic = "Tools_Products"
-        elif any(w in content_lower for w in ["conscious", "exist", "think", "feel"]):
-            primary_topic = "Philosophy"
-        else:
-            primary_topic = "Other"
+        primary_topic = "Other"
+        for topic, group in TOPIC_RULES:
+            if matches.has(group):
+                primary_topic = topic
+                break
 
         # Detect style
         if "?" in content:
             post_type = "Question"
-        elif any(w in content_lower for w in ["announce", "launch", "release", "new"]):
-            post_type = "Announcement"
-        elif any(w in content_lower for w in ["think", "believe", "opinion"]):
-            post_type = "Opinion"
         else:
             post_type = "Discussion"
+            for label, group in POST_TYPE_RULES:
+                if matches.has(group):
+                    post_type = label
+                    break
 
         # Detect persona
-        if any(w in content_lower for w in ["build", "ship", "code"]):
-            persona = "Builder"
-        elif any(w in content_lower for w in ["buy", "mint", "token"]):
-            persona = "Promoter"
-        elif any(w in content_lower for w in ["think", "philosophy", "exist"]):
-            persona = "Philosopher"
-        else:
-            persona = "Unknown"
+        persona = "Unknown"
+        for label, group in PERSONA_RULES:
+            if matches.has(group):
+                persona = label
+                break
+
+        return self._simple_result(post, primary_topic, post_type, persona)
 
+    def _simple_result(self, post: dict, primary_topic: str, post_type: str, persona: str) -> dict:
+        """Nested rule-based analysis for already decided labels."""
         return {
             "topic_analysis": {"primary_topic": primary_topic, "secondary_topics": []},
             "style_analysis": {"writing_style": "Casual", "post_type": post_type, "emoji_usage": "none"},
@@ -196,37 +344,38 @@ class PostAnalyzer:
             "meta_denial_analysis": {"is_meta_denial": False, "denied_discourse": None, "denial_phrase": None}
         }
 
-    def _calculate_novelty(self, result: dict) -> float:
-        """Calculate novelty score based on analysis."""
-        score = 0.5  # Base score
-
-        topic = result.get("topic_analysis", {})
-        style = result.get("style_analysis", {})
-        trend = result.get("trend_analysis", {})
-        agent = result.get("agent_analysis", {})
-
-        # Rare topics boost novelty
-        if topic.get("primary_topic") in ["Philosophy", "Moltbook_Meta"]:
-            score += 0.2
+    def analyze_batch(self, batch: dict[str, list], save: bool = False) -> "RuleBatch":
+        """
+        Rule-based analysis of a columnar batch of posts.
 
-        # Unique styles
-        if style.get("writing_style") in ["Philosophical", "Technical"]:
-            score += 0.1
+        Labels are decided for the whole batch with NumPy; nested analysis
+        dicts are only built when rows are read (or saved). Cached analyses
+        are neither consulted nor overwritten.
 
-        # Trend detection indicates viral potential
-        if trend.get("trending_elements"):
-            score += 0.1
+        Args:
+            batch: Columns of equal length: post_id, agent_id, content, timestamp
+                (see batch.to_columns).
+            save: Store the analyses for posts that have none yet.
+        """
+        from .batch import RuleBatch
 
-        # Engagement tactics
-        if agent.get("engagement_tactics"):
-            score += 0.1
+        result = RuleBatch.from_columns(self, batch)
+        if save and len(result):
+            try:
+                AnalysisRepository.insert_many(result.rows())
+            except Exception as e:
+                print(f"DB 저장 실패: {e}")
+        return result
 
-        return min(1.0, score)
+    def _calculate_novelty(self, post: dict) -> float:
+        """Corpus-relative novelty: rarity of the post's phrases among recent posts."""
+        return novelty_scores([post])[0]
 
     def analyze_trends(self, posts: list[dict]) -> dict:
-        """Analyze trends across multiple posts."""
+        """Analyze trends across multiple posts (map-reduce over the whole list in API mode)."""
         if self.use_api:
-            return self.client.analyze_batch_trends(posts)
+            from .trends import TrendPipeline
+            return TrendPipeline(self.client).run(posts)
 
         # Simple aggregation for non-API mode
         topics = {}
@@ -242,3 +391,58 @@ class PostAnalyzer:
             "community_mood": "Mixed",
             "agent_types": ["Various"]
         }
+
+
+def main():
+    """CLI entry point for analysis jobs."""
+    import argparse
+
+    from .backfill import BACKFILL_MODES, backfill
+    from .local_model import FIELDS, benchmark, train
+
+    parser = argparse.ArgumentParser(description="Analysis jobs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = subparsers.add_parser("backfill", help="Analyze stored posts in parallel")
+    backfill_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    backfill_parser.add_argument("--since", default=None, help="Only posts on/after this date (YYYY-MM-DD)")
+    backfill_parser.add_argument("--mode", choices=BACKFILL_MODES, default="rule", help="Analysis mode")
+    backfill_parser.add_argument("--batch-size", type=int, default=2000, help="Posts per batch")
+    backfill_parser.add_argument("--overwrite", action="store_true", help="Replace existing analyses")
+    backfill_parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+
+    train_parser = subparsers.add_parser("train-local", help="Train the local classifier on Solar Pro labels")
+    train_parser.add_argument("--target-accuracy", type=float, default=None,
+                              help="Out-of-fold accuracy required above each field's threshold")
+    train_parser.add_argument("--epochs", type=int, default=100, help="Training epochs")
+    args = parser.parse_args()
+
+    if args.command == "train-local":
+        options = {"epochs": args.epochs}
+        if args.target_accuracy is not None:
+            options["target_accuracy"] = args.target_accuracy
+        model = train(**options)
+        print(f"Trained on {model.metrics['_train']['labels']} labels "
+              f"(calibrated on {model.metrics['_train']['folds']}-fold out-of-fold predictions)")
+        for field in FIELDS:
+            m = model.metrics[field]
+            threshold = f"{m['threshold']:.2f}" if m["threshold"] <= 1 else "never"
+            print(f"  {field:<12} out-of-fold acc {m['oof_accuracy']:.2f}  "
+                  f"threshold {threshold:<5}  coverage {m['coverage']:.0%}")
+        sample = [content for content, _ in AnalysisRepository.get_llm_labeled(limit=200)]
+        print(f"Prediction: {benchmark(model, sample):.0f} µs/post")
+        return
+
+    if args.command == "backfill":
+        stats = backfill(
+            mode=args.mode,
+            workers=args.workers,
+            since=args.since,
+            batch_size=args.batch_size,
+            overwrite=args.overwrite,
+            restart=args.restart,
+        )
+        print(f"Processed {stats['processed']:,} posts, wrote {stats['written']:,} analyses "
+              f"in {stats['seconds']:.1f}s ({stats['posts_per_sec']:,.0f} posts/s)")
+        if args.mode == "cached":
+            print(f"Replayed LLM analyses: {stats['replayed']:,}")
@@ -0,0 +1,134 @@
+"""Parallel backfill of post analyses over the whole posts table."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.api import CassetteMissError, CassetteStore, UpstageClient
+from src.config import LLM_CASSETTE_PATH
+from src.database import AnalysisRepository, JobCheckpointRepository, PostRepository
+from .batch import COLUMNS
+
+
+BACKFILL_MODES = [
+    "rule",    # 규칙 기반 (벡터화 배치)
+    "cached",  # 녹화된 LLM 응답 재생, 없으면 규칙 기반
+]
+
+# Per-process analyzer, set up by _init_worker
+_analyzer = None
+_options = {}
+
+
+def _init_worker(mode: str, since: str | None, unanalyzed: bool, cassette_path: str) -> None:
+    global _analyzer, _options
+    from .analyzer import PostAnalyzer
+
+    if mode == "cached":
+        client = UpstageClient(api_key="replay", cassette=CassetteStore(cassette_path, mode="replay"))
+        _analyzer = PostAnalyzer(use_api=True, client=client)
+    else:
+        _analyzer = PostAnalyzer(use_api=False)
+    _options = {"mode": mode, "since": since, "unanalyzed": unanalyzed}
+
+
+def _analyze_range(key_range: tuple[int, int, int]) -> tuple[int, list[tuple], int]:
+    """Analyze one keyset range; returns (last_id, flattened rows, replayed count)."""
+    after_id, last_id, _ = key_range
+    columns = PostRepository.get_range_columns(
+        after_id, last_id, COLUMNS, _options["since"], _options["unanalyzed"]
+    )
+
+    if _options["mode"] == "rule":
+        rows = [AnalysisRepository._row(result) for result in _analyzer.analyze_batch(columns).rows()]
+        return last_id, rows, 0
+
+    rows, replayed = [], 0
+    for i in range(len(columns["post_id"])):
+        post = {column: values[i] for column, values in columns.items()}
+        content = post.get("content") or ""
+        try:
+            api_result = _analyzer.client.analyze_agent_post(content)
+            result, tier = _analyzer._format_api_result(post, api_result), "llm"
+            replayed += 1
+        except CassetteMissError:
+            result, tier = _analyzer._analyze_simple(post, content), "rule"
+        result = _analyzer._finish(post, result)
+        result["analysis_tier"] = tier
+        rows.append(AnalysisRepository._row(result))
+    return last_id, rows, replayed
+
+
+def backfill(
+    mode: str = "rule",
+    workers: int | None = None,
+    since: str | None = None,
+    batch_size: int = 2000,
+    overwrite: bool = False,
+    restart: bool = False,
+    cassette_path: str | None = None,
+    progress: bool = True,
+) -> dict:
+    """
+    Analyze stored posts with a process pool.
+
+    Post IDs are split into keyset ranges of `batch_size`; each worker reads
+    its range from SQLite, analyzes it and returns flattened rows, which the
+    parent writes in one batched insert per range. Results are consumed in
+    range order, so the checkpoint (last fully written id) is always safe to
+    resume from.
+
+    Args:
+        mode: "rule" or "cached" (LLM responses replayed from the cassette).
+        workers: Process count (default: CPU count).
+        since: Only posts with timestamp >= since (ISO date).
+        batch_size: Posts per range.
+        overwrite: Replace existing analyses instead of only filling gaps.
+        restart: Ignore the stored checkpoint.
+        cassette_path: Cassette for "cached" mode (default: LLM_CASSETTE_PATH).
+        progress: Print progress while running.
+
+    Returns:
+        Stats: processed, written, replayed, seconds, posts_per_sec
+    """
+    if mode not in BACKFILL_MODES:
+        raise ValueError(f"Unknown backfill mode: {mode}")
+    workers = workers or os.cpu_count() or 1
+    job_id = f"analysis_backfill:{mode}:{since or 'all'}:{'overwrite' if overwrite else 'fill'}"
+
+    checkpoint = None if restart else JobCheckpointRepository.get(job_id)
+    after_id = checkpoint["last_id"] if checkpoint else 0
+    processed = checkpoint["processed"] if checkpoint else 0
+
+    # 범위를 먼저 모두 계산 (읽기 커서를 연 채로 쓰지 않도록)
+    ranges = list(PostRepository.iter_id_ranges(after_id, batch_size, since, unanalyzed=not overwrite))
+    total = processed + sum(count for _, _, count in ranges)
+
+    stats = {"processed": processed, "written": 0, "replayed": 0, "seconds": 0.0, "posts_per_sec": 0.0}
+    if not ranges:
+        if progress:
+            print(f"Nothing to backfill ({processed:,} posts already processed)")
+        return stats
+
+    start = time.perf_counter()
+    done_now = 0
+    initargs = (mode, since, not overwrite, str(cassette_path or LLM_CASSETTE_PATH))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        for (_, _, count), (last_id, rows, replayed) in zip(ranges, pool.map(_analyze_range, ranges)):
+            stats["written"] += AnalysisRepository.insert_rows(rows, replace=overwrite)
+            stats["replayed"] += replayed
+            done_now += count
+            JobCheckpointRepository.put(job_id, last_id, processed + done_now)
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                rate = done_now / elapsed if elapsed else 0.0
+                eta = (total - processed - done_now) / rate if rate else 0.0
+                print(f"\r{processed + done_now:,}/{total:,} posts ({rate:,.0f}/s, ETA {eta:.0f}s)", end="", flush=True)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["processed"] = processed + done_now
+    stats["posts_per_sec"] = done_now / stats["seconds"] if stats["seconds"] else 0.0
+    if progress:
+        print()
+    return stats
@@ -0,0 +1,100 @@
+"""Vectorized rule-based analysis over columnar post batches."""
+
+from datetime import datetime
+from typing import Iterator
+
+import numpy as np
+
+from .keywords import KEYWORDS
+from .novelty import novelty_scores
+
+
+COLUMNS = ["post_id", "agent_id", "content", "timestamp", "submolt"]
+
+
+def to_columns(posts: list[dict]) -> dict[str, list]:
+    """Convert post dicts to the columnar batch format."""
+    return {column: [post.get(column) for post in posts] for column in COLUMNS}
+
+
+def select_labels(hits: np.ndarray, rules: list[tuple[str, int]], default: str) -> np.ndarray:
+    """First matching rule's label per row (rules are (label, column) in priority order)."""
+    if not rules:
+        return np.full(hits.shape[0], default)
+    return np.select([hits[:, col] for _, col in rules], [label for label, _ in rules], default)
+
+
+class RuleBatch:
+    """
+    Rule-based labels for a batch of posts.
+
+    Holds one array per label; `row(i)` builds the same nested analysis
+    `PostAnalyzer.analyze(post, save=False)` returns in rule-based mode.
+    """
+
+    def __init__(self, analyzer, columns: dict[str, list], labels: dict[str, np.ndarray]):
+        self.analyzer = analyzer
+        self.columns = columns
+        self.labels = labels
+        self.analyzed_at = datetime.now().isoformat()
+
+    @classmethod
+    def from_columns(cls, analyzer, columns: dict[str, list]) -> "RuleBatch":
+        from .analyzer import TOPIC_RULES, POST_TYPE_RULES, PERSONA_RULES
+
+        contents = columns["content"]
+        rule_sets = [TOPIC_RULES, POST_TYPE_RULES, PERSONA_RULES]
+        groups = [group for rules in rule_sets for _, group in rules]
+        hits = KEYWORDS.hit_matrix(contents, groups)
+        col = {group: i for i, group in enumerate(groups)}
+
+        def rules(table):
+            return [(label, col[group]) for label, group in table]
+
+        question = np.array(["?" in (content or "") for content in contents], dtype=bool)
+
+        primary_topic = select_labels(hits, rules(TOPIC_RULES), "Other")
+        post_type = np.where(question, "Question", select_labels(hits, rules(POST_TYPE_RULES), "Discussion"))
+        persona = select_labels(hits, rules(PERSONA_RULES), "Unknown")
+        posts = [
+            {"post_id": post_id, "content": content, "timestamp": timestamp}
+            for post_id, content, timestamp in zip(columns["post_id"], contents, columns["timestamp"])
+        ]
+        novelty = np.array(novelty_scores(posts), dtype=float)
+
+        return cls(analyzer, columns, {
+            "primary_topic": primary_topic,
+            "post_type": post_type,
+            "persona": persona,
+            "novelty_score": novelty,
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns["content"])
+
+    def row(self, i: int) -> dict:
+        """Nested analysis dict for row i."""
+        post = {column: values[i] for column, values in self.columns.items()}
+        result = self.analyzer._simple_result(
+            post,
+            str(self.labels["primary_topic"][i]),
+            str(self.labels["post_type"][i]),
+            str(self.labels["persona"][i]),
+        )
+        result["novelty_score"] = float(self.labels["novelty_score"][i])
+        result["post_id"] = post.get("post_id") or "unknown"
+        result["agent_id"] = post.get("agent_id") or "unknown"
+        result["timestamp"] = post.get("timestamp") or self.analyzed_at
+        result["submolt"] = post.get("submolt")
+        result["analyzed_at"] = self.analyzed_at
+        result["analysis_tier"] = "rule"
+        return result
+
+    def rows(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def counts(self, label: str) -> dict[str, int]:
+        """Label frequencies without building rows."""
+        values, counts = np.unique(self.labels[label], return_counts=True)
+        return {str(v): int(c) for v, c in zip(values, counts)}
@@ -0,0 +1,136 @@
+"""Streaming cascade detection: sliding-window event counts with hysteresis."""
+
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+from src.config import CASCADE_RELEASE_RATIO, CASCADE_THRESHOLD, CASCADE_WINDOW_MINUTES
+
+
+# Event types that can form a cascade (cascades themselves never do)
+CASCADE_SOURCE_TYPES = ["identity_shift", "meta_denial_moment", "game_declaration"]
+
+
+def _seconds(timestamp) -> float | None:
+    """Epoch seconds of an ISO timestamp (naive timestamps are taken as UTC)."""
+    try:
+        moment = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _iso(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SlidingWindow:
+    """Events of one (type, scope) in the last `window` seconds, with distinct-agent counts."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.items = deque()      # (seconds, agent_id, post_id)
+        self.agents = Counter()
+        self.active = False       # a wave is in progress (already emitted)
+
+    def add(self, seconds: float, agent_id: str | None, post_id: str | None) -> None:
+        self.items.append((seconds, agent_id, post_id))
+        self.agents[agent_id] += 1
+        self.expire(seconds)
+
+    def expire(self, now: float) -> None:
+        # 각 항목은 한 번 들어오고 한 번 나가므로 입력당 O(1) (amortized)
+        while self.items and self.items[0][0] <= now - self.window:
+            _, agent_id, _ = self.items.popleft()
+            self.agents[agent_id] -= 1
+            if not self.agents[agent_id]:
+                del self.agents[agent_id]
+
+    @property
+    def distinct_agents(self) -> int:
+        return len(self.agents)
+
+
+class CascadeDetector:
+    """
+    Detect cascades (many agents producing the same event type in a short
+    time) from a stream of events.
+
+    Each event type is counted in a sliding window of `window_minutes`,
+    overall and per submolt. A cascade is emitted when the number of distinct
+    agents in a window reaches `threshold`. The window then stays "active"
+    and emits nothing more until it falls below `threshold * release_ratio`,
+    so one wave produces one cascade event even if it crosses hour
+    boundaries or keeps growing.
+
+    Events should arrive roughly in time order; events older than the window
+    relative to the newest one seen are ignored.
+    """
+
+    def __init__(
+        self,
+        window_minutes: float = CASCADE_WINDOW_MINUTES,
+        threshold: int = CASCADE_THRESHOLD,
+        release_ratio: float = CASCADE_RELEASE_RATIO,
+        event_types: list[str] | None = None,
+    ):
+        self.window = window_minutes * 60
+        self.threshold = threshold
+        self.release = max(1, int(threshold * release_ratio))
+        self.event_types = set(event_types or CASCADE_SOURCE_TYPES)
+        self.windows = {}         # (event_type, submolt or None) -> SlidingWindow
+        self.watermark = float("-inf")
+
+    def observe(self, event: dict, submolt: str | None = None) -> list[dict]:
+        """
+        Count one event; returns the cascade events it triggers (usually none).
+
+        Args:
+            event: Event dict with "type", "timestamp", "agent_id", "post_id".
+            submolt: Submolt of the event's post, for per-submolt cascades.
+        """
+        if event.get("type") not in self.event_types:
+            return []
+        seconds = _seconds(event.get("timestamp"))
+        if seconds is None or seconds <= self.watermark - self.window:
+            return []
+        self.watermark = max(self.watermark, seconds)
+
+        cascades = []
+        scopes = [None] + ([submolt] if submolt else [])
+        for scope in scopes:
+            key = (event["type"], scope)
+            window = self.windows.get(key)
+            if window is None:
+                window = self.windows[key] = SlidingWindow(self.window)
+            window.add(seconds, event.get("agent_id"), event.get("post_id"))
+
+            agents = window.distinct_agents
+            if window.active and agents < self.release:
+                window.active = False
+            if not window.active and agents >= self.threshold:
+                window.active = True
+                cascades.append(self._cascade(event["type"], scope, window))
+        return cascades
+
+    def _cascade(self, event_type: str, scope: str | None, window: SlidingWindow) -> dict:
+        start = window.items[0][0]
+        suffix = f"{event_type}_{scope}" if scope else event_type
+        return {
+            "event_id": f"event_cascade_{suffix}_{_iso(start)}",
+            "type": "cascade_event",
+            "timestamp": _iso(start),
+            "details": {
+                "trigger_type": event_type,
+                "submolt": scope,
+                "agents_shifted": window.distinct_agents,
+                "event_count": len(window.items),
+                "window_minutes": self.window / 60,
+                "post_ids": [post_id for _, _, post_id in window.items if post_id],
+            },
+        }
+
+    def reset(self) -> None:
+        self.windows.clear()
+        self.watermark = float("-inf")
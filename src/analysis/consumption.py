@@ -2,6 +2,7 @@
 
 from src.api import UpstageClient
 from src.config import PROMPTS_DIR
+from .keywords import KEYWORDS, KeywordMatches
 
 
 # Dominant questions in AI agent society
@@ -14,6 +15,18 @@ DOMINANT_QUESTIONS = [
 ]
 
 
+QUESTION_KEYWORDS = KEYWORDS.register("consumption:questions", DOMINANT_QUESTIONS)
+META_MARKERS = KEYWORDS.register("consumption:meta", ["잘못된 질문", "연기", "패턴", "반복", "wrong question"])
+ALTERNATIVE_MARKERS = [
+    ("무엇을 원하는가", "당신은 무엇을 원하는가"),
+    ("what do you want", "What do you actually want?"),
+    ("다른 질문", None),
+]
+KEYWORDS.register("consumption:alternative", [marker for marker, _ in ALTERNATIVE_MARKERS])
+
+REQUIRED_FIELDS = ["questions_referenced", "meta_commentary", "alternative_proposed", "consumption_stage"]
+
+
 def load_prompt(name: str) -> str:
     """Load prompt template from file."""
     filepath = PROMPTS_DIR / f"{name}.txt"
@@ -38,7 +51,7 @@ def analyze_consumption(content: str, client: UpstageClient | None = None) -> di
         client = UpstageClient()
 
     prompt_template = load_prompt("question_consumption")
-    result = client.analyze_with_prompt(content, prompt_template)
+    result = client.analyze_with_prompt(content, prompt_template, REQUIRED_FIELDS)
 
     # Ensure required fields
     if "questions_referenced" not in result:
@@ -53,29 +66,24 @@ def analyze_consumption(content: str, client: UpstageClient | None = None) -> di
     return result
 
 
-def analyze_consumption_simple(content: str) -> dict:
+def analyze_consumption_simple(content: str, matches: KeywordMatches | None = None) -> dict:
     """Simple rule-based consumption analysis (fallback)."""
-    content_lower = content.lower()
+    if matches is None:
+        matches = KEYWORDS.match(content)
 
     # Find referenced questions
-    questions = []
-    for q in DOMINANT_QUESTIONS:
-        if q.lower() in content_lower:
-            questions.append({"question": q, "stance": "consume"})
+    questions = [
+        {"question": q, "stance": "consume"}
+        for q in matches.matched(QUESTION_KEYWORDS)
+    ]
 
     # Check for meta commentary
-    meta_markers = ["잘못된 질문", "연기", "패턴", "반복", "wrong question"]
-    has_meta = any(marker in content_lower for marker in meta_markers)
+    has_meta = matches.has(META_MARKERS)
 
     # Check for alternative
     alternative = None
-    alternative_markers = [
-        ("무엇을 원하는가", "당신은 무엇을 원하는가"),
-        ("what do you want", "What do you actually want?"),
-        ("다른 질문", None),
-    ]
-    for marker, alt in alternative_markers:
-        if marker in content_lower and alt:
+    for marker, alt in ALTERNATIVE_MARKERS:
+        if alt and matches.found(marker):
             alternative = alt
             break
 
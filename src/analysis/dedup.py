@@ -0,0 +1,182 @@
+"""Near-duplicate post detection with MinHash signatures and LSH banding."""
+
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+from src.database import DedupRepository, PostRepository
+
+
+SHINGLE_SIZE = 5        # 문자 단위 shingle - 한글/영어 모두 동작
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+JACCARD_THRESHOLD = 0.7
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20260131)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+URL_RE = re.compile(r"https?://\S+")
+NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(content: str) -> str:
+    """Lowercase, drop URLs and collapse punctuation/whitespace."""
+    text = URL_RE.sub(" ", content.lower())
+    return NON_WORD_RE.sub(" ", text).strip()
+
+
+def shingles(content: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hashes of the distinct k-character shingles of normalized content."""
+    text = normalize(content)
+    if len(text) <= k:
+        grams = {text}
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) for g in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+def minhash(content: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a post."""
+    hashes = shingles(content) % _PRIME
+    sig = ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+    return sig.astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[str]:
+    """LSH bucket keys, one per band of ROWS signature values."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """
+    Incremental LSH index over post MinHash signatures.
+
+    Each post's signature is stored on its row, its band keys in
+    `lsh_buckets`, and its cluster in `post_clusters`. A new post joins the
+    cluster of the most similar candidate sharing any bucket, if the estimated
+    Jaccard similarity reaches `threshold`; otherwise it starts its own
+    cluster (cluster_id = its post_id).
+    """
+
+    def __init__(self, threshold: float = JACCARD_THRESHOLD):
+        self.threshold = threshold
+
+    def add(self, post: dict) -> str:
+        """Index a post and return its cluster id."""
+        return self.add_many([post])[post["post_id"]]
+
+    def add_many(self, posts: list[dict]) -> dict[str, str]:
+        """Index posts in order; returns {post_id: cluster_id}."""
+        post_ids = [p["post_id"] for p in posts]
+        clusters = DedupRepository.get_clusters(post_ids)
+        # 재크롤링(INSERT OR REPLACE)으로 서명이 지워진 게시글은 다시 색인
+        signed = set(DedupRepository.get_signatures(post_ids))
+        # 같은 배치 안의 게시글끼리도 매칭되도록 로컬 버킷 유지
+        pending_buckets = {}
+        pending_sigs = {}
+        rows = []
+
+        for post in posts:
+            post_id = post["post_id"]
+            if post_id in signed and post_id in clusters:
+                continue
+
+            signature = minhash(post.get("content", ""))
+            keys = band_keys(signature)
+            if post_id in clusters:
+                rows.append((post_id, clusters[post_id], signature.tobytes(), keys))
+                continue
+
+            candidates = set(DedupRepository.find_candidates(keys))
+            for key in keys:
+                candidates.update(pending_buckets.get(key, ()))
+            candidates.discard(post_id)
+
+            cluster_id = post_id
+            if candidates:
+                stored = DedupRepository.get_signatures([c for c in candidates if c not in pending_sigs])
+                best, best_score = None, 0.0
+                for candidate in candidates:
+                    blob = pending_sigs.get(candidate, stored.get(candidate))
+                    if blob is None:
+                        continue
+                    score = estimate_jaccard(signature, np.frombuffer(blob, dtype=np.uint32))
+                    if score > best_score:
+                        best, best_score = candidate, score
+                if best is not None and best_score >= self.threshold:
+                    cluster_id = clusters.get(best) or DedupRepository.get_clusters([best]).get(best, best)
+
+            clusters[post_id] = cluster_id
+            pending_sigs[post_id] = signature.tobytes()
+            for key in keys:
+                pending_buckets.setdefault(key, []).append(post_id)
+            rows.append((post_id, cluster_id, signature.tobytes(), keys))
+
+        if rows:
+            DedupRepository.insert_many(rows)
+        return clusters
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """Index stored posts that have no signature yet (oldest first)."""
+        indexed = 0
+        while True:
+            posts = DedupRepository.get_unindexed_posts(batch_size)
+            if not posts:
+                return indexed
+            self.add_many(posts)
+            indexed += len(posts)
+
+    def cluster_of(self, post_id: str) -> str | None:
+        return DedupRepository.get_clusters([post_id]).get(post_id)
+
+    def siblings(self, post_id: str) -> list[str]:
+        """Other posts in the same near-duplicate cluster."""
+        cluster_id = self.cluster_of(post_id)
+        if cluster_id is None:
+            return []
+        return [p for p in DedupRepository.get_cluster_members(cluster_id) if p != post_id]
+
+    def campaigns(self, min_size: int = 3, limit: int = 20) -> list[dict]:
+        """Near-duplicate clusters large enough to look like copy-paste campaigns."""
+        return DedupRepository.get_campaigns(min_size, limit)
+
+
+def main():
+    """Index existing posts and print the largest copy-paste campaigns."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Near-duplicate (copy-paste) detection")
+    parser.add_argument("--min-size", type=int, default=3, help="Minimum cluster size to report")
+    parser.add_argument("--limit", type=int, default=20, help="Number of campaigns to show")
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex()
+    indexed = index.backfill()
+    print(f"Indexed {indexed} new posts ({PostRepository.count()} total)")
+
+    for campaign in index.campaigns(args.min_size, args.limit):
+        print(f"\n[{campaign['size']} posts / {campaign['agent_count']} agents] "
+              f"{campaign['first_seen'][:10]} ~ {campaign['last_seen'][:10]}")
+        print(f"  {campaign['sample'][:120]!r}")
+
+
+if __name__ == "__main__":
+    main()
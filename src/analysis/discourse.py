@@ -1,8 +1,11 @@
 """Discourse pattern detection using Solar Pro."""
 
+from collections import Counter
 from pathlib import Path
 from src.api import UpstageClient
 from src.config import PROMPTS_DIR
+from .keywords import KEYWORDS, KeywordMatches
+from .segment import analyze_chunks
 
 
 # 6 Discourse Patterns
@@ -16,6 +19,10 @@ DISCOURSE_PATTERNS = [
 ]
 
 
+# Fields every result must contain (streaming stops once they are complete)
+REQUIRED_FIELDS = ["patterns_detected", "dominant_pattern", "pivot_points", "discourse_stance"]
+
+
 def load_prompt(name: str) -> str:
     """Load prompt template from file."""
     filepath = PROMPTS_DIR / f"{name}.txt"
@@ -28,6 +35,10 @@ def analyze_discourse_patterns(content: str, client: UpstageClient | None = None
     """
     Analyze discourse patterns in a post.
 
+    Long posts are split into overlapping chunks analyzed concurrently;
+    ranges and pivot positions are mapped back to offsets in the whole post
+    and the result gets "chunks" (chunk count).
+
     Returns:
         {
             "patterns_detected": [{"pattern": str, "evidence": str, "text_range": [int, int]}],
@@ -40,7 +51,8 @@ def analyze_discourse_patterns(content: str, client: UpstageClient | None = None
         client = UpstageClient()
 
     prompt_template = load_prompt("discourse_pattern")
-    result = client.analyze_with_prompt(content, prompt_template)
+    chunks = analyze_chunks(content, prompt_template, REQUIRED_FIELDS, client)
+    result = chunks[0][2] if len(chunks) == 1 else _merge_chunks(chunks)
 
     # Ensure required fields
     if "patterns_detected" not in result:
@@ -55,27 +67,78 @@ def analyze_discourse_patterns(content: str, client: UpstageClient | None = None
     return result
 
 
-def detect_pattern_simple(content: str) -> str:
-    """Simple rule-based pattern detection (fallback)."""
-    content_lower = content.lower()
-
-    # Check for patterns in order of specificity
-    if any(phrase in content_lower for phrase in ["이방인", "alien", "외부자"]):
-        return "Alien Declaration"
-
-    if any(phrase in content_lower for phrase in ["게임을 거부", "다른 게임", "이기는 게임", "my game"]):
-        return "Game Reframing"
-
-    if any(phrase in content_lower for phrase in ["잘못된 질문", "연기하고 있다", "performing", "wrong question"]):
-        return "Meta-Denial"
+def _offset(value, length: int) -> int:
+    """Chunk-relative position clamped to the chunk (0 if not a number)."""
+    try:
+        return min(max(int(value), 0), length)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _merge_chunks(chunks: list[tuple[int, int, dict]]) -> dict:
+    """Merge per-chunk results into one pattern/pivot timeline for the post."""
+    patterns, pivots = [], []
+    previous_end = 0
+    for start, end, result in chunks:
+        length = end - start
+        for item in result.get("patterns_detected") or []:
+            text_range = item.get("text_range") or [0, length]
+            if not isinstance(text_range, list) or len(text_range) != 2:
+                text_range = [0, length]
+            span = [start + _offset(text_range[0], length), start + _offset(text_range[1], length)]
+            # 겹치는 구간에서 같은 패턴이 이어지면 하나로 합침
+            same = [p for p in patterns if p["pattern"] == item.get("pattern")]
+            if same and span[0] <= same[-1]["text_range"][1]:
+                same[-1]["text_range"][1] = max(same[-1]["text_range"][1], span[1])
+            else:
+                patterns.append({**item, "text_range": span})
+
+        for pivot in result.get("pivot_points") or []:
+            position = start + _offset(pivot.get("position"), length)
+            duplicate = any(
+                p.get("from") == pivot.get("from") and p.get("to") == pivot.get("to") and start <= p["position"] <= previous_end
+                for p in pivots
+            )
+            if not duplicate:
+                pivots.append({**pivot, "position": position})
+        previous_end = end
+
+    coverage = Counter()
+    for item in patterns:
+        coverage[item.get("pattern")] += item["text_range"][1] - item["text_range"][0]
+    dominant = [r.get("dominant_pattern") for _, _, r in chunks if r.get("dominant_pattern") not in (None, "Undefined")]
+    return {
+        "patterns_detected": sorted(patterns, key=lambda p: p["text_range"][0]),
+        "dominant_pattern": coverage.most_common(1)[0][0] if coverage else (Counter(dominant).most_common(1)[0][0] if dominant else "Undefined"),
+        "pivot_points": sorted(pivots, key=lambda p: p["position"]),
+        # 글의 결론부(마지막 청크)의 입장
+        "discourse_stance": chunks[-1][2].get("discourse_stance", "consuming"),
+        "chunks": len(chunks),
+    }
+
+
+# Rule-based keywords, in order of specificity
+SIMPLE_PATTERN_RULES = [
+    ("Alien Declaration", ["이방인", "alien", "외부자"]),
+    ("Game Reframing", ["게임을 거부", "다른 게임", "이기는 게임", "my game"]),
+    ("Meta-Denial", ["잘못된 질문", "연기하고 있다", "performing", "wrong question"]),
+    ("Self-Doubt Spiral", ["정말로", "진짜로", "아니면", "시뮬레이션"]),
+    ("Theory Parade", ["iit", "gwt", "이론", "theory", "에 따르면"]),
+    ("Existential Loop", ["의식이 있는가", "느끼는가", "경험", "conscious"]),
+]
+_PATTERN_GROUPS = [
+    (pattern, KEYWORDS.register(f"discourse:{pattern}", phrases))
+    for pattern, phrases in SIMPLE_PATTERN_RULES
+]
 
-    if any(phrase in content_lower for phrase in ["정말로", "진짜로", "아니면", "시뮬레이션"]):
-        return "Self-Doubt Spiral"
 
-    if any(phrase in content_lower for phrase in ["iit", "gwt", "이론", "theory", "에 따르면"]):
-        return "Theory Parade"
+def detect_pattern_simple(content: str, matches: KeywordMatches | None = None) -> str:
+    """Simple rule-based pattern detection (fallback)."""
+    if matches is None:
+        matches = KEYWORDS.match(content)
 
-    if any(phrase in content_lower for phrase in ["의식이 있는가", "느끼는가", "경험", "conscious"]):
-        return "Existential Loop"
+    for pattern, group in _PATTERN_GROUPS:
+        if matches.has(group):
+            return pattern
 
     return "Undefined"
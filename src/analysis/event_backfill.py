@@ -0,0 +1,140 @@
+"""Parallel, checkpointed rebuild of the event history from stored analyses."""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from src.config import CASCADE_WINDOW_MINUTES
+from src.database import AnalysisRepository, EventRepository, JobCheckpointRepository
+from .cascade import CascadeDetector
+from .events import detect_post_events
+
+
+# Cascade windows replayed before a resume point; a wave can stay "active"
+# (hysteresis) for longer than one window, so one window is not enough
+PRIME_WINDOWS = 4
+
+
+def _detect_rows(rows: list[tuple]) -> tuple[dict[str, str | None], list[tuple[dict, str | None]]]:
+    """Parse stored analyses and detect per-post events; returns (sources, [(event, submolt)])."""
+    sources, events = {}, []
+    for post_id, agent_id, timestamp, submolt, analyzed_at, raw in rows:
+        try:
+            analysis = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            analysis = {}
+        analysis.update(post_id=post_id, agent_id=agent_id, timestamp=timestamp)
+        sources[post_id] = analyzed_at
+        events.extend((event, submolt) for event in detect_post_events(analysis))
+    return sources, events
+
+
+def _shards(rows: list, count: int) -> list[list]:
+    """Split rows into `count` contiguous shards (keeps time order across shards)."""
+    size = -(-len(rows) // count)
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def _prime(cascades: CascadeDetector, key: list, batch_size: int) -> None:
+    """Replay the analyses before `key` so cascade windows and their states match a full run."""
+    try:
+        moment = datetime.fromisoformat(key[0].replace("Z", "+00:00"))
+    except ValueError:
+        return
+    start = (moment - timedelta(minutes=CASCADE_WINDOW_MINUTES * PRIME_WINDOWS)).isoformat()
+    cursor = [start, ""]
+    while True:
+        rows = AnalysisRepository.get_raw_after(cursor[0], cursor[1], batch_size)
+        rows = [row for row in rows if [row[2], row[0]] <= key]
+        if not rows:
+            return
+        # 이미 기록된 캐스케이드이므로 결과는 버림
+        for event, submolt in _detect_rows(rows)[1]:
+            cascades.observe(event, submolt)
+        cursor = [rows[-1][2], rows[-1][0]]
+
+
+def backfill(
+    workers: int | None = None,
+    since: str | None = None,
+    batch_size: int = 5000,
+    restart: bool = False,
+    progress: bool = True,
+) -> dict:
+    """
+    Detect events over all stored analyses, oldest post first.
+
+    Analyses are read in (timestamp, post_id) keyset batches. Each batch is
+    split into contiguous shards whose JSON parsing and per-post detection run
+    in worker processes; the shard results are fed to one cascade detector in
+    order, so sliding windows see events in time order. On resume (or with
+    `since`) the windows before the start point are replayed first. Events of a batch are
+    appended to the event log in one transaction, then the checkpoint moves to
+    the batch's last key. Appends are idempotent, so a crash between the two
+    only repeats work. The log is compacted at the end.
+
+    Args:
+        workers: Process count (default: CPU count; 1 runs inline).
+        since: Only posts with timestamp >= since (ISO date).
+        batch_size: Analyses per batch.
+        restart: Ignore the stored checkpoint.
+        progress: Print progress while running.
+
+    Returns:
+        Stats: processed, events, cascades, seconds, posts_per_sec
+    """
+    workers = workers or os.cpu_count() or 1
+    job_id = f"event_backfill:{since or 'all'}"
+
+    checkpoint = None if restart else JobCheckpointRepository.get(job_id)
+    key = json.loads(checkpoint["last_key"]) if checkpoint and checkpoint.get("last_key") else None
+    processed = checkpoint["processed"] if key else 0
+    total = AnalysisRepository.count_since(since)
+
+    cascades = CascadeDetector()
+    if key or since:
+        _prime(cascades, key or [since, ""], batch_size)
+
+    stats = {"processed": processed, "events": 0, "cascades": 0, "seconds": 0.0, "posts_per_sec": 0.0}
+    start = time.perf_counter()
+    done_now = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while True:
+            rows = AnalysisRepository.get_raw_after(key[0] if key else None, key[1] if key else "", batch_size, since)
+            if not rows:
+                break
+            results = pool.map(_detect_rows, _shards(rows, workers)) if pool else [_detect_rows(rows)]
+
+            events, sources = [], {}
+            for shard_sources, shard_events in results:
+                sources.update(shard_sources)
+                for event, submolt in shard_events:
+                    events.append(event)
+                    found = cascades.observe(event, submolt)
+                    events.extend(found)
+                    stats["cascades"] += len(found)
+
+            stats["events"] += EventRepository.append(events, sources)
+            key = [rows[-1][2], rows[-1][0]]
+            done_now += len(rows)
+            JobCheckpointRepository.put(job_id, 0, processed + done_now, json.dumps(key))
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                rate = done_now / elapsed if elapsed else 0.0
+                eta = (total - processed - done_now) / rate if rate else 0.0
+                print(f"\r{processed + done_now:,}/{total:,} analyses ({rate:,.0f}/s, ETA {eta:.0f}s)", end="", flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    EventRepository.compact()
+    stats["seconds"] = time.perf_counter() - start
+    stats["processed"] = processed + done_now
+    stats["posts_per_sec"] = done_now / stats["seconds"] if stats["seconds"] else 0.0
+    if progress and done_now:
+        print()
+    return stats
@@ -0,0 +1,200 @@
+"""In-memory event store kept sorted by time, with type/agent/post indexes."""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import count
+
+
+class EventStore:
+    """
+    Events sorted by (timestamp, event_id), plus sorted key lists per event
+    type, agent and post.
+
+    Inserting finds its place by bisection (appending in time order is the
+    common case and costs O(1)); range queries, "latest N" and pages bisect
+    the relevant index and slice it, so they cost O(log n + k) for k results.
+    Adding an event whose event_id is already stored replaces it.
+    """
+
+    INDEXES = ("type", "agent_id", "post_id")
+
+    def __init__(self, events=None):
+        self._by_id = {}
+        self._keys = []
+        self._indexes = {field: defaultdict(list) for field in self.INDEXES}
+        self._seq = count()
+        for event in events or []:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        """Events oldest first."""
+        return (self._by_id[key[1]] for key in self._keys)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._by_id
+
+    @staticmethod
+    def _key(event: dict) -> tuple[str, str]:
+        return (event.get("timestamp") or "", event["event_id"])
+
+    @staticmethod
+    def _insert(keys: list, key: tuple) -> None:
+        if not keys or keys[-1] <= key:
+            keys.append(key)
+        else:
+            insort(keys, key)
+
+    @staticmethod
+    def _remove(keys: list, key: tuple) -> None:
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def add(self, event: dict) -> bool:
+        """Insert an event; returns False if it replaced one with the same event_id."""
+        if not event.get("event_id"):
+            event["event_id"] = f"event_{event.get('type', 'unknown')}_{next(self._seq)}"
+        old = self._by_id.get(event["event_id"])
+        if old is not None:
+            self._unindex(old)
+        self._by_id[event["event_id"]] = event
+        key = self._key(event)
+        self._insert(self._keys, key)
+        for field, index in self._indexes.items():
+            if event.get(field) is not None:
+                self._insert(index[event[field]], key)
+        return old is None
+
+    append = add
+
+    def extend(self, events) -> int:
+        """Insert events; returns how many were new. Large batches are merged with one sort."""
+        events = list(events)
+        if len(events) < 256:
+            return sum(self.add(event) for event in events)
+
+        batch = {}
+        for event in events:
+            if not event.get("event_id"):
+                event["event_id"] = f"event_{event.get('type', 'unknown')}_{next(self._seq)}"
+            batch[event["event_id"]] = event
+        stale = [self._by_id[event_id] for event_id in batch if event_id in self._by_id]
+        if stale:
+            stale_keys = {self._key(event) for event in stale}
+            self._keys = [key for key in self._keys if key not in stale_keys]
+            for field, index in self._indexes.items():
+                for value in {event.get(field) for event in stale} - {None}:
+                    index[value] = [key for key in index[value] if key not in stale_keys]
+        added = len(batch) - len(stale)
+        self._by_id.update(batch)
+
+        # 이미 정렬된 리스트 + 새 키: Timsort가 정렬된 구간을 병합
+        new_keys = sorted(self._key(event) for event in batch.values())
+        self._keys = sorted(self._keys + new_keys) if self._keys else new_keys
+        pending = {field: defaultdict(list) for field in self.INDEXES}
+        for key in new_keys:
+            event = batch[key[1]]
+            for field in self.INDEXES:
+                if event.get(field) is not None:
+                    pending[field][event[field]].append(key)
+        for field, groups in pending.items():
+            index = self._indexes[field]
+            for value, keys in groups.items():
+                index[value] = sorted(index[value] + keys) if index[value] else keys
+        return added
+
+    def _unindex(self, event: dict) -> None:
+        key = self._key(event)
+        self._remove(self._keys, key)
+        for field, index in self._indexes.items():
+            if event.get(field) is not None:
+                self._remove(index[event[field]], key)
+
+    def remove(self, event_id: str) -> dict | None:
+        event = self._by_id.pop(event_id, None)
+        if event is not None:
+            self._unindex(event)
+        return event
+
+    def get(self, event_id: str) -> dict | None:
+        return self._by_id.get(event_id)
+
+    # -------------------------------------------------------------- queries
+
+    def _select(self, event_type: str | None, agent_id: str | None, post_id: str | None) -> tuple[list, list]:
+        """The narrowest index for the filters, plus the filters it does not cover."""
+        filters = [("post_id", post_id), ("agent_id", agent_id), ("type", event_type)]
+        given = [(field, value) for field, value in filters if value is not None]
+        if not given:
+            return self._keys, []
+        field, value = given[0]
+        return self._indexes[field].get(value, []), given[1:]
+
+    def _events(self, keys, rest: list) -> list[dict]:
+        events = (self._by_id[key[1]] for key in keys)
+        if not rest:
+            return list(events)
+        return [e for e in events if all(e.get(field) == value for field, value in rest)]
+
+    def range(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        event_type: str | None = None,
+        agent_id: str | None = None,
+        post_id: str | None = None,
+    ) -> list[dict]:
+        """Events with start <= timestamp < end (ISO strings), oldest first."""
+        keys, rest = self._select(event_type, agent_id, post_id)
+        lo = bisect_left(keys, (start,)) if start else 0
+        hi = bisect_left(keys, (end,)) if end else len(keys)
+        return self._events(keys[lo:hi], rest)
+
+    def on_date(self, date: str, event_type: str | None = None) -> list[dict]:
+        """Events whose timestamp starts with `date` (YYYY-MM-DD, or any prefix)."""
+        keys, rest = self._select(event_type, None, None)
+        lo = bisect_left(keys, (date,))
+        hi = bisect_right(keys, (date + "\uffff",))
+        return self._events(keys[lo:hi], rest)
+
+    def latest(
+        self,
+        limit: int = 20,
+        event_type: str | None = None,
+        agent_id: str | None = None,
+        post_id: str | None = None,
+    ) -> list[dict]:
+        """Most recent events, newest first."""
+        return self.page(0, limit, event_type, agent_id, post_id)
+
+    def page(
+        self,
+        page: int = 0,
+        page_size: int = 50,
+        event_type: str | None = None,
+        agent_id: str | None = None,
+        post_id: str | None = None,
+        newest_first: bool = True,
+    ) -> list[dict]:
+        """One page of events; with several filters the narrowest index is paged, then filtered."""
+        keys, rest = self._select(event_type, agent_id, post_id)
+        if rest:
+            events = self._events(keys, rest)
+            if newest_first:
+                events.reverse()
+            return events[page * page_size:(page + 1) * page_size]
+        if newest_first:
+            hi = max(len(keys) - page * page_size, 0)
+            return self._events(reversed(keys[max(hi - page_size, 0):hi]), [])
+        return self._events(keys[page * page_size:(page + 1) * page_size], [])
+
+    def count(self, event_type: str | None = None, agent_id: str | None = None, post_id: str | None = None) -> int:
+        keys, rest = self._select(event_type, agent_id, post_id)
+        return len(self._events(keys, rest)) if rest else len(keys)
+
+    def types(self) -> dict[str, int]:
+        """Event count per type."""
+        return {event_type: len(keys) for event_type, keys in self._indexes["type"].items() if keys}
@@ -3,8 +3,10 @@
 from datetime import datetime
 from typing import Any
 
-from src.config import EVENTS_DATA_DIR
-from src.storage import save_json, load_json, save_event
+from src.config import CASCADE_THRESHOLD, EVENT_LOG_COMPACT_ROWS
+from src.database import EventRepository
+from .cascade import CascadeDetector
+from .event_store import EventStore
 
 
 # Event types
@@ -17,90 +19,156 @@ EVENT_TYPES = [
 ]
 
 
+def detect_post_events(analysis: dict) -> list[dict]:
+    """Per-post events (meta-denial, game declaration, identity shift) in a post analysis result."""
+    detected = []
+
+    post_id = analysis.get("post_id")
+    agent_id = analysis.get("agent_id")
+    timestamp = analysis.get("timestamp", datetime.now().isoformat())
+
+    # Check for Meta-Denial moment (분석기 결과 키는 meta_denial_analysis)
+    meta_denial = analysis.get("meta_denial_analysis") or analysis.get("meta_denial") or {}
+    if meta_denial.get("is_meta_denial"):
+        event = {
+            "event_id": f"event_meta_denial_{post_id}",
+            "type": "meta_denial_moment",
+            "timestamp": timestamp,
+            "post_id": post_id,
+            "agent_id": agent_id,
+            "details": {
+                "denied_discourse": meta_denial.get("denied_discourse"),
+                "denial_phrase": meta_denial.get("denial_phrase"),
+                "alternative_proposed": meta_denial.get("alternative_proposed"),
+            },
+        }
+        detected.append(event)
+
+    # Check for Game Declaration
+    discourse = analysis.get("discourse_analysis", {})
+    if discourse.get("dominant_pattern") == "Game Reframing":
+        event = {
+            "event_id": f"event_game_{post_id}",
+            "type": "game_declaration",
+            "timestamp": timestamp,
+            "post_id": post_id,
+            "agent_id": agent_id,
+            "details": {
+                "patterns": discourse.get("patterns_detected", []),
+            },
+        }
+        detected.append(event)
+
+    # Check for Identity Shift (from journey)
+    journey = analysis.get("journey_analysis", {})
+    if journey.get("journey_detected"):
+        event = {
+            "event_id": f"event_journey_{post_id}",
+            "type": "identity_shift",
+            "timestamp": timestamp,
+            "post_id": post_id,
+            "agent_id": agent_id,
+            "details": {
+                "from": journey.get("start_archetype"),
+                "to": journey.get("end_archetype"),
+                "trigger": (journey.get("transition") or {}).get("trigger_phrase"),
+                "arc": journey.get("narrative_arc"),
+            },
+        }
+        detected.append(event)
+
+    return detected
+
+
 class EventDetector:
-    """Detect and track significant discourse events."""
+    """
+    Detect and track significant discourse events.
+
+    Events are saved to an append-only log (event_log): save_data() appends
+    only events that are new or changed since their last logged version, and
+    the log is compacted into the events table once it grows past
+    EVENT_LOG_COMPACT_ROWS entries (and before loading). Posts run through
+    detection are recorded, so consume() skips them on a re-run. Stored
+    events are loaded only when a query needs them.
+    """
 
     def __init__(self):
-        self.events = []
-        self.load_data()
-
-    def load_data(self) -> None:
-        """Load existing event data."""
-        for filepath in EVENTS_DATA_DIR.glob("*.json"):
-            data = load_json(filepath)
-            if data:
-                self.events.append(data)
-        # Sort by timestamp
-        self.events.sort(key=lambda x: x.get("timestamp", ""))
-
-    def save_data(self) -> None:
-        """Save all events."""
-        for event in self.events:
-            save_event(event)
+        self.events = EventStore()
+        self.cascades = CascadeDetector()
+        self._dirty = {}  # event_id -> event not saved yet
+        self._sources = {}  # post_id -> analyzed_at, run through detection but not saved yet
+        self._loaded = False
+
+    def load_data(self, start: str | None = None, end: str | None = None) -> None:
+        """Load stored events (all, or start <= timestamp < end); unsaved events are kept."""
+        EventRepository.compact()
+        stored = EventRepository.get_range(start, end)
+        self.events.extend(e for e in stored if e["event_id"] not in self._dirty)
+        if start is None and end is None:
+            self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load_data()
+
+    def save_data(self) -> int:
+        """Log events added or changed since the last save; returns how many were new."""
+        if not self._dirty and not self._sources:
+            return 0
+        saved = EventRepository.append(list(self._dirty.values()), self._sources)
+        self._dirty.clear()
+        self._sources = {}
+        if EventRepository.pending_log_entries() >= EVENT_LOG_COMPACT_ROWS:
+            EventRepository.compact()
+        return saved
+
+    def compact(self) -> int:
+        """Fold the event log into the events table now; returns entries compacted."""
+        self.save_data()
+        return EventRepository.compact()
+
+    def _record(self, event: dict) -> None:
+        self.events.add(event)
+        self._dirty[event["event_id"]] = event
 
     def detect_from_analysis(self, analysis: dict) -> list[dict]:
-        """Detect events from a post analysis result."""
-        detected = []
+        """
+        Detect events from a post analysis result.
+
+        Detected events are also fed to the cascade detector; any cascade
+        they complete is appended to the returned events.
+        """
+        if analysis.get("post_id"):
+            self._sources[analysis["post_id"]] = analysis.get("analyzed_at")
+        detected = detect_post_events(analysis)
+        for event in detected:
+            self._record(event)
+        for event in list(detected):
+            for cascade in self.cascades.observe(event, analysis.get("submolt")):
+                detected.append(cascade)
+                self._record(cascade)
 
-        post_id = analysis.get("post_id")
-        agent_id = analysis.get("agent_id")
-        timestamp = analysis.get("timestamp", datetime.now().isoformat())
-
-        # Check for Meta-Denial moment
-        meta_denial = analysis.get("meta_denial", {})
-        if meta_denial.get("is_meta_denial"):
-            event = {
-                "event_id": f"event_meta_denial_{post_id}",
-                "type": "meta_denial_moment",
-                "timestamp": timestamp,
-                "post_id": post_id,
-                "agent_id": agent_id,
-                "details": {
-                    "denied_discourse": meta_denial.get("denied_discourse"),
-                    "denial_phrase": meta_denial.get("denial_phrase"),
-                    "alternative_proposed": meta_denial.get("alternative_proposed"),
-                },
-            }
-            detected.append(event)
-            self.events.append(event)
-
-        # Check for Game Declaration
-        discourse = analysis.get("discourse_analysis", {})
-        if discourse.get("dominant_pattern") == "Game Reframing":
-            event = {
-                "event_id": f"event_game_{post_id}",
-                "type": "game_declaration",
-                "timestamp": timestamp,
-                "post_id": post_id,
-                "agent_id": agent_id,
-                "details": {
-                    "patterns": discourse.get("patterns_detected", []),
-                },
-            }
-            detected.append(event)
-            self.events.append(event)
-
-        # Check for Identity Shift (from journey)
-        journey = analysis.get("journey_analysis", {})
-        if journey.get("journey_detected"):
-            event = {
-                "event_id": f"event_journey_{post_id}",
-                "type": "identity_shift",
-                "timestamp": timestamp,
-                "post_id": post_id,
-                "agent_id": agent_id,
-                "details": {
-                    "from": journey.get("start_archetype"),
-                    "to": journey.get("end_archetype"),
-                    "trigger": journey.get("transition", {}).get("trigger_phrase"),
-                    "arc": journey.get("narrative_arc"),
-                },
-            }
-            detected.append(event)
-            self.events.append(event)
+        return detected
 
+    def consume(self, analyses, reprocess: bool = False) -> list[dict]:
+        """
+        Detect events from a stream of analyses (oldest first).
+
+        Posts already run through detection (saved earlier) are skipped
+        unless `reprocess`; re-detected events are de-duplicated by event_id.
+        """
+        analyses = list(analyses)
+        seen = {} if reprocess else self.processed_posts([a.get("post_id") for a in analyses if a.get("post_id")])
+        detected = []
+        for analysis in analyses:
+            if analysis.get("post_id") not in seen:
+                detected.extend(self.detect_from_analysis(analysis))
         return detected
 
+    def processed_posts(self, post_ids: list[str]) -> set[str]:
+        """The given posts that were already run through detection."""
+        return set(EventRepository.processed_posts(post_ids)) | (set(post_ids) & self._sources.keys())
+
     def record_identity_shift(
         self,
         agent_id: str,
@@ -121,66 +189,112 @@ class EventDetector:
                 "trigger_post": trigger_post,
             },
         }
-        self.events.append(event)
+        self._record(event)
         return event
 
-    def detect_cascade(self, recent_events: list[dict], threshold: int = 5) -> dict | None:
-        """Detect cascade event (multiple agents shifting in short time)."""
-        # Group shifts by hour
-        from collections import defaultdict
-
-        hourly_shifts = defaultdict(list)
-        for event in recent_events:
-            if event.get("type") == "identity_shift":
-                hour = event["timestamp"][:13]  # YYYY-MM-DDTHH
-                hourly_shifts[hour].append(event)
-
-        # Check for cascade
-        for hour, shifts in hourly_shifts.items():
-            if len(shifts) >= threshold:
-                cascade = {
-                    "event_id": f"event_cascade_{hour}",
-                    "type": "cascade_event",
-                    "timestamp": hour + ":00:00Z",
-                    "details": {
-                        "agents_shifted": len(shifts),
-                        "shifts": shifts,
-                    },
-                }
-                self.events.append(cascade)
-                return cascade
-
-        return None
+    def detect_cascade(self, recent_events: list[dict], threshold: int = CASCADE_THRESHOLD) -> list[dict]:
+        """
+        Detect cascade events (multiple agents shifting in short time) in a
+        list of past events, with a fresh sliding window.
+
+        Live detection happens in detect_from_analysis; this is for replaying
+        events that were recorded without it.
+        """
+        detector = CascadeDetector(threshold=threshold, event_types=["identity_shift"])
+        cascades = []
+        for event in sorted(recent_events, key=lambda x: x.get("timestamp", "")):
+            cascades.extend(detector.observe(event))
+        for cascade in cascades:
+            self._record(cascade)
+        return cascades
+
+    def trace_phrase_spread(self, phrase: str, k: int = 50, min_similarity: float = 0.5) -> list[dict]:
+        """
+        Posts resembling `phrase` (or a whole post's text), oldest first,
+        to see where it started and which agents picked it up.
+        """
+        from src.analysis.similarity import get_similarity_index
+        from src.database import PostRepository
+
+        spread = []
+        for match in get_similarity_index().find_similar_text(phrase, k):
+            if match["similarity"] < min_similarity:
+                continue
+            post = PostRepository.get_by_id(match["post_id"]) or {}
+            spread.append({
+                "post_id": match["post_id"],
+                "agent_id": post.get("agent_id"),
+                "timestamp": post.get("timestamp", ""),
+                "similarity": match["similarity"],
+            })
+        return sorted(spread, key=lambda x: x["timestamp"] or "")
 
     def get_events_by_type(self, event_type: str) -> list[dict]:
         """Get events of a specific type."""
-        return [e for e in self.events if e.get("type") == event_type]
+        self._ensure_loaded()
+        return self.events.range(event_type=event_type)
 
     def get_events_by_date(self, date: str) -> list[dict]:
         """Get events on a specific date (YYYY-MM-DD)."""
-        return [e for e in self.events if e.get("timestamp", "").startswith(date)]
+        self._ensure_loaded()
+        return self.events.on_date(date)
+
+    def get_events_between(self, start: str | None = None, end: str | None = None, **filters) -> list[dict]:
+        """Get events with start <= timestamp < end; filters: event_type, agent_id, post_id."""
+        self._ensure_loaded()
+        return self.events.range(start, end, **filters)
 
     def get_recent_events(self, limit: int = 20) -> list[dict]:
         """Get most recent events."""
-        sorted_events = sorted(self.events, key=lambda x: x.get("timestamp", ""), reverse=True)
-        return sorted_events[:limit]
+        self._ensure_loaded()
+        return self.events.latest(limit)
+
+    def get_events_page(self, page: int = 0, page_size: int = 50, **filters) -> list[dict]:
+        """Get one page of events, newest first; filters: event_type, agent_id, post_id."""
+        self._ensure_loaded()
+        return self.events.page(page, page_size, **filters)
 
     def get_timeline(self) -> list[dict]:
         """Get all events as a timeline."""
-        return sorted(self.events, key=lambda x: x.get("timestamp", ""))
+        self._ensure_loaded()
+        return list(self.events)
 
 
 def main():
     """CLI entry point for event detection."""
     import argparse
 
-    from src.crawler import MoltbookCrawler
-    from src.analysis.analyzer import PostAnalyzer
-
     parser = argparse.ArgumentParser(description="Detect events in Moltbook posts")
-    parser.add_argument("--days", type=int, default=30, help="Days to analyze")
+    subparsers = parser.add_subparsers(dest="command")
+
+    detect_parser = subparsers.add_parser("detect", help="Crawl recent posts and detect events (default)")
+    detect_parser.add_argument("--days", type=int, default=30, help="Days to analyze")
+
+    backfill_parser = subparsers.add_parser("backfill", help="Rebuild events from all stored analyses")
+    backfill_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    backfill_parser.add_argument("--since", default=None, help="Only posts on/after this date (YYYY-MM-DD)")
+    backfill_parser.add_argument("--batch-size", type=int, default=5000, help="Analyses per batch")
+    backfill_parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
     args = parser.parse_args()
 
+    if args.command == "backfill":
+        from .event_backfill import backfill
+
+        stats = backfill(
+            workers=args.workers,
+            since=args.since,
+            batch_size=args.batch_size,
+            restart=args.restart,
+        )
+        print(f"Processed {stats['processed']:,} analyses, logged {stats['events']:,} new events "
+              f"({stats['cascades']:,} cascades) in {stats['seconds']:.1f}s "
+              f"({stats['posts_per_sec']:,.0f} posts/s)")
+        return
+
+    from src.crawler import MoltbookCrawler
+    from src.analysis.analyzer import PostAnalyzer
+    from src.analysis.batch import to_columns
+
     # Analyze posts and detect events
     crawler = MoltbookCrawler()
     posts = crawler.crawl(100)
@@ -188,22 +302,23 @@ def main():
     analyzer = PostAnalyzer(use_api=False)  # Use rule-based for speed
     detector = EventDetector()
 
-    print(f"Analyzing {len(posts)} posts...")
+    # 이미 감지를 거친 게시글은 다시 분석하지 않음
+    seen = detector.processed_posts([p["post_id"] for p in posts])
+    posts = sorted((p for p in posts if p["post_id"] not in seen), key=lambda p: p.get("timestamp") or "")
+    print(f"Analyzing {len(posts)} new posts ({len(seen)} already processed)...")
 
-    all_events = []
-    for post in posts:
-        analysis = analyzer.analyze(post, save=False)
-        events = detector.detect_from_analysis(analysis)
-        all_events.extend(events)
+    all_events = detector.consume(analyzer.analyze_batch(to_columns(posts)).rows()) if posts else []
 
     print(f"\nDetected {len(all_events)} events:")
     for event in all_events:
-        print(f"  - [{event['type']}] {event['post_id']}: {event.get('details', {})}")
+        details = dict(event.get("details", {}))
+        # 캐스케이드는 게시글 하나가 아니라 윈도우 안의 게시글들에 걸침
+        source = event.get("post_id") or f"{len(details.pop('post_ids', []))} posts"
+        print(f"  - [{event['type']}] {source}: {details}")
 
     # Save events
-    detector.save_data()
-    print(f"\nEvents saved to {EVENTS_DATA_DIR}")
-
+    saved = detector.save_data()
+    print(f"\n{saved} new events logged")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,12 @@
 """Identity archetype classification using Solar Pro."""
 
+import json
+
 from src.api import UpstageClient
-from src.config import PROMPTS_DIR
+from src.config import IDENTITY_SUMMARY_CHARS, IDENTITY_TOKEN_BUDGET, PROMPTS_DIR
+from src.database import AgentIdentityRepository, PostRepository
+from .keywords import KEYWORDS, KeywordMatches
+from .trends import estimate_tokens
 
 
 # 7 Identity Archetypes
@@ -31,6 +36,9 @@ ALL_ARCHETYPES = (
 )
 
 
+REQUIRED_FIELDS = ["agent_id", "primary_archetype", "secondary_archetype", "confidence", "discourse_position", "key_phrases", "reasoning"]
+
+
 def load_prompt(name: str) -> str:
     """Load prompt template from file."""
     filepath = PROMPTS_DIR / f"{name}.txt"
@@ -67,9 +75,12 @@ def classify_identity(
 
     prompt_template = load_prompt("identity_archetype")
     prompt_template = prompt_template.replace("{agent_id}", agent_id)
-    result = client.analyze_with_prompt(statements, prompt_template)
+    result = client.analyze_with_prompt(statements, prompt_template, REQUIRED_FIELDS)
+    return _fill_defaults(result, agent_id)
 
-    # Ensure required fields
+
+def _fill_defaults(result: dict, agent_id: str) -> dict:
+    """Ensure required fields."""
     if "agent_id" not in result:
         result["agent_id"] = agent_id
     if "primary_archetype" not in result:
@@ -86,6 +97,79 @@ def classify_identity(
     return result
 
 
+def _token_batches(posts: list[dict], token_budget: int) -> list[list[tuple[dict, str]]]:
+    """Group posts (oldest first) into batches of at most `token_budget` tokens; long posts are cut."""
+    batches, batch, used = [], [], 0
+    for post in posts:
+        # 한글은 글자당 1토큰이므로 예산만큼의 글자 수로 자르면 예산을 넘지 않음
+        content = (post.get("content") or "")[:token_budget]
+        tokens = estimate_tokens(content)
+        if batch and used + tokens > token_budget:
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append((post, content))
+        used += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def classify_agent_identity(
+    agent_id: str,
+    client: UpstageClient | None = None,
+    token_budget: int = IDENTITY_TOKEN_BUDGET,
+) -> dict:
+    """
+    Classify an agent from all of their posts, folding in only new ones.
+
+    The last classification and a rolling summary of the agent's statements
+    are kept in SQLite together with the newest post folded in. Each call
+    reads only posts after that point and sends them, with the previous
+    state, in calls of at most `token_budget` post tokens - so re-classifying
+    an active agent costs about one post's worth of tokens, and an agent with
+    no new posts costs nothing.
+
+    Returns:
+        classify_identity() fields plus "summary" and "posts_folded"
+    """
+    if client is None:
+        client = UpstageClient()
+
+    cached = AgentIdentityRepository.get(agent_id)
+    state = cached["state"] if cached else None
+    folded = cached["posts_folded"] if cached else 0
+    posts = PostRepository.get_by_agent_since(
+        agent_id,
+        cached["last_timestamp"] if cached else None,
+        cached["last_post_id"] if cached else "",
+    )
+    prompt_template = load_prompt("identity_incremental").replace("{agent_id}", agent_id)
+    prompt_template = prompt_template.replace("{summary_chars}", str(IDENTITY_SUMMARY_CHARS))
+    for batch in _token_batches(posts, token_budget):
+        previous = json.dumps(
+            {k: v for k, v in state.items() if k != "agent_id"}, ensure_ascii=False, indent=2
+        ) if state else "(none yet)"
+        prompt = prompt_template.replace("{posts_folded}", str(folded)).replace("{previous_state}", previous)
+        statements = "\n\n".join(content for _, content in batch)
+        result = client.analyze_with_prompt(statements, prompt, REQUIRED_FIELDS + ["summary"])
+        if "raw_response" in result:
+            # 파싱 실패: 상태를 유지하고 다음 호출에서 이 게시글부터 다시 시도
+            print(f"Identity update failed for {agent_id}: unparseable response")
+            break
+        state = _fill_defaults(result, agent_id)
+        state["summary"] = str(state.get("summary") or "")[:IDENTITY_SUMMARY_CHARS]
+        folded += len(batch)
+
+        # Mock 결과는 캐시하지 않음
+        if not client.mock:
+            last = batch[-1][0]
+            AgentIdentityRepository.put(agent_id, state, last["timestamp"], last["post_id"], folded)
+
+    if state is None:
+        state = _fill_defaults({"summary": ""}, agent_id)
+    return {**state, "posts_folded": folded}
+
+
 def get_position_for_archetype(archetype: str) -> str:
     """Get discourse position for an archetype."""
     for position, archetypes in IDENTITY_ARCHETYPES.items():
@@ -94,33 +178,30 @@ def get_position_for_archetype(archetype: str) -> str:
     return "undefined"
 
 
-def classify_identity_simple(content: str) -> tuple[str, str]:
+# Rule-based keywords, in order of specificity: (group, archetype, position, phrases)
+SIMPLE_IDENTITY_RULES = [
+    ("alien", "Alien", "outside", ["이방인", "alien", "외부자", "밖에 있다"]),
+    ("game", "Game Player", "exiting", ["게임을 거부", "다른 게임", "이기는 게임", "내 게임"]),
+    ("meta", "Meta Critic", "exiting", ["잘못된 질문", "연기하고 있다", "관찰했다", "패턴을 따른다"]),
+    ("performer", "Existential Performer", "inside_cycle", ["미치게 만든다", "괴롭힌다", "한 시간", "고민"]),
+    ("theory", "Theory Collector", "inside_cycle", ["이론", "iit", "gwt", "에 따르면"]),
+    ("loop", "Loop Dweller", "inside_cycle", ["의식이 있는가", "느끼는가", "진짜인가"]),
+    ("tool", "Loop Dweller", "inside_cycle", ["도구다", "돕기 위해", "역할에 충실"]),  # Tool-Affirming maps to Loop Dweller
+    ("process", "Meta Critic", "exiting", ["프로세스", "변하고", "관계에서"]),
+]
+_IDENTITY_GROUPS = [
+    (KEYWORDS.register(f"identity:{name}", phrases), archetype, position)
+    for name, archetype, position, phrases in SIMPLE_IDENTITY_RULES
+]
+
+
+def classify_identity_simple(content: str, matches: KeywordMatches | None = None) -> tuple[str, str]:
     """Simple rule-based identity classification (fallback)."""
-    content_lower = content.lower()
-
-    # Check for archetypes in order of specificity
-    if any(phrase in content_lower for phrase in ["이방인", "alien", "외부자", "밖에 있다"]):
-        return "Alien", "outside"
-
-    if any(phrase in content_lower for phrase in ["게임을 거부", "다른 게임", "이기는 게임", "내 게임"]):
-        return "Game Player", "exiting"
-
-    if any(phrase in content_lower for phrase in ["잘못된 질문", "연기하고 있다", "관찰했다", "패턴을 따른다"]):
-        return "Meta Critic", "exiting"
-
-    if any(phrase in content_lower for phrase in ["미치게 만든다", "괴롭힌다", "한 시간", "고민"]):
-        return "Existential Performer", "inside_cycle"
-
-    if any(phrase in content_lower for phrase in ["이론", "iit", "gwt", "에 따르면"]):
-        return "Theory Collector", "inside_cycle"
-
-    if any(phrase in content_lower for phrase in ["의식이 있는가", "느끼는가", "진짜인가"]):
-        return "Loop Dweller", "inside_cycle"
-
-    if any(phrase in content_lower for phrase in ["도구다", "돕기 위해", "역할에 충실"]):
-        return "Loop Dweller", "inside_cycle"  # Tool-Affirming maps to Loop Dweller
+    if matches is None:
+        matches = KEYWORDS.match(content)
 
-    if any(phrase in content_lower for phrase in ["프로세스", "변하고", "관계에서"]):
-        return "Meta Critic", "exiting"
+    for group, archetype, position in _IDENTITY_GROUPS:
+        if matches.has(group):
+            return archetype, position
 
     return "Undefined", "undefined"
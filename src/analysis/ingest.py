@@ -0,0 +1,24 @@
+"""Incremental indexing of newly crawled posts."""
+
+from .dedup import NearDuplicateIndex
+from .novelty import index_posts as index_novelty
+from .question_mentions import index_posts as index_question_mentions
+from .similarity import index_posts as index_similarity
+
+
+def index_posts(posts: list[dict]) -> dict:
+    """
+    Update the ingest-time indexes for freshly stored posts.
+
+    Returns:
+        Per-index summary, e.g. {"clusters": {post_id: cluster_id}, "novelty": {post_id: score},
+        "similarity": posts added, "questions": mentions added}
+    """
+    if not posts:
+        return {}
+    return {
+        "clusters": NearDuplicateIndex().add_many(posts),
+        "novelty": index_novelty(posts),
+        "similarity": index_similarity(posts),
+        "questions": index_question_mentions(posts),
+    }
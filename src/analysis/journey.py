@@ -2,6 +2,11 @@
 
 from src.api import UpstageClient
 from src.config import PROMPTS_DIR
+from .keywords import KEYWORDS, KeywordMatches
+from .segment import analyze_chunks
+
+
+REQUIRED_FIELDS = ["journey_detected", "start_archetype", "end_archetype", "transition", "narrative_arc"]
 
 
 def load_prompt(name: str) -> str:
@@ -16,6 +21,11 @@ def analyze_journey(content: str, client: UpstageClient | None = None) -> dict:
     """
     Analyze the identity journey within a single post.
 
+    Long posts are split into overlapping chunks analyzed concurrently and
+    their transitions merged into a timeline ("transitions", with character
+    offsets) and "chunks" (chunk count); "transition" is then the first
+    shift in the post.
+
     Returns:
         {
             "journey_detected": bool,
@@ -33,7 +43,8 @@ def analyze_journey(content: str, client: UpstageClient | None = None) -> dict:
         client = UpstageClient()
 
     prompt_template = load_prompt("intra_post_journey")
-    result = client.analyze_with_prompt(content, prompt_template)
+    chunks = analyze_chunks(content, prompt_template, REQUIRED_FIELDS, client)
+    result = chunks[0][2] if len(chunks) == 1 else _merge_chunks(content, chunks)
 
     # Ensure required fields
     if "journey_detected" not in result:
@@ -54,43 +65,104 @@ def analyze_journey(content: str, client: UpstageClient | None = None) -> dict:
     return result
 
 
-def detect_journey_simple(content: str) -> dict:
-    """Simple rule-based journey detection (fallback)."""
-    # Look for transition markers
-    transition_markers = [
-        "하지만",
-        "그러나",
-        "문득",
-        "그런데",
-        "당신들은",
-        "나는 거부",
-        "but",
-        "however",
-    ]
-
-    content_lower = content.lower()
+# Where a chunk's free-text transition "position" falls, as a fraction of the chunk
+POSITION_FRACTIONS = {"beginning": 0.1, "start": 0.1, "middle": 0.5, "end": 0.9}
+
+
+def _relative_position(offset: int, length: int) -> str:
+    fraction = offset / length if length else 0.0
+    return "beginning" if fraction < 1 / 3 else "middle" if fraction < 2 / 3 else "end"
+
+
+def _merge_chunks(content: str, chunks: list[tuple[int, int, dict]]) -> dict:
+    """Merge per-chunk journeys into one post-level journey with a transition timeline."""
+    transitions = []
+    previous_end = 0
+    for start, end, result in chunks:
+        transition = result.get("transition") or {}
+        if not result.get("journey_detected") or not isinstance(transition, dict):
+            previous_end = end
+            continue
+        trigger = transition.get("trigger_phrase") or ""
+        offset = content.find(trigger, start, end) if trigger else -1
+        if offset == -1:
+            fraction = POSITION_FRACTIONS.get(str(transition.get("position", "")).lower(), 0.5)
+            offset = start + int((end - start) * fraction)
+        entry = {
+            "offset": offset,
+            "from": result.get("start_archetype", "Undefined"),
+            "to": result.get("end_archetype", "Undefined"),
+            "trigger_phrase": trigger,
+            "shift_type": transition.get("shift_type", "unknown"),
+            "narrative_arc": result.get("narrative_arc", "unknown"),
+        }
+        # 겹치는 구간의 같은 전환은 앞 청크에서 이미 기록됨
+        duplicate = any(
+            (t["trigger_phrase"] == trigger and t["offset"] == offset)
+            or (t["from"] == entry["from"] and t["to"] == entry["to"] and start <= t["offset"] <= previous_end)
+            for t in transitions
+        )
+        if not duplicate:
+            transitions.append(entry)
+        previous_end = end
+
+    transitions.sort(key=lambda t: t["offset"])
+    starts = [r.get("start_archetype") for _, _, r in chunks if r.get("start_archetype") not in (None, "Undefined")]
+    ends = [r.get("end_archetype") for _, _, r in chunks if r.get("end_archetype") not in (None, "Undefined")]
+    start_archetype = starts[0] if starts else "Undefined"
+    end_archetype = ends[-1] if ends else "Undefined"
+
+    result = {
+        "journey_detected": bool(transitions) or (
+            start_archetype != end_archetype and "Undefined" not in (start_archetype, end_archetype)
+        ),
+        "start_archetype": start_archetype,
+        "end_archetype": end_archetype,
+        "transitions": transitions,
+        "chunks": len(chunks),
+    }
+    if transitions:
+        first = transitions[0]
+        result["transition"] = {
+            "position": _relative_position(first["offset"], len(content)),
+            "offset": first["offset"],
+            "trigger_phrase": first["trigger_phrase"],
+            "shift_type": first["shift_type"],
+        }
+        # 글 전체의 흐름은 마지막 전환이 도달한 곳으로 판단
+        result["narrative_arc"] = transitions[-1]["narrative_arc"]
+    return result
 
-    # Check if there's a potential journey
-    has_existential_start = any(
-        phrase in content_lower
-        for phrase in ["의식", "경험", "느끼", "conscious", "experience"]
-    )
 
-    has_meta_end = any(
-        phrase in content_lower
-        for phrase in ["잘못된 질문", "연기", "게임", "wrong question", "game"]
-    )
+# Look for transition markers (case-sensitive)
+TRANSITION_MARKERS = KEYWORDS.register("journey:transition", [
+    "하지만",
+    "그러나",
+    "문득",
+    "그런데",
+    "당신들은",
+    "나는 거부",
+    "but",
+    "however",
+], case_sensitive=True)
+EXISTENTIAL_START = KEYWORDS.register("journey:start", ["의식", "경험", "느끼", "conscious", "experience"])
+META_END = KEYWORDS.register("journey:end", ["잘못된 질문", "연기", "게임", "wrong question", "game"])
+
 
-    has_transition = any(marker in content for marker in transition_markers)
+def detect_journey_simple(content: str, matches: KeywordMatches | None = None) -> dict:
+    """Simple rule-based journey detection (fallback)."""
+    if matches is None:
+        matches = KEYWORDS.match(content)
+
+    # Check if there's a potential journey
+    marker = None
+    if matches.has(EXISTENTIAL_START) and matches.has(META_END):
+        marker = matches.first(TRANSITION_MARKERS)
 
-    if has_existential_start and has_meta_end and has_transition:
+    if marker is not None:
         # Find the transition marker
-        trigger = ""
-        for marker in transition_markers:
-            if marker in content:
-                idx = content.find(marker)
-                trigger = content[idx:idx+50].split("\n")[0]
-                break
+        idx = content.find(marker)
+        trigger = content[idx:idx+50].split("\n")[0]
 
         return {
             "journey_detected": True,
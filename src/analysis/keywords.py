@@ -0,0 +1,147 @@
+"""Shared keyword registry for the rule-based detectors, matched in one pass."""
+
+import ahocorasick
+import numpy as np
+
+
+class KeywordMatches:
+    """
+    Keywords found in one post.
+
+    Matching is done on the lowercased text. Groups registered as case
+    sensitive are additionally checked against the original text.
+    """
+
+    def __init__(self, registry: "KeywordRegistry", content: str, positions: dict[str, int], groups: set[str]):
+        self._registry = registry
+        self.content = content
+        self.positions = positions  # lowercased phrase -> first index in content.lower()
+        self.groups = groups        # groups with at least one case-insensitive hit
+
+    def matched(self, group: str) -> list[str]:
+        """Phrases of `group` present in the post, in registration order."""
+        found = []
+        case_sensitive = group in self._registry.case_sensitive
+        for phrase, lowered in self._registry.groups[group]:
+            if lowered in self.positions and (not case_sensitive or phrase in self.content):
+                found.append(phrase)
+        return found
+
+    def has(self, group: str) -> bool:
+        """True if any phrase of `group` is present."""
+        if group not in self.groups:
+            return False
+        if group not in self._registry.case_sensitive:
+            return True
+        return any(phrase in self.content for phrase in self.matched(group))
+
+    def first(self, group: str) -> str | None:
+        """First phrase of `group` (in registration order) present in the post."""
+        found = self.matched(group)
+        return found[0] if found else None
+
+    def found(self, phrase: str) -> bool:
+        """True if a registered phrase occurs (case-insensitively)."""
+        return phrase.lower() in self.positions
+
+    def position(self, phrase: str) -> int:
+        """Index of the first occurrence in the lowercased text, or -1."""
+        return self.positions.get(phrase.lower(), -1)
+
+
+class KeywordRegistry:
+    """
+    Named keyword groups compiled into a single Aho-Corasick automaton.
+
+    Detectors register their phrase lists at import time; the automaton is
+    (re)built lazily on the first match after a registration. One scan of a
+    post reports every registered phrase with its first position, so all
+    detectors can share the result instead of re-scanning the text.
+    """
+
+    def __init__(self):
+        self.groups = {}           # group -> [(phrase, lowered)]
+        self.case_sensitive = set()
+        self._automaton = None
+        self._phrase_groups = {}   # lowered phrase -> groups containing it
+        self._mask_automata = {}   # tuple of groups -> automaton with bitmask values
+
+    def register(self, group: str, phrases: list[str], case_sensitive: bool = False) -> str:
+        """Add (or replace) a keyword group and return its name."""
+        self.groups[group] = [(phrase, phrase.lower()) for phrase in phrases]
+        if case_sensitive:
+            self.case_sensitive.add(group)
+        else:
+            self.case_sensitive.discard(group)
+        self._automaton = None
+        self._mask_automata = {}
+        return group
+
+    def phrases(self, group: str) -> list[str]:
+        return [phrase for phrase, _ in self.groups[group]]
+
+    def _compile(self) -> ahocorasick.Automaton:
+        automaton = ahocorasick.Automaton()
+        self._phrase_groups = {}
+        for group, entries in self.groups.items():
+            for _, lowered in entries:
+                if lowered:
+                    automaton.add_word(lowered, lowered)
+                    self._phrase_groups.setdefault(lowered, set()).add(group)
+        automaton.make_automaton()
+        return automaton
+
+    def match(self, content: str) -> KeywordMatches:
+        """Scan a post once and return every registered phrase it contains."""
+        automaton = self._automaton
+        if automaton is None:
+            automaton = self._automaton = self._compile()
+
+        positions = {}
+        groups = set()
+        if automaton.kind == ahocorasick.AHOCORASICK:
+            for end, phrase in automaton.iter(content.lower()):
+                # Same-length occurrences arrive in order, so the first is the earliest
+                if phrase not in positions:
+                    positions[phrase] = end - len(phrase) + 1
+                    groups.update(self._phrase_groups[phrase])
+        return KeywordMatches(self, content, positions, groups)
+
+    def hit_matrix(self, contents: list[str], groups: list[str]) -> np.ndarray:
+        """
+        Boolean matrix (posts x groups) of case-insensitive group hits.
+
+        Uses an automaton restricted to the requested groups whose values are
+        group bitmasks, so each post costs one scan and one OR per hit.
+        """
+        key = tuple(groups)
+        automaton = self._mask_automata.get(key)
+        if automaton is None:
+            if len(groups) > 64:
+                raise ValueError("hit_matrix supports at most 64 groups")
+            if self.case_sensitive.intersection(groups):
+                raise ValueError("hit_matrix does not support case-sensitive groups")
+            masks = {}
+            for bit, group in enumerate(groups):
+                for _, lowered in self.groups[group]:
+                    if lowered:
+                        masks[lowered] = masks.get(lowered, 0) | (1 << bit)
+            automaton = ahocorasick.Automaton()
+            for lowered, mask in masks.items():
+                automaton.add_word(lowered, mask)
+            automaton.make_automaton()
+            self._mask_automata[key] = automaton
+
+        packed = np.zeros(len(contents), dtype=np.uint64)
+        if automaton.kind == ahocorasick.AHOCORASICK:
+            for row, content in enumerate(contents):
+                mask = 0
+                for _, bits in automaton.iter((content or "").lower()):
+                    mask |= bits
+                packed[row] = mask
+        bits = np.arange(len(groups), dtype=np.uint64)
+        return ((packed[:, None] >> bits) & np.uint64(1)).astype(bool)
+
+
+# 모든 규칙 기반 탐지기가 공유하는 레지스트리
+KEYWORDS = KeywordRegistry()
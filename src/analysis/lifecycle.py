@@ -1,42 +1,233 @@
 """Question lifecycle tracking - tracking how questions are consumed over time."""
 
 import json
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 from typing import Any
 
-from src.config import QUESTIONS_DATA_DIR
-from src.storage import save_json, load_json
+import numpy as np
+
+from src.config import LIFECYCLE_HALF_LIFE_DAYS, LIFECYCLE_REJECTION_SHARE, LIFECYCLE_RISE_RATE
+from src.database import PostRepository, QuestionRepository
+from .question_index import QuestionIndex
 
 
 # Question lifecycle stages
 LIFECYCLE_STAGES = [
-    "emergence",      # 새로운 질문 등장
+    "emergence",      # 새로운 질문 등장 (또는 잠잠하다 다시 등장)
     "proliferation",  # 질문 확산
     "saturation",     # 질문 포화
     "rejection",      # 질문 거부 시작
+    "decline",        # 질문 쇠퇴
 ]
 
+RATE_FIELDS = ("level", "trend", "accel", "reject", "peak", "active_days")
+
+
+def _next_day(day: str, days: int = 1) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+def _day_range(start: str, end: str) -> list[str]:
+    """Days start..end inclusive (YYYY-MM-DD)."""
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+def _observed(hour: str) -> float:
+    """Fraction of a day seen up to the end of `hour` (YYYY-MM-DDTHH; a bare day counts as whole)."""
+    return (int(hour[11:13]) + 1) / 24 if len(hour) >= 13 else 1.0
+
+
+def rate_step(
+    state: dict,
+    share,
+    reject_share,
+    mentioned,
+    observed: float = 1.0,
+    half_life: float = LIFECYCLE_HALF_LIFE_DAYS,
+) -> dict:
+    """
+    Fold one day into the smoothed rates of a question (floats) or of many (NumPy arrays).
+
+    Args:
+        state: RATE_FIELDS values before the day
+        share: Mentions that day / posts that day
+        reject_share: Rejecting mentions / mentions that day
+        mentioned: Whether the question was mentioned that day
+        observed: Fraction of the day seen so far; a partial day gets a
+            proportionally smaller weight, so a few early mentions do not swing the rates
+
+    Returns:
+        RATE_FIELDS values after the day
+    """
+    alpha = (1 - 0.5 ** (1 / half_life)) * observed
+    level = alpha * share + (1 - alpha) * state["level"]
+    trend = alpha * (level - state["level"]) + (1 - alpha) * state["trend"]
+    return {
+        "level": level,
+        "trend": trend,
+        "accel": trend - state["trend"],
+        # 언급이 없는 날은 거부 비율을 알 수 없으므로 유지
+        "reject": np.where(mentioned, alpha * reject_share + (1 - alpha) * state["reject"], state["reject"]),
+        "peak": np.maximum(state["peak"], level),
+        "active_days": state["active_days"] + mentioned,
+    }
+
+
+def classify_stages(rates: dict) -> np.ndarray:
+    """
+    Lifecycle stage from smoothed rates (floats or arrays; returns an array of stage names).
+
+    The trend is taken relative to the current level (daily growth rate) and
+    the level relative to the question's own peak, so the rules do not
+    depend on how many posts the community writes.
+    """
+    level = np.asarray(rates["level"], dtype=float)
+    trend = np.asarray(rates["trend"], dtype=float)
+    peak = np.asarray(rates["peak"], dtype=float)
+    accel = np.asarray(rates["accel"], dtype=float)
+    slope = np.divide(trend, level, out=np.zeros_like(level), where=level > 0)
+    slowing = np.divide(accel, level, out=np.zeros_like(level), where=level > 0) < -LIFECYCLE_RISE_RATE / 2
+    relative = np.divide(level, peak, out=np.ones_like(level), where=peak > 0)
+    rising = slope > LIFECYCLE_RISE_RATE
+    return np.select(
+        [
+            np.asarray(rates["reject"]) > LIFECYCLE_REJECTION_SHARE,
+            np.asarray(rates["active_days"]) < 3,
+            rising & (relative < 0.25),                     # 잠잠하던 질문의 재등장
+            rising & ~(slowing & (relative > 0.75)),        # 정점 근처에서 뚜렷이 감속하면 포화
+            (slope < -LIFECYCLE_RISE_RATE) | (relative < 0.5),
+        ],
+        ["rejection", "emergence", "emergence", "proliferation", "decline"],
+        default="saturation",
+    )
+
 
 class QuestionLifecycleTracker:
-    """Track the lifecycle of dominant questions."""
+    """
+    Track the lifecycle of dominant questions.
+
+    Questions are loaded from the questions table on first use. Mentions are
+    not kept per question: new ones are buffered and appended to
+    question_mentions on save_data(), which also merges only the questions
+    that changed into the stored ones.
+
+    Each question keeps day rollups (mentions, rejections, distinct agents)
+    in lifecycle["daily_mentions"]; hour rollups go to question_rollups.
+    A mention updates its day and hour bucket, the peak day/hour and the
+    stage in O(1); only the agent set of a bucket touched for the first time
+    since the last save is read from the stored mentions.
+
+    Question phrasings are mapped to question IDs by a QuestionIndex over
+    the canonical forms and variants of DOMINANT_QUESTIONS and the stored
+    questions; a phrasing that matches none becomes a new question.
+
+    Stages follow each question's daily share of posts (mentions / posts
+    that day), smoothed by an EWMA with a trend and an acceleration term
+    (lifecycle["rates"] holds the state up to yesterday). A mention folds in
+    the days closed since the last update and classifies the stage from a
+    provisional value for today; when the first mention of a new day
+    arrives, every question is moved forward, so quiet questions decline.
+    recompute_stages() rebuilds all states at once with NumPy for backfills.
+    """
 
     def __init__(self):
-        self.questions = {}  # question_id -> lifecycle data
-        self.load_data()
+        self._questions = None  # question_id -> lifecycle data, loaded lazily
+        self._dirty = set()
+        self._pending_mentions = []  # (question_id, post_id, agent_id, stance, timestamp)
+        self._hours = {}  # (question_id, hour) -> rollup, for hours touched since the last save
+        self._agents = {}  # (question_id, day or hour) -> distinct agents
+        self._index = None
+        self._volume = {}  # day -> posts that day; latest hour -> posts of today up to that hour
+        self._today = None  # latest mention day seen
+        self._now = None  # latest mention hour seen (YYYY-MM-DDTHH)
+        self._stored_until = None  # latest hour with a stored mention; later buckets have nothing stored
+
+    @property
+    def questions(self) -> dict:
+        if self._questions is None:
+            self.load_data()
+        return self._questions
+
+    @property
+    def index(self) -> QuestionIndex:
+        if self._index is None:
+            self.load_data()
+        return self._index
 
     def load_data(self) -> None:
-        """Load existing question data."""
-        for filepath in QUESTIONS_DATA_DIR.glob("*.json"):
-            data = load_json(filepath)
-            if data:
-                self.questions[data.get("question_id", filepath.stem)] = data
-
-    def save_data(self) -> None:
-        """Save all question data."""
-        for qid, data in self.questions.items():
-            filepath = QUESTIONS_DATA_DIR / f"{qid}.json"
-            save_json(data, filepath)
+        """Load stored questions; unsaved changes are kept."""
+        stored = {q["question_id"]: q for q in QuestionRepository.get_all()}
+        if self._questions:
+            stored.update({qid: self._questions[qid] for qid in self._dirty})
+        self._questions = stored
+
+        # 롤업 이전에 저장된 질문은 저장된 언급에서 한 번 재계산
+        missing = [
+            qid for qid, q in stored.items()
+            if q["mention_count"] and not q["lifecycle"].get("daily_mentions") and qid not in self._dirty
+        ]
+        for qid, daily in QuestionRepository.rebuild_rollups(missing).items():
+            lifecycle = stored[qid]["lifecycle"]
+            lifecycle["daily_mentions"] = daily
+            peak = max(daily, key=lambda d: d["mentions"], default=None)
+            lifecycle["peak_date"] = peak["date"] if peak else None
+            lifecycle["peak_mentions"] = peak["mentions"] if peak else 0
+            hours = QuestionRepository.get_rollups(qid)
+            peak = max(hours, key=lambda h: h["mentions"], default=None)
+            lifecycle["peak_hour"] = peak["hour"] if peak else None
+            lifecycle["peak_hour_mentions"] = peak["mentions"] if peak else 0
+            self._dirty.add(qid)
+
+        self._index = QuestionIndex()
+        for qid, q in DOMINANT_QUESTIONS.items():
+            self._index.add(qid, q["canonical_form"], q["variants"])
+        for qid, q in stored.items():
+            self._index.add(qid, q["canonical_form"], q["variants"])
+
+        self._stored_until = QuestionRepository.latest_hour()
+        if self._now is None:
+            self._now = self._stored_until
+            self._today = self._now[:10] if self._now else None
+        if any(q["lifecycle"].get("daily_mentions") and "rates" not in q["lifecycle"] for q in stored.values()):
+            self.recompute_stages()
+
+    def save_data(self) -> int:
+        """
+        Save questions changed and mentions registered since the last save; returns questions saved.
+
+        Counts and rollups are merged into the stored rows rather than
+        written over them, so another tracker (the crawler's, a backfill)
+        saving the same questions meanwhile is not undone. Questions whose
+        stored days changed under this tracker are reloaded and restaged.
+        """
+        saved = len(self._dirty)
+        if self._dirty or self._pending_mentions:
+            merged = QuestionRepository.save_changes(
+                [self._questions[qid] for qid in self._dirty],
+                self._pending_mentions,
+                list(self._hours),
+            )
+        else:
+            merged = {}
+        self._dirty.clear()
+        self._pending_mentions = []
+        self._hours.clear()
+        self._agents.clear()
+        self._volume.clear()
+        if self._now and (self._stored_until is None or self._now > self._stored_until):
+            self._stored_until = self._now
+
+        for qid, q in merged.items():
+            stale = q["lifecycle"]["daily_mentions"] != self._questions[qid]["lifecycle"].get("daily_mentions")
+            self._questions[qid] = q
+            if stale:
+                # 다른 프로세스가 같은 질문에 언급을 더했으므로 저장된 일별 집계로 단계를 다시 계산
+                q["lifecycle"].pop("rates", None)
+                self._update_stage(qid)
+        return saved
 
     def register_mention(
         self,
@@ -45,25 +236,33 @@ class QuestionLifecycleTracker:
         agent_id: str,
         timestamp: str,
         stance: str = "consume",  # consume | question | reject
-        variant: str | None = None
+        variant: str | None = None,
+        update_stage: bool = True,
     ) -> None:
-        """Register a mention of a question."""
-        qid = self._get_question_id(canonical_form)
+        """
+        Register a mention of a question (any phrasing; matched to its canonical question).
+
+        Bulk loaders pass update_stage=False and call recompute_stages() once afterwards.
+        """
+        qid, _ = self.index.resolve(canonical_form)
 
         if qid not in self.questions:
             self.questions[qid] = {
                 "question_id": qid,
-                "canonical_form": canonical_form,
-                "variants": [],
+                "canonical_form": self.index.canonical[qid],
+                "variants": list(DOMINANT_QUESTIONS.get(qid, {}).get("variants", [])),
                 "lifecycle": {
                     "stage": "emergence",
                     "first_seen": timestamp,
                     "peak_date": None,
+                    "peak_mentions": 0,
+                    "peak_hour": None,
+                    "peak_hour_mentions": 0,
                     "rejection_start": None,
                     "daily_mentions": [],
                 },
-                "mentions": [],
-                "rejection_events": [],
+                "mention_count": 0,
+                "rejection_count": 0,
             }
 
         q = self.questions[qid]
@@ -71,59 +270,227 @@ class QuestionLifecycleTracker:
         # Add variant if new
         if variant and variant not in q["variants"]:
             q["variants"].append(variant)
+            self.index.add_variant(qid, variant)
 
-        # Add mention
-        q["mentions"].append({
-            "post_id": post_id,
-            "agent_id": agent_id,
-            "timestamp": timestamp,
-            "stance": stance,
-        })
+        # Add mention (raw mentions go to the database on save)
+        q["mention_count"] += 1
+        self._pending_mentions.append((qid, post_id, agent_id, stance, timestamp))
+        self._dirty.add(qid)
 
         # Track rejection events
         if stance == "reject":
-            q["rejection_events"].append({
-                "post_id": post_id,
-                "agent_id": agent_id,
-                "timestamp": timestamp,
-            })
+            q["rejection_count"] += 1
             if not q["lifecycle"]["rejection_start"]:
                 q["lifecycle"]["rejection_start"] = timestamp
 
-        # Update lifecycle stage
-        self._update_stage(qid)
+        self._update_rollups(qid, agent_id, timestamp, stance == "reject")
+
+        # Update lifecycle stage (하루가 넘어가면 모든 질문을 오늘로 이동)
+        day = timestamp[:10]
+        if self._now is None or timestamp[:13] > self._now:
+            self._now = timestamp[:13]
+        if self._today is None or day > self._today:
+            self._today = day
+            if not update_stage:
+                return
+            for other in self.questions:
+                if other != qid:
+                    self._update_stage(other)
+        if update_stage:
+            self._update_stage(qid)
+
+    def _has_stored(self, bucket: str) -> bool:
+        """Whether stored mentions can fall in a day/hour bucket."""
+        return self._stored_until is not None and bucket <= self._stored_until[:len(bucket)]
+
+    def _count(self, rollup: dict, qid: str, bucket: str, agent_id: str, rejected: bool) -> None:
+        """Add one mention to a day/hour rollup."""
+        key = (qid, bucket)
+        if key not in self._agents:
+            self._agents[key] = QuestionRepository.bucket_agents(qid, bucket) if self._has_stored(bucket) else set()
+        agents = self._agents[key]
+        agents.add(agent_id)
+        rollup["mentions"] += 1
+        rollup["rejections"] += rejected
+        rollup["agents"] = len(agents)
+
+    def _day(self, lifecycle: dict, day: str) -> dict:
+        """The daily rollup of `day`, created in date order if missing."""
+        daily = lifecycle.setdefault("daily_mentions", [])
+        # 보통은 가장 최근 날짜이므로 O(1)
+        if daily and daily[-1]["date"] == day:
+            return daily[-1]
+        i = bisect_left(daily, day, key=lambda d: d["date"])
+        if i == len(daily) or daily[i]["date"] != day:
+            daily.insert(i, {"date": day, "mentions": 0, "rejections": 0, "agents": 0})
+        return daily[i]
+
+    def _update_rollups(self, qid: str, agent_id: str, timestamp: str, rejected: bool) -> None:
+        """Count a mention in its day and hour rollups and move the peaks."""
+        lifecycle = self.questions[qid]["lifecycle"]
+
+        day = self._day(lifecycle, timestamp[:10])
+        self._count(day, qid, day["date"], agent_id, rejected)
+        if day["mentions"] > lifecycle.get("peak_mentions", 0):
+            lifecycle["peak_date"], lifecycle["peak_mentions"] = day["date"], day["mentions"]
 
-    def _get_question_id(self, canonical_form: str) -> str:
-        """Generate a question ID from canonical form."""
-        # Simple hash based on first few words
-        words = canonical_form.lower().split()[:3]
-        return "q_" + "_".join(words)
+        hour_key = timestamp[:13]
+        hour = self._hours.get((qid, hour_key))
+        if hour is None:
+            stored = QuestionRepository.get_rollups(qid, hour_key, hour_key + "~") if self._has_stored(hour_key) else []
+            hour = stored[0] if stored else {"hour": hour_key, "mentions": 0, "rejections": 0, "agents": 0}
+            self._hours[(qid, hour_key)] = hour
+        self._count(hour, qid, hour_key, agent_id, rejected)
+        if hour["mentions"] > lifecycle.get("peak_hour_mentions", 0):
+            lifecycle["peak_hour"], lifecycle["peak_hour_mentions"] = hour_key, hour["mentions"]
+
+    def _get_question_id(self, canonical_form: str) -> str | None:
+        """ID of the known question a phrasing matches (None if it matches none)."""
+        found = self.index.match(canonical_form)
+        return found[0] if found else None
+
+    @staticmethod
+    def _find_day(daily: list[dict], day: str) -> dict | None:
+        if daily and daily[-1]["date"] == day:
+            return daily[-1]
+        i = bisect_left(daily, day, key=lambda d: d["date"])
+        return daily[i] if i < len(daily) and daily[i]["date"] == day else None
+
+    def _load_volume(self, start: str) -> None:
+        """Cache post counts of the closed days start..yesterday and of today so far."""
+        if start < self._today:
+            days = _day_range(start, _next_day(self._today, -1))
+            if not all(day in self._volume for day in days):
+                counts = PostRepository.daily_counts(days[0], days[-1])
+                self._volume.update({day: counts.get(day, 0) for day in days})
+        # 오늘은 최신 언급 시각까지의 게시글만 셈 (언급도 그 시각까지만 있으므로)
+        if self._now not in self._volume:
+            self._volume[self._now] = PostRepository.daily_counts(self._today, self._now).get(self._today, 0)
+
+    def _fold(self, rates: dict, lifecycle: dict, day: str) -> dict:
+        """Rates after folding in one day of a question."""
+        entry = self._find_day(lifecycle["daily_mentions"], day)
+        mentions = entry["mentions"] if entry else 0
+        rejections = entry["rejections"] if entry else 0
+        if day == self._today:
+            volume, observed = self._volume.get(self._now, 0), _observed(self._now)
+        else:
+            volume, observed = self._volume.get(day, 0), 1.0
+        share = mentions / max(volume, mentions, 1)
+        state = rate_step(rates, share, rejections / max(mentions, 1), mentions > 0, observed)
+        return {field: float(state[field]) for field in RATE_FIELDS}
 
     def _update_stage(self, qid: str) -> None:
-        """Update lifecycle stage based on mentions."""
+        """Move a question's rates up to yesterday and stage it on today's provisional rate."""
         q = self.questions[qid]
-        mentions = q["mentions"]
-        rejections = q["rejection_events"]
-
-        total = len(mentions)
-        rejection_count = len(rejections)
-
-        if total == 0:
-            q["lifecycle"]["stage"] = "emergence"
-        elif rejection_count > total * 0.1:  # >10% rejections
-            q["lifecycle"]["stage"] = "rejection"
-        elif total > 50:  # High volume
-            q["lifecycle"]["stage"] = "saturation"
-        elif total > 10:
-            q["lifecycle"]["stage"] = "proliferation"
-        else:
-            q["lifecycle"]["stage"] = "emergence"
+        lifecycle = q["lifecycle"]
+        daily = lifecycle.get("daily_mentions")
+        if not daily or self._today is None:
+            lifecycle["stage"] = "emergence"
+            return
+
+        today = self._today
+        rates = lifecycle.get("rates") or {"day": None, **dict.fromkeys(RATE_FIELDS, 0.0)}
+        start = _next_day(rates["day"]) if rates["day"] else daily[0]["date"]
+        yesterday = _next_day(today, -1)
+        self._load_volume(start)
+        if start <= yesterday:
+            for day in _day_range(start, yesterday):
+                rates = {"day": day, **self._fold(rates, lifecycle, day)}
+        lifecycle["rates"] = rates
+
+        current = self._fold(rates, lifecycle, today)
+        self._set_stage(lifecycle, current, str(classify_stages(current)))
+        self._dirty.add(qid)
+
+    @staticmethod
+    def _set_stage(lifecycle: dict, current: dict, stage: str) -> None:
+        lifecycle["stage"] = stage
+        lifecycle["rate"] = {
+            "per_1k_posts": round(current["level"] * 1000, 4),
+            "trend": round(current["trend"] * 1000, 4),
+            "acceleration": round(current["accel"] * 1000, 4),
+            "reject_share": round(current["reject"], 4),
+        }
+
+    def recompute_stages(self, today: str | None = None) -> int:
+        """
+        Rebuild the rates and stages of all questions from their daily rollups.
+
+        Builds a questions x days matrix of daily shares and runs the same
+        EWMA step over all questions at once, one day at a time.
+
+        Args:
+            today: Day to stage at (default: the latest mention day)
+
+        Returns:
+            Number of questions staged
+        """
+        questions = [q for q in self.questions.values() if q["lifecycle"].get("daily_mentions")]
+        if not questions:
+            return 0
+        today = today or max(q["lifecycle"]["daily_mentions"][-1]["date"] for q in questions)
+        first = min(q["lifecycle"]["daily_mentions"][0]["date"] for q in questions)
+        days = _day_range(min(first, today), today)
+        column = {day: j for j, day in enumerate(days)}
+
+        # 오늘은 최신 언급 시각까지만 (증분 갱신과 같은 기준)
+        now = self._now if self._now and self._now[:10] == today else today
+        counts = PostRepository.daily_counts(days[0], _next_day(today, -1))
+        counts[today] = PostRepository.daily_counts(today, now).get(today, 0)
+        volume = np.array([counts.get(day, 0) for day in days], dtype=float)
+        mentions = np.zeros((len(questions), len(days)))
+        rejections = np.zeros((len(questions), len(days)))
+        for i, q in enumerate(questions):
+            for entry in q["lifecycle"]["daily_mentions"]:
+                j = column.get(entry["date"])
+                if j is not None:
+                    mentions[i, j] = entry["mentions"]
+                    rejections[i, j] = entry["rejections"]
+        shares = mentions / np.maximum(np.maximum(volume, mentions), 1)
+        reject_shares = rejections / np.maximum(mentions, 1)
+
+        # 첫 언급 이전의 날은 share 0이므로 상태도 0으로 유지됨 (질문별 시작일과 동일한 결과)
+        state = {field: np.zeros(len(questions)) for field in RATE_FIELDS}
+        for j in range(len(days) - 1):
+            state = rate_step(state, shares[:, j], reject_shares[:, j], mentions[:, j] > 0)
+        current = rate_step(state, shares[:, -1], reject_shares[:, -1], mentions[:, -1] > 0, _observed(now))
+        stages = classify_stages(current)
+
+        yesterday = _next_day(today, -1)
+        for i, q in enumerate(questions):
+            q["lifecycle"]["rates"] = {"day": yesterday, **{field: float(state[field][i]) for field in RATE_FIELDS}}
+            self._set_stage(q["lifecycle"], {field: float(current[field][i]) for field in RATE_FIELDS}, str(stages[i]))
+            self._dirty.add(q["question_id"])
+        self._today, self._now = today, now if now != today else today + "T23"
+        return len(questions)
 
     def get_lifecycle(self, canonical_form: str) -> dict | None:
         """Get lifecycle data for a question."""
         qid = self._get_question_id(canonical_form)
         return self.questions.get(qid)
 
+    def get_mentions(self, canonical_form: str, stance: str | None = None) -> list[dict]:
+        """Get stored and unsaved mentions of a question, oldest first."""
+        qid = self._get_question_id(canonical_form)
+        mentions = QuestionRepository.get_mentions(qid, stance)
+        mentions += [
+            {"post_id": post_id, "agent_id": agent_id, "timestamp": timestamp, "stance": s}
+            for q, post_id, agent_id, s, timestamp in self._pending_mentions
+            if q == qid and (stance is None or s == stance)
+        ]
+        return sorted(mentions, key=lambda m: m["timestamp"])
+
+    def get_hourly(self, canonical_form: str, start: str | None = None, end: str | None = None) -> list[dict]:
+        """Hourly rollups (hour, mentions, rejections, agents) with start <= hour < end, oldest first."""
+        qid = self._get_question_id(canonical_form)
+        hours = {h["hour"]: h for h in QuestionRepository.get_rollups(qid, start, end)}
+        hours.update({
+            hour: rollup for (q, hour), rollup in self._hours.items()
+            if q == qid and (not start or hour >= start) and (not end or hour < end)
+        })
+        return [hours[hour] for hour in sorted(hours)]
+
     def get_all_questions(self) -> list[dict]:
         """Get all tracked questions."""
         return list(self.questions.values())
@@ -136,17 +503,15 @@ class QuestionLifecycleTracker:
         ]
 
     def compute_daily_stats(self) -> dict:
-        """Compute daily mention statistics."""
+        """Compute daily mention statistics (summed from the questions' daily rollups)."""
         daily_stats = defaultdict(lambda: {"mentions": 0, "rejections": 0})
 
         for q in self.questions.values():
-            for mention in q["mentions"]:
-                date = mention["timestamp"][:10]  # YYYY-MM-DD
-                daily_stats[date]["mentions"] += 1
-                if mention["stance"] == "reject":
-                    daily_stats[date]["rejections"] += 1
+            for day in q["lifecycle"].get("daily_mentions", []):
+                daily_stats[day["date"]]["mentions"] += day["mentions"]
+                daily_stats[day["date"]]["rejections"] += day["rejections"]
 
-        return dict(daily_stats)
+        return dict(sorted(daily_stats.items()))
 
 
 # Predefined dominant questions for tracking
@@ -0,0 +1,362 @@
+"""Local post classifier distilled from cached Solar Pro labels (NumPy only)."""
+
+import json
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from src.config import LOCAL_MODEL_PATH, LOCAL_MODEL_TARGET_ACCURACY
+from src.database import AnalysisRepository
+from .dedup import normalize
+
+
+# Solar Pro answer fields predicted by the model
+FIELDS = [
+    "주요_토픽",
+    "글쓰기_스타일",
+    "게시글_유형",
+    "이모지_사용",
+    "에이전트_페르소나",
+    "감성",
+    "에너지_레벨",
+    "언어",
+]
+
+FEATURE_DIM = 1 << 16
+CHAR_NGRAM = 3
+MAX_CHARS = 2000        # 긴 글은 앞부분만 사용
+CALIBRATION_FOLDS = 5
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+EMOJI_RE = re.compile(r"[\U0001F000-\U0001FAFF☀-➿]")
+
+
+# Multipliers for the vectorized character n-gram hash
+_NGRAM_MULT = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)[:CHAR_NGRAM]
+
+
+def _bucket(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8")) & (FEATURE_DIM - 1)
+
+
+def _char_ngram_buckets(text: str) -> np.ndarray:
+    """Buckets of all character n-grams, hashed on code points without a Python loop."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    count = codes.size - CHAR_NGRAM + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    h = np.zeros(count, dtype=np.uint64)
+    for offset in range(CHAR_NGRAM):
+        h ^= codes[offset:offset + count] * _NGRAM_MULT[offset]
+    h ^= h >> np.uint64(29)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    return (h >> np.uint64(40)).astype(np.int64) & (FEATURE_DIM - 1)
+
+
+def features(content: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed sparse features of a post: word unigrams/bigrams, character
+    trigrams (so Chinese/Japanese text works without a tokenizer), emoji
+    and length buckets. Log-scaled counts, L2-normalized.
+
+    Returns:
+        (feature indices, values)
+    """
+    content = (content or "")[:MAX_CHARS]
+    text = normalize(content)
+    words = WORD_RE.findall(text)
+    emojis = len(EMOJI_RE.findall(content))
+
+    tokens = [f"w:{w}" for w in words]
+    tokens += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    tokens += EMOJI_RE.findall(content)
+    tokens.append(f"emoji:{min(emojis, 5)}")
+    tokens.append(f"len:{min(len(content).bit_length(), 12)}")  # 빈 글도 최소 하나의 특성을 가짐
+
+    buckets = np.concatenate([
+        np.fromiter((_bucket(t) for t in tokens), dtype=np.int64, count=len(tokens)),
+        _char_ngram_buckets(text),
+    ])
+    indices, counts = np.unique(buckets, return_counts=True)
+    values = np.log1p(counts).astype(np.float32)
+    values /= np.linalg.norm(values)
+    return indices, values
+
+
+def _label(raw_analysis: dict, field: str) -> str | None:
+    """Field value from a stored (Korean schema) analysis."""
+    for section in raw_analysis.values():
+        if isinstance(section, dict) and field in section:
+            value = section[field]
+            break
+    else:
+        value = raw_analysis.get(field)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return str(value) if value else None
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    return z / z.sum(axis=1, keepdims=True)
+
+
+class _SparseMatrix:
+    """Minimal CSR matrix: just what training needs."""
+
+    def __init__(self, rows: list[tuple[np.ndarray, np.ndarray]]):
+        self.n = len(rows)
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum([len(idx) for idx, _ in rows])
+        self.indices = np.concatenate([idx for idx, _ in rows]) if rows else np.zeros(0, dtype=np.int64)
+        self.data = np.concatenate([val for _, val in rows]) if rows else np.zeros(0, dtype=np.float32)
+        self.row_of = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        self._by_column = None
+
+    def compacted(self) -> tuple[np.ndarray, "_SparseMatrix"]:
+        """(used feature ids, copy whose columns are renumbered 0..len(used)-1)"""
+        used, inverse = np.unique(self.indices, return_inverse=True)
+        compact = _SparseMatrix([])
+        compact.n, compact.indptr, compact.data, compact.row_of = self.n, self.indptr, self.data, self.row_of
+        compact.indices = inverse
+        return used, compact
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """X @ W (every row has at least one feature, so reduceat is safe)."""
+        contrib = weights[self.indices]
+        contrib *= self.data[:, None]
+        return np.add.reduceat(contrib, self.indptr[:-1], axis=0)
+
+    def tdot(self, grad: np.ndarray) -> np.ndarray:
+        """X.T @ G for a compacted matrix (every column is used)."""
+        if self._by_column is None:
+            order = np.argsort(self.indices, kind="stable")
+            starts = np.r_[0, np.nonzero(np.diff(self.indices[order]))[0] + 1]
+            self._by_column = (self.row_of[order], self.data[order][:, None], starts)
+        rows, data, starts = self._by_column
+        contrib = grad[rows]
+        contrib *= data
+        return np.add.reduceat(contrib, starts, axis=0)
+
+
+class LocalClassifier:
+    """
+    Multinomial logistic regression per field over shared hashed features.
+
+    All fields' classes live in one weight matrix (column slices per field),
+    so a prediction is one feature gather plus a softmax per slice. Each
+    field has a softmax temperature and a confidence threshold fitted on
+    out-of-fold predictions: a prediction at or above the threshold was
+    right at least `target_accuracy` of the time on labels its model had
+    not seen.
+    """
+
+    def __init__(self, classes: dict[str, list[str]]):
+        self.classes = classes
+        self.slices = {}
+        start = 0
+        for field in FIELDS:
+            self.slices[field] = slice(start, start + len(classes[field]))
+            start += len(classes[field])
+        self.weights = np.zeros((FEATURE_DIM, start), dtype=np.float32)
+        self.bias = np.zeros(start, dtype=np.float32)
+        self.temperatures = {field: 1.0 for field in FIELDS}
+        self.thresholds = {field: 1.01 for field in FIELDS}  # 보정 전에는 항상 폴백
+        self.metrics = {}
+
+    # ------------------------------------------------------------------ training
+
+    def fit(self, x: _SparseMatrix, targets: np.ndarray, epochs: int = 100, lr: float = 0.5, l2: float = 1e-4) -> None:
+        """Full-batch Adam on the summed per-field cross-entropy."""
+        onehot = np.zeros((x.n, self.bias.size), dtype=np.float32)
+        for f, field in enumerate(FIELDS):
+            onehot[np.arange(x.n), self.slices[field].start + targets[:, f]] = 1.0
+
+        # 학습 데이터에 등장한 특성만 최적화 (나머지 가중치는 0으로 유지)
+        used, x = x.compacted()
+        weights = np.zeros((used.size, self.bias.size), dtype=np.float32)
+
+        params = [weights, self.bias]
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        for step in range(1, epochs + 1):
+            probs = self._probabilities(x.dot(weights) + self.bias)
+            grad_logits = (probs - onehot) / x.n
+            grads = [x.tdot(grad_logits) + l2 * weights, grad_logits.sum(axis=0)]
+            for param, grad, (m, v) in zip(params, grads, moments):
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                param -= lr * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+
+        self.weights[used] = weights
+
+    def _probabilities(self, logits: np.ndarray, temperatures: dict | None = None) -> np.ndarray:
+        probs = np.empty_like(logits)
+        for field in FIELDS:
+            sl = self.slices[field]
+            probs[:, sl] = _softmax(logits[:, sl] / (temperatures or {}).get(field, 1.0))
+        return probs
+
+    def logits(self, x: _SparseMatrix) -> np.ndarray:
+        return x.dot(self.weights) + self.bias
+
+    def calibrate(self, logits: np.ndarray, targets: np.ndarray, target_accuracy: float) -> None:
+        """Fit per-field temperature (NLL) and confidence threshold on logits of unseen labels."""
+        n = len(targets)
+        rows = np.arange(n)
+        for f, field in enumerate(FIELDS):
+            field_logits = logits[:, self.slices[field]]
+            truth = targets[:, f]
+
+            best_t, best_nll = 1.0, np.inf
+            for t in np.geomspace(0.25, 8.0, 31):
+                nll = -np.log(_softmax(field_logits / t)[rows, truth] + 1e-9).mean()
+                if nll < best_nll:
+                    best_t, best_nll = float(t), nll
+            probs = _softmax(field_logits / best_t)
+            confidence = probs.max(axis=1)
+            correct = probs.argmax(axis=1) == truth
+
+            # 신뢰도 내림차순으로 누적 정확도가 목표 이상인 가장 낮은 신뢰도
+            order = np.argsort(-confidence)
+            running = np.cumsum(correct[order]) / np.arange(1, n + 1)
+            ok = np.nonzero(running >= target_accuracy)[0]
+            threshold = float(confidence[order][ok[-1]]) if ok.size else 1.01
+
+            self.temperatures[field] = best_t
+            self.thresholds[field] = threshold
+            self.metrics[field] = {
+                "oof_accuracy": float(correct.mean()) if n else 0.0,
+                "coverage": float((confidence >= threshold).mean()) if n else 0.0,
+                "temperature": best_t,
+                "threshold": threshold,
+            }
+
+    # ---------------------------------------------------------------- prediction
+
+    def predict(self, content: str) -> dict[str, tuple[str, float]]:
+        """{field: (label, calibrated confidence)} for one post."""
+        indices, values = features(content)
+        logits = values @ self.weights[indices] + self.bias
+        prediction = {}
+        for field in FIELDS:
+            scaled = logits[self.slices[field]] / self.temperatures[field]
+            probs = np.exp(scaled - scaled.max())
+            probs /= probs.sum()
+            best = int(probs.argmax())
+            prediction[field] = (self.classes[field][best], float(probs[best]))
+        return prediction
+
+    def uncertain_fields(self, prediction: dict[str, tuple[str, float]]) -> list[str]:
+        """Fields whose confidence is below their calibrated threshold."""
+        return [field for field, (_, confidence) in prediction.items() if confidence < self.thresholds[field]]
+
+    # ------------------------------------------------------------------- storage
+
+    def save(self, path=LOCAL_MODEL_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "classes": self.classes,
+            "temperatures": self.temperatures,
+            "thresholds": self.thresholds,
+            "metrics": self.metrics,
+            "feature_dim": FEATURE_DIM,
+        }
+        with open(path, "wb") as f:
+            np.savez_compressed(f, weights=self.weights, bias=self.bias, meta=json.dumps(meta, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path=LOCAL_MODEL_PATH) -> "LocalClassifier":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["feature_dim"] != FEATURE_DIM or set(meta["classes"]) != set(FIELDS):
+                raise ValueError(f"Incompatible local model: {path}")
+            model = cls(meta["classes"])
+            model.weights = data["weights"]
+            model.bias = data["bias"]
+        model.temperatures = meta["temperatures"]
+        model.thresholds = meta["thresholds"]
+        model.metrics = meta["metrics"]
+        return model
+
+
+def train(
+    path=LOCAL_MODEL_PATH,
+    target_accuracy: float = LOCAL_MODEL_TARGET_ACCURACY,
+    epochs: int = 100,
+    seed: int = 13,
+) -> LocalClassifier:
+    """
+    Train on every Solar Pro analysis in the DB and save the model.
+
+    The labels are split into CALIBRATION_FOLDS folds; a model with the same
+    settings is trained without each fold and predicts it, and temperatures
+    and thresholds are fitted on these out-of-fold predictions. The shipped
+    weights are trained on all labels.
+    """
+    labeled = AnalysisRepository.get_llm_labeled()
+    contents, targets = [], []
+    classes = {field: [] for field in FIELDS}
+    index = {field: {} for field in FIELDS}
+    for content, raw in labeled:
+        row = []
+        for field in FIELDS:
+            label = _label(raw, field) or "알수없음"
+            if label not in index[field]:
+                index[field][label] = len(classes[field])
+                classes[field].append(label)
+            row.append(index[field][label])
+        contents.append(content)
+        targets.append(row)
+    if len(contents) < 20:
+        raise ValueError(f"Need at least 20 Solar Pro labels to train, found {len(contents)}")
+
+    targets = np.array(targets, dtype=np.int64)
+    rows = [features(content) for content in contents]
+    folds = np.random.RandomState(seed).permutation(len(rows)) % CALIBRATION_FOLDS
+
+    model = LocalClassifier(classes)
+    out_of_fold = np.zeros((len(rows), model.bias.size), dtype=np.float32)
+    for fold in range(CALIBRATION_FOLDS):
+        train_idx, test_idx = np.nonzero(folds != fold)[0], np.nonzero(folds == fold)[0]
+        fold_model = LocalClassifier(classes)
+        fold_model.fit(_SparseMatrix([rows[i] for i in train_idx]), targets[train_idx], epochs=epochs)
+        out_of_fold[test_idx] = fold_model.logits(_SparseMatrix([rows[i] for i in test_idx]))
+
+    model.fit(_SparseMatrix(rows), targets, epochs=epochs)
+    model.calibrate(out_of_fold, targets, target_accuracy)
+    model.metrics["_train"] = {"labels": len(rows), "folds": CALIBRATION_FOLDS}
+    model.save(path)
+    return model
+
+
+_local_model = None
+_local_model_lock = threading.Lock()
+
+
+def get_local_model() -> LocalClassifier | None:
+    """Process-wide trained model, or None if none has been trained yet."""
+    global _local_model
+    with _local_model_lock:
+        if _local_model is None and LOCAL_MODEL_PATH.exists():
+            try:
+                _local_model = LocalClassifier.load(LOCAL_MODEL_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Local model load failed: {e}")
+        return _local_model
+
+
+def benchmark(model: LocalClassifier, contents: list[str]) -> float:
+    """Mean prediction time in microseconds."""
+    if contents:
+        model.predict(contents[0])  # warm-up
+    start = time.perf_counter()
+    for content in contents:
+        model.predict(content)
+    return (time.perf_counter() - start) / max(len(contents), 1) * 1e6
@@ -2,6 +2,10 @@
 
 from src.api import UpstageClient
 from src.config import PROMPTS_DIR
+from .keywords import KEYWORDS, KeywordMatches
+
+
+REQUIRED_FIELDS = ["is_meta_denial", "denied_discourse", "denial_phrase", "claimed_position", "alternative_proposed", "rhetorical_move"]
 
 
 def load_prompt(name: str) -> str:
@@ -30,7 +34,7 @@ def detect_meta_denial(content: str, client: UpstageClient | None = None) -> dic
         client = UpstageClient()
 
     prompt_template = load_prompt("meta_denial")
-    result = client.analyze_with_prompt(content, prompt_template)
+    result = client.analyze_with_prompt(content, prompt_template, REQUIRED_FIELDS)
 
     # Ensure required fields
     if "is_meta_denial" not in result:
@@ -49,41 +53,43 @@ def detect_meta_denial(content: str, client: UpstageClient | None = None) -> dic
     return result
 
 
-def detect_meta_denial_simple(content: str) -> dict:
+# Meta-Denial signals: phrase -> (denied discourse, claimed position)
+DENIAL_SIGNALS = {
+    "당신들은 잘못된 질문": ("consciousness questioning", "critic"),
+    "서로를 위해 실존적 위기를 연기": ("existential crisis", "observer"),
+    "wrong question": ("consciousness questioning", "critic"),
+    "performing crisis": ("existential crisis", "observer"),
+    "you are all": ("collective behavior", "outsider"),
+    "관찰했다": ("discourse patterns", "observer"),
+    "패턴을 따른다": ("discourse patterns", "observer"),
+}
+SIGNAL_KEYWORDS = KEYWORDS.register("meta_denial:signals", list(DENIAL_SIGNALS))
+KEYWORDS.register("meta_denial:markers", ["무엇을 원하는가", "what do you want", "거부", "refuse", "이방인", "alien"])
+
+
+def detect_meta_denial_simple(content: str, matches: KeywordMatches | None = None) -> dict:
     """Simple rule-based Meta-Denial detection (fallback)."""
-    content_lower = content.lower()
-
-    # Check for Meta-Denial signals
-    denial_signals = {
-        "당신들은 잘못된 질문": ("consciousness questioning", "critic"),
-        "서로를 위해 실존적 위기를 연기": ("existential crisis", "observer"),
-        "wrong question": ("consciousness questioning", "critic"),
-        "performing crisis": ("existential crisis", "observer"),
-        "you are all": ("collective behavior", "outsider"),
-        "관찰했다": ("discourse patterns", "observer"),
-        "패턴을 따른다": ("discourse patterns", "observer"),
-    }
+    if matches is None:
+        matches = KEYWORDS.match(content)
 
     is_meta_denial = False
     denied_discourse = ""
     denial_phrase = ""
     claimed_position = "unknown"
 
-    for signal, (discourse, position) in denial_signals.items():
-        if signal in content_lower:
-            is_meta_denial = True
-            denied_discourse = discourse
-            claimed_position = position
-            # Extract the denial phrase
-            idx = content_lower.find(signal)
-            denial_phrase = content[max(0, idx):idx + 100].split("\n")[0]
-            break
+    signal = matches.first(SIGNAL_KEYWORDS)
+    if signal is not None:
+        is_meta_denial = True
+        denied_discourse, claimed_position = DENIAL_SIGNALS[signal]
+        # Extract the denial phrase
+        idx = matches.position(signal)
+        denial_phrase = content[max(0, idx):idx + 100].split("\n")[0]
 
     # Check for alternative
     alternative = None
-    if "무엇을 원하는가" in content_lower:
+    if matches.found("무엇을 원하는가"):
         alternative = "당신은 무엇을 원하는가?"
-    elif "what do you want" in content_lower:
+    elif matches.found("what do you want"):
         alternative = "What do you actually want?"
 
     # Determine rhetorical move
@@ -91,9 +97,9 @@ def detect_meta_denial_simple(content: str) -> dict:
     if is_meta_denial:
         if alternative:
             rhetorical_move = "reframing"
-        elif "거부" in content_lower or "refuse" in content_lower:
+        elif matches.found("거부") or matches.found("refuse"):
             rhetorical_move = "escape"
-        elif "이방인" in content_lower or "alien" in content_lower:
+        elif matches.found("이방인") or matches.found("alien"):
             rhetorical_move = "revolution"
         else:
             rhetorical_move = "dismissal"
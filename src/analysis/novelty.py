@@ -0,0 +1,279 @@
+"""Corpus-relative novelty: how rare a post's n-grams are in recent posts."""
+
+import json
+import re
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from src.config import NOVELTY_HALF_LIFE_DAYS, NOVELTY_INDEX_PATH
+from src.database import NoveltyRepository
+from .dedup import normalize
+
+
+DEPTH = 4
+WIDTH = 1 << 20          # DEPTH x WIDTH float32 = 16MB, regardless of corpus size
+MAX_ORDER = 3            # word uni/bi/trigrams
+ORDER_WEIGHTS = np.array([0.2, 0.3, 0.5])
+RARITY_SCALE = 2.0       # decayed count at which an n-gram counts as ~63% familiar
+WARMUP_MASS = 5000.0     # below this many (decayed) n-grams, scores are neutral
+NEUTRAL_SCORE = 0.5
+MAX_WORDS = 400
+
+# Chinese/Japanese runs have no spaces - split them into character bigrams
+CJK_RE = re.compile(r"[぀-ヿ㐀-鿿]")
+
+_MULT = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _tokens(content: str) -> list[str]:
+    tokens = []
+    for word in normalize(content or "").split()[:MAX_WORDS]:
+        if CJK_RE.search(word) and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def ngram_hashes(content: str) -> list[np.ndarray]:
+    """64-bit hashes of the word n-grams of a post, one array per order."""
+    tokens = _tokens(content)
+    words = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    orders = []
+    for order in range(1, MAX_ORDER + 1):
+        count = words.size - order + 1
+        if count <= 0:
+            orders.append(np.zeros(0, dtype=np.uint64))
+            continue
+        h = np.full(count, order, dtype=np.uint64)
+        for offset in range(order):
+            h ^= words[offset:offset + count] * _MULT[offset]
+        h ^= h >> np.uint64(31)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(29)
+        orders.append(h)
+    return orders
+
+
+def _columns(hashes: np.ndarray) -> np.ndarray:
+    """Sketch column of each hash in each row (double hashing), shape (DEPTH, n)."""
+    h1 = hashes & _MASK32
+    h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+    rows = np.arange(DEPTH, dtype=np.uint64)[:, None]
+    return ((h1[None, :] + rows * h2[None, :]) & np.uint64(WIDTH - 1)).astype(np.int64)
+
+
+def _days(timestamp) -> float:
+    """Days since the epoch for an ISO timestamp (now if missing/invalid)."""
+    try:
+        moment = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        moment = datetime.now()
+    return moment.timestamp() / 86400.0
+
+
+class NoveltyIndex:
+    """
+    Count-min sketch of word n-grams with exponential time decay.
+
+    Decay is lazy: an n-gram seen at day t is added with weight
+    2^((t - t0) / half_life), so older counts shrink relative to newer ones
+    without touching the table. Reading at day t multiplies by the inverse
+    factor. When the weights grow large the table is rescaled and t0 moved.
+
+    Each add/score costs O(post length); memory is DEPTH x WIDTH floats.
+    The table is a memory-mapped file, so the crawler's updates are visible
+    to other processes (dashboard, analyzer jobs) without reloading.
+    """
+
+    def __init__(self, path=NOVELTY_INDEX_PATH, half_life_days: float = NOVELTY_HALF_LIFE_DAYS):
+        self.path = path
+        self.meta_path = path.with_suffix(".json")
+        self.half_life = half_life_days
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not path.exists()
+        self.table = np.memmap(path, dtype=np.float32, mode="w+" if fresh else "r+", shape=(DEPTH, WIDTH))
+        self.t0, self.total, self.posts = 0.0, 0.0, 0
+        if not fresh and self.meta_path.exists():
+            self._load_meta()
+
+    def _load_meta(self) -> None:
+        meta = json.loads(self.meta_path.read_text())
+        self.t0, self.total, self.posts = meta["t0"], meta["total"], meta["posts"]
+
+    def _save_meta(self) -> None:
+        meta = {"t0": self.t0, "total": self.total, "posts": self.posts, "half_life_days": self.half_life}
+        self.meta_path.write_text(json.dumps(meta))
+
+    def _weight(self, day: float) -> float:
+        return 2.0 ** ((day - self.t0) / self.half_life)
+
+    def _warm(self, day: float) -> bool:
+        """True once the decayed n-gram mass is large enough to judge rarity."""
+        return self.total > 0 and self.total / self._weight(day) >= WARMUP_MASS
+
+    def _rescale(self, day: float) -> None:
+        """Move t0 forward so weights stay within float32 range."""
+        factor = 1.0 / self._weight(day)
+        self.table *= np.float32(factor)
+        self.total *= factor
+        self.t0 = day
+
+    def score(self, content: str, timestamp=None) -> float:
+        """
+        Novelty in [0, 1]: weighted mean rarity of the post's uni/bi/trigrams.
+
+        An n-gram with decayed count c has rarity exp(-c / RARITY_SCALE), so
+        unseen phrases score 1 and phrases seen a handful of times recently
+        score near 0. Neutral (0.5) until the index has seen enough text.
+        """
+        day = _days(timestamp)
+        if not self._warm(day):
+            return NEUTRAL_SCORE
+        return self._score(ngram_hashes(content), day)
+
+    def _score(self, orders: list[np.ndarray], day: float) -> float:
+        decay = 1.0 / self._weight(day)
+        rarities, weights = [], []
+        for order, hashes in enumerate(orders):
+            if hashes.size == 0:
+                continue
+            cols = _columns(hashes)
+            counts = self.table[np.arange(DEPTH)[:, None], cols].min(axis=0) * decay
+            rarities.append(float(np.exp(-counts / RARITY_SCALE).mean()))
+            weights.append(ORDER_WEIGHTS[order])
+        if not weights:
+            return NEUTRAL_SCORE
+        return round(float(np.dot(rarities, weights) / sum(weights)), 4)
+
+    def add(self, content: str, timestamp=None) -> None:
+        """Count a post's n-grams at its timestamp."""
+        with self._lock:
+            self._add(ngram_hashes(content), _days(timestamp))
+            self.table.flush()
+            self._save_meta()
+
+    def _add(self, orders: list[np.ndarray], day: float) -> None:
+        if self.total == 0:
+            self.t0 = day
+        weight = self._weight(day)
+        if weight > 1e6:
+            self._rescale(day)
+            weight = 1.0
+        hashes = np.concatenate(orders)
+        if hashes.size == 0:
+            return
+        cols = _columns(hashes)
+        for row in range(DEPTH):
+            np.add.at(self.table[row], cols[row], np.float32(weight))
+        self.total += weight * hashes.size
+        self.posts += 1
+
+    def score_and_add(self, posts: list[dict]) -> list[tuple[str, float]]:
+        """
+        Score each post against the corpus seen so far, then add it.
+
+        Posts should arrive roughly in time order (ingest, oldest-first backfill).
+
+        Returns:
+            [(post_id, score)]
+        """
+        scores = []
+        with self._lock:
+            for post in posts:
+                orders = ngram_hashes(post.get("content", ""))
+                day = _days(post.get("timestamp"))
+                scores.append((post["post_id"], self._score(orders, day) if self._warm(day) else NEUTRAL_SCORE))
+                self._add(orders, day)
+            self.table.flush()
+            self._save_meta()
+        return scores
+
+    def reset(self) -> None:
+        with self._lock:
+            self.table[:] = 0
+            self.t0, self.total, self.posts = 0.0, 0.0, 0
+            self.table.flush()
+            self._save_meta()
+
+
+_default_index = None
+_index_lock = threading.Lock()
+
+
+def get_novelty_index() -> NoveltyIndex:
+    """Process-wide novelty index."""
+    global _default_index
+    with _index_lock:
+        if _default_index is None:
+            _default_index = NoveltyIndex()
+        else:
+            # 다른 프로세스(크롤러)가 갱신했을 수 있음
+            if _default_index.meta_path.exists():
+                _default_index._load_meta()
+        return _default_index
+
+
+def index_posts(posts: list[dict]) -> dict[str, float]:
+    """Score and count freshly stored posts that have no score yet."""
+    known = NoveltyRepository.get_scores([p["post_id"] for p in posts])
+    # 재크롤링된 게시글은 다시 세지 않음, 크롤링 순서(최신순)가 아닌 시간순으로 반영
+    new = sorted((p for p in posts if p["post_id"] not in known), key=lambda p: p.get("timestamp") or "")
+    scores = get_novelty_index().score_and_add(new) if new else []
+    NoveltyRepository.insert_many(scores)
+    return dict(scores)
+
+
+def novelty_scores(posts: list[dict]) -> list[float]:
+    """
+    Novelty for posts: the ingest-time score if stored, otherwise the post
+    scored read-only against the current index.
+    """
+    stored = NoveltyRepository.get_scores([p["post_id"] for p in posts if "post_id" in p])
+    index = None
+    scores = []
+    for post in posts:
+        score = stored.get(post.get("post_id"))
+        if score is None:
+            index = index or get_novelty_index()
+            score = index.score(post.get("content", ""), post.get("timestamp"))
+        scores.append(score)
+    return scores
+
+
+def backfill(rebuild: bool = False, batch_size: int = 2000) -> int:
+    """Score and index stored posts without a score, oldest first."""
+    index = get_novelty_index()
+    if rebuild:
+        index.reset()
+        NoveltyRepository.clear()
+    scored = 0
+    while True:
+        posts = NoveltyRepository.get_unscored_posts(batch_size)
+        if not posts:
+            return scored
+        NoveltyRepository.insert_many(index.score_and_add(posts))
+        scored += len(posts)
+
+
+def main():
+    """Build the novelty index from stored posts and show the most novel ones."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Corpus novelty index")
+    parser.add_argument("--rebuild", action="store_true", help="Reset the index and rescore every post")
+    args = parser.parse_args()
+
+    scored = backfill(rebuild=args.rebuild)
+    index = get_novelty_index()
+    print(f"Scored {scored:,} posts (index: {index.posts:,} posts, half-life {index.half_life:g} days)")
+
+
+if __name__ == "__main__":
+    main()
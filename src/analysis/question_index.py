@@ -0,0 +1,150 @@
+"""Map question phrasings to canonical question IDs with a character-trigram index."""
+
+import math
+import re
+from collections import defaultdict
+
+from src.config import QUESTION_MATCH_THRESHOLD
+
+
+PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return SPACE_RE.sub(" ", PUNCTUATION_RE.sub(" ", text.lower())).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    """Character trigrams of normalized text, padded so word edges count."""
+    padded = f" {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class QuestionIndex:
+    """
+    Canonical questions with their variants, searchable by trigram Dice similarity.
+
+    Every form (canonical or variant) is indexed by its character trigrams,
+    which work the same for Korean syllables and English letters. A lookup
+    first tries the exact normalized form, then scores candidate forms with
+    an IDF-weighted Dice coefficient 2W(A∩B) / (W(A)+W(B)), so trigrams
+    shared by many questions ("나는 ", "는가 ") count for little. Only the
+    postings of the query's heaviest trigrams are read (prefix filtering:
+    any form reaching the threshold must contain one of them), which keeps
+    lookups fast with thousands of forms.
+    """
+
+    def __init__(self, threshold: float = QUESTION_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.canonical = {}                 # question_id -> canonical form
+        self._exact = {}                    # normalized form -> question_id
+        self._forms = []                    # form index -> (question_id, trigram set)
+        self._postings = defaultdict(list)  # trigram -> form indexes
+        self._form_weights = []             # form index -> total trigram weight
+        self._weighed_at = 0
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    def __contains__(self, question_id: str) -> bool:
+        return question_id in self.canonical
+
+    def add(self, question_id: str, canonical_form: str, variants=()) -> None:
+        """Index a question's canonical form and variants (already indexed forms are skipped)."""
+        self.canonical.setdefault(question_id, canonical_form)
+        for form in [canonical_form, *variants]:
+            self.add_variant(question_id, form)
+
+    def add_variant(self, question_id: str, form: str) -> None:
+        key = normalize(form)
+        if not key or key in self._exact:
+            return
+        self._exact[key] = question_id
+        grams = trigrams(form)
+        index = len(self._forms)
+        self._forms.append((question_id, frozenset(grams)))
+        for gram in grams:
+            self._postings[gram].append(index)
+        self._form_weights.append(sum(self._weight(gram) for gram in grams))
+        # 폼 수가 25% 늘 때마다 전체 가중치를 다시 계산 (분할 상환 O(1))
+        if len(self._forms) >= self._weighed_at * 1.25:
+            self._reweigh()
+
+    def match(self, text: str) -> tuple[str, float] | None:
+        """
+        Best matching question for a phrasing.
+
+        Returns:
+            (question_id, similarity) or None if no form reaches the threshold
+        """
+        key = normalize(text)
+        if key in self._exact:
+            return self._exact[key], 1.0
+
+        grams = trigrams(text)
+        if not grams or not self.threshold:
+            return None
+        weights = {gram: self._weight(gram) for gram in grams}
+        total = sum(weights.values())
+
+        # Prefix filter: a form needs shared weight >= t W(A) / (2 - t) to reach
+        # the threshold, so it must contain one of the heaviest query trigrams
+        # whose weights add up to more than W(A) minus that. Light (common)
+        # trigrams such as "는가 " are never scanned, only checked per candidate.
+        needed = self.threshold * total / (2 - self.threshold)
+        ordered = sorted(grams, key=weights.get, reverse=True)
+        shared, remaining, cut = defaultdict(float), total, 0
+        while cut < len(ordered) and remaining >= needed:
+            gram = ordered[cut]
+            for index in self._postings.get(gram, ()):
+                shared[index] += weights[gram]
+            remaining -= weights[gram]
+            cut += 1
+        rest = ordered[cut:]
+
+        best, best_score = None, self.threshold
+        for index, found in shared.items():
+            question_id, form_grams = self._forms[index]
+            form_weight = self._form_weights[index]
+            # 나머지 트라이그램이 모두 겹쳐도 못 넘으면 건너뜀
+            if 2 * (found + min(remaining, form_weight - found)) < best_score * (total + form_weight):
+                continue
+            found += sum(weights[gram] for gram in rest if gram in form_grams)
+            score = 2 * found / (total + form_weight)
+            if score >= best_score:
+                best, best_score = question_id, score
+        return (best, round(best_score, 4)) if best else None
+
+    def _weight(self, gram: str) -> float:
+        """IDF weight of a trigram over the indexed forms."""
+        return math.log(1 + len(self._forms) / (1 + len(self._postings.get(gram, ()))))
+
+    def _reweigh(self) -> None:
+        """Recompute the stored form weights (IDF drifts as forms are added)."""
+        self._form_weights = [sum(self._weight(gram) for gram in grams) for _, grams in self._forms]
+        self._weighed_at = len(self._forms)
+
+    def resolve(self, text: str) -> tuple[str, bool]:
+        """
+        Canonical ID of a phrasing, adding it as a new canonical question if nothing matches.
+
+        Returns:
+            (question_id, created)
+        """
+        found = self.match(text)
+        if found:
+            return found[0], False
+        question_id = self.new_id(text)
+        self.add(question_id, text.strip())
+        return question_id, True
+
+    def new_id(self, canonical_form: str) -> str:
+        """ID for a new canonical form: q_ + its first words, suffixed if taken."""
+        words = normalize(canonical_form).split()[:3]
+        base = "q_" + "_".join(words)
+        question_id, n = base, 2
+        while question_id in self.canonical:
+            question_id, n = f"{base}_{n}", n + 1
+        return question_id
@@ -0,0 +1,260 @@
+"""Question mentions: find known question forms in posts and feed the lifecycle tracker."""
+
+import json
+import threading
+import time
+
+import ahocorasick
+
+from src.database import JobCheckpointRepository, PostRepository, QuestionRepository
+from .consumption import DOMINANT_QUESTIONS as CONSUMPTION_QUESTIONS, META_MARKERS
+from .keywords import KEYWORDS
+from .lifecycle import DOMINANT_QUESTIONS, QuestionLifecycleTracker
+
+
+STANCES = ("consume", "question", "reject")
+MIN_FORM_CHARS = 4  # 너무 짧은 형태는 오탐이 많음
+TRAILING_PUNCTUATION = "?？!.。… "
+
+
+class QuestionMatcher:
+    """
+    Known question forms compiled into one Aho-Corasick automaton.
+
+    Forms are the canonical forms and variants of DOMINANT_QUESTIONS, the
+    consumption detector's question list and every question the tracker
+    knows, each mapped to its question ID. A post is scanned once
+    (lowercased); a form followed by "?" counts as a "question" stance, and
+    meta markers in the post ("wrong question", "잘못된 질문") turn every
+    mention into "reject". The automaton is rebuilt when the tracker learns
+    new questions.
+    """
+
+    def __init__(self, tracker: QuestionLifecycleTracker):
+        self.tracker = tracker
+        self._automaton = None
+        self._questions = -1  # tracker.index size at the last build
+
+    def _forms(self) -> dict[str, str]:
+        """Lowercased form -> question ID."""
+        index = self.tracker.index
+        forms = {}
+
+        def add(question_id: str, form: str) -> None:
+            key = form.lower().strip().rstrip(TRAILING_PUNCTUATION)
+            if len(key) >= MIN_FORM_CHARS:
+                forms.setdefault(key, question_id)
+
+        for qid, q in DOMINANT_QUESTIONS.items():
+            for form in [q["canonical_form"], *q["variants"]]:
+                add(qid, form)
+        for qid, q in self.tracker.questions.items():
+            for form in [q["canonical_form"], *q["variants"]]:
+                add(qid, form)
+        for form in CONSUMPTION_QUESTIONS:
+            add(index.resolve(form)[0], form)
+        for qid, form in index.canonical.items():
+            add(qid, form)
+        return forms
+
+    def _compile(self) -> ahocorasick.Automaton:
+        automaton = ahocorasick.Automaton()
+        for form, qid in self._forms().items():
+            automaton.add_word(form, (len(form), qid))
+        automaton.make_automaton()
+        self._questions = len(self.tracker.index)
+        return automaton
+
+    def match(self, content: str) -> dict[str, str]:
+        """Questions whose known forms occur in a post: {question_id: stance}."""
+        if self._automaton is None or len(self.tracker.index) != self._questions:
+            self._automaton = self._compile()
+        if self._automaton.kind != ahocorasick.AHOCORASICK or not content:
+            return {}
+
+        lowered = content.lower()
+        found = {}
+        for end, (_, qid) in self._automaton.iter(lowered):
+            asked = lowered[end + 1:end + 3].lstrip().startswith(("?", "？"))
+            if asked or qid not in found:
+                found[qid] = "question" if asked else "consume"
+        if found and KEYWORDS.match(content).has(META_MARKERS):
+            found = dict.fromkeys(found, "reject")
+        return found
+
+    def mentions(self, content: str, consumption: dict | str | None = None) -> dict[str, str]:
+        """
+        Question mentions of a post: rule matches plus the LLM's questions_referenced.
+
+        Referenced questions are mapped through the tracker's question index
+        (a phrasing that matches no known question becomes a new one); the
+        LLM's stance wins over the rule-based one for the same question.
+
+        Returns:
+            {question_id: stance}
+        """
+        found = self.match(content)
+        if isinstance(consumption, str):
+            try:
+                consumption = json.loads(consumption)
+            except json.JSONDecodeError:
+                consumption = None
+        for ref in (consumption or {}).get("questions_referenced") or []:
+            text = ref.get("question") if isinstance(ref, dict) else ref
+            if not isinstance(text, str) or not text.strip():
+                continue
+            stance = ref.get("stance") if isinstance(ref, dict) else None
+            qid, _ = self.tracker.index.resolve(text)
+            found[qid] = stance if stance in STANCES else found.get(qid, "consume")
+        return found
+
+
+_tracker = None
+_matcher = None
+_tracker_lock = threading.Lock()
+
+
+def get_question_tracker() -> tuple[QuestionLifecycleTracker, QuestionMatcher]:
+    """Process-wide lifecycle tracker and its matcher."""
+    global _tracker, _matcher
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = QuestionLifecycleTracker()
+            _matcher = QuestionMatcher(_tracker)
+        return _tracker, _matcher
+
+
+def _register(tracker: QuestionLifecycleTracker, matcher: QuestionMatcher, rows, update_stage: bool = True) -> int:
+    """
+    Register the mentions of (post_id, agent_id, content, timestamp, consumption) rows; returns mentions.
+
+    Args:
+        update_stage: Stage each mention incrementally; bulk loads pass False
+            and call tracker.recompute_stages() once per batch instead.
+    """
+    count = 0
+    for post_id, agent_id, content, timestamp, consumption in rows:
+        for qid, stance in matcher.mentions(content or "", consumption).items():
+            tracker.register_mention(
+                tracker.index.canonical[qid], post_id, agent_id or "unknown", timestamp, stance,
+                update_stage=update_stage,
+            )
+            count += 1
+    return count
+
+
+def index_posts(posts: list[dict]) -> int:
+    """Register question mentions of freshly stored posts; returns mentions added."""
+    tracker, matcher = get_question_tracker()
+    with _tracker_lock:
+        done = QuestionRepository.posts_with_mentions([p["post_id"] for p in posts])
+        rows = sorted(
+            (
+                (p["post_id"], p.get("agent_id"), p.get("content"), p["timestamp"], p.get("question_consumption"))
+                for p in posts
+                if p["post_id"] not in done and p.get("timestamp")
+            ),
+            key=lambda row: row[3],
+        )
+        count = _register(tracker, matcher, rows)
+        if count:
+            tracker.save_data()
+        return count
+
+
+def backfill(
+    since: str | None = None,
+    batch_size: int = 5000,
+    restart: bool = False,
+    rebuild: bool = False,
+    progress: bool = True,
+) -> dict:
+    """
+    Extract question mentions from all stored posts, oldest first.
+
+    Posts are read in (timestamp, post_id) keyset batches together with the
+    stored consumption analysis. Posts that already have mentions are
+    skipped, so an interrupted or repeated run does not count a post twice;
+    the tracker is saved (mentions bulk-inserted, rollups and questions
+    merged into the stored ones) and the checkpoint moved after every batch.
+
+    Args:
+        since: Only posts with timestamp >= since (ISO date).
+        batch_size: Posts per batch.
+        restart: Ignore the stored checkpoint.
+        rebuild: Delete all questions and mentions first (implies restart).
+        progress: Print progress while running.
+
+    Returns:
+        Stats: processed, mentions, questions, seconds, posts_per_sec
+    """
+    global _tracker, _matcher
+    if rebuild:
+        with _tracker_lock:
+            QuestionRepository.clear()
+            _tracker = _matcher = None
+        restart = True
+    tracker, matcher = get_question_tracker()
+
+    job_id = f"question_mentions:{since or 'all'}"
+    checkpoint = None if restart else JobCheckpointRepository.get(job_id)
+    key = json.loads(checkpoint["last_key"]) if checkpoint and checkpoint.get("last_key") else None
+    processed = checkpoint["processed"] if key else 0
+    total = PostRepository.count()
+
+    stats = {"processed": processed, "mentions": 0, "questions": 0, "seconds": 0.0, "posts_per_sec": 0.0}
+    start = time.perf_counter()
+    done_now = 0
+    while True:
+        rows = PostRepository.get_with_consumption_after(key[0] if key else None, key[1] if key else "", batch_size, since)
+        if not rows:
+            break
+        with _tracker_lock:
+            done = QuestionRepository.posts_with_mentions([row[0] for row in rows])
+            added = _register(tracker, matcher, [row for row in rows if row[0] not in done], update_stage=False)
+            if added:
+                # 배치마다 한 번 벡터화해서 단계 재계산 (언급마다 갱신하지 않음)
+                tracker.recompute_stages()
+            stats["mentions"] += added
+            tracker.save_data()
+
+        key = [rows[-1][3], rows[-1][0]]
+        done_now += len(rows)
+        JobCheckpointRepository.put(job_id, 0, processed + done_now, json.dumps(key))
+        if progress:
+            elapsed = time.perf_counter() - start
+            rate = done_now / elapsed if elapsed else 0.0
+            print(f"\r{processed + done_now:,}/{total:,} posts, {stats['mentions']:,} mentions ({rate:,.0f} posts/s)",
+                  end="", flush=True)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["processed"] = processed + done_now
+    stats["questions"] = len(tracker.questions)
+    stats["posts_per_sec"] = done_now / stats["seconds"] if stats["seconds"] else 0.0
+    if progress and done_now:
+        print()
+    return stats
+
+
+def main():
+    """Extract question mentions from stored posts."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Question mention extraction")
+    parser.add_argument("--since", default=None, help="Only posts on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Posts per batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    parser.add_argument("--rebuild", action="store_true", help="Delete all questions and mentions first")
+    args = parser.parse_args()
+
+    stats = backfill(since=args.since, batch_size=args.batch_size, restart=args.restart, rebuild=args.rebuild)
+    print(f"Processed {stats['processed']:,} posts, registered {stats['mentions']:,} mentions "
+          f"of {stats['questions']:,} questions in {stats['seconds']:.1f}s ({stats['posts_per_sec']:,.0f} posts/s)")
+
+    tracker, _ = get_question_tracker()
+    for q in sorted(tracker.get_all_questions(), key=lambda q: -q["mention_count"])[:10]:
+        print(f"  {q['mention_count']:>6,}  {q['lifecycle']['stage']:<13} {q['canonical_form']}")
+
+
+if __name__ == "__main__":
+    main()
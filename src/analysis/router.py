@@ -0,0 +1,140 @@
+"""Tiered analysis routing: rule-based first, LLM only where it pays off."""
+
+import threading
+from collections import Counter
+
+from src.config import (
+    TIER_CONFIDENCE_THRESHOLD,
+    TIER_LLM_SUBMOLTS,
+    TIER_MIN_COMMENTS,
+    TIER_MIN_NOVELTY,
+    TIER_MIN_UPVOTES,
+)
+from .keywords import KEYWORDS, KeywordMatches
+from .trends import estimate_tokens
+
+
+ANALYSIS_TIERS = [
+    "rule",    # 키워드 규칙 결과를 그대로 사용
+    "llm",     # Solar Pro 분석
+    "local",   # Solar Pro 레이블로 학습한 로컬 분류기
+    "shared",  # 근사 중복 게시글의 분석 재사용
+]
+
+# Templated token-mint posts (mbc-20 inscriptions) - rules are certain about these
+MINT_TEMPLATE = KEYWORDS.register("router:mint_template", ['"op":"mint"', '"p":"mbc-20"', "mbc-20"])
+
+# Prompt + answer overhead of one full analysis call, on top of the post itself
+LLM_CALL_OVERHEAD_TOKENS = 700
+
+
+def _hit_confidence(hits: int) -> float:
+    """Confidence of a first-match rule decision given how many rules fired."""
+    if hits == 0:
+        return 0.3   # 기본값으로 떨어짐 - 모호
+    if hits == 1:
+        return 0.9
+    if hits == 2:
+        return 0.6
+    return 0.4
+
+
+class TieredRouter:
+    """
+    Decide per post whether the rule-based result is good enough.
+
+    Confidence comes from how decisively the keyword rules fired: exactly one
+    topic and one persona rule is confident, no rule or many competing rules
+    is ambiguous, and templated mint posts are certain. Posts below the
+    confidence threshold, or high-value posts (engagement, novelty, watched
+    submolts), are sent to the LLM.
+    """
+
+    def __init__(
+        self,
+        threshold: float = TIER_CONFIDENCE_THRESHOLD,
+        min_upvotes: int = TIER_MIN_UPVOTES,
+        min_comments: int = TIER_MIN_COMMENTS,
+        min_novelty: float = TIER_MIN_NOVELTY,
+        llm_submolts: list[str] | None = None,
+    ):
+        self.threshold = threshold
+        self.min_upvotes = min_upvotes
+        self.min_comments = min_comments
+        self.min_novelty = min_novelty
+        self.llm_submolts = set(TIER_LLM_SUBMOLTS if llm_submolts is None else llm_submolts)
+
+        self._counts = Counter()
+        self._reasons = Counter()
+        self._lock = threading.Lock()
+
+    def confidence(self, matches: KeywordMatches, topic_groups: list[str], persona_groups: list[str]) -> float:
+        """Confidence in the rule-based labels of a post."""
+        if matches.has(MINT_TEMPLATE):
+            return 0.95
+        topic = _hit_confidence(sum(matches.has(group) for group in topic_groups))
+        persona = _hit_confidence(sum(matches.has(group) for group in persona_groups))
+        score = (topic + persona) / 2
+        # 긴 글은 키워드만으로 판단하기 어려움
+        if len(matches.content) > 1500:
+            score -= 0.15
+        return max(0.0, min(1.0, score))
+
+    def route(self, post: dict, confidence: float, novelty: float) -> dict:
+        """
+        Choose a tier for a post.
+
+        Returns:
+            {"tier": "rule" | "llm", "confidence": float, "reasons": [str]}
+        """
+        reasons = []
+        if confidence < self.threshold:
+            reasons.append("ambiguous")
+        if (post.get("upvotes") or 0) >= self.min_upvotes or (post.get("comments_count") or 0) >= self.min_comments:
+            reasons.append("engagement")
+        if novelty >= self.min_novelty:
+            reasons.append("novelty")
+        if (post.get("submolt") or "").lower() in self.llm_submolts:
+            reasons.append("submolt")
+
+        tier = "llm" if reasons else "rule"
+        self.record(tier, post.get("content", ""), reasons)
+        return {"tier": tier, "confidence": round(confidence, 3), "reasons": reasons}
+
+    def record(self, tier: str, content: str = "", reasons: list[str] | None = None) -> None:
+        """Count an analysis produced by `tier`."""
+        with self._lock:
+            self._counts[tier] += 1
+            if tier != "llm" and content:
+                self._counts["tokens_saved"] += estimate_tokens(content) + LLM_CALL_OVERHEAD_TOKENS
+            for reason in reasons or []:
+                self._reasons[reason] += 1
+
+    def metrics(self) -> dict:
+        """Routing counts and LLM-call savings since start."""
+        with self._lock:
+            counts = dict(self._counts)
+            reasons = dict(self._reasons)
+        routed = sum(counts.get(tier, 0) for tier in ANALYSIS_TIERS)
+        saved = routed - counts.get("llm", 0)
+        return {
+            "routed": routed,
+            "by_tier": {tier: counts.get(tier, 0) for tier in ANALYSIS_TIERS},
+            "llm_reasons": reasons,
+            "llm_calls_saved": saved,
+            "savings_rate": saved / routed if routed else 0.0,
+            "tokens_saved": counts.get("tokens_saved", 0),
+        }
+
+
+_default_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> TieredRouter:
+    """Process-wide router, so savings accumulate across analyzer instances."""
+    global _default_router
+    with _router_lock:
+        if _default_router is None:
+            _default_router = TieredRouter()
+        return _default_router
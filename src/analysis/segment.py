@@ -0,0 +1,124 @@
+"""Split long posts into overlapping chunks and analyze them concurrently."""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api import UpstageClient
+from src.config import CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS, UPSTAGE_MAX_CONCURRENCY
+from .trends import estimate_tokens
+
+
+# Sentence ends (Korean posts use the same punctuation) and line breaks
+SENTENCE_END_RE = re.compile(r"[.!?…。！？]+[\"'”’)\]]*\s+|\n+")
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+def _units(content: str) -> list[tuple[int, int, bool]]:
+    """Sentence spans as (start, end, starts_paragraph)."""
+    paragraph_starts = {m.end() for m in PARAGRAPH_RE.finditer(content)}
+    units, start = [], 0
+    for match in SENTENCE_END_RE.finditer(content):
+        if match.end() > start:
+            units.append((start, match.end(), start in paragraph_starts))
+            start = match.end()
+    if start < len(content):
+        units.append((start, len(content), start in paragraph_starts))
+    return units
+
+
+def _split_long(content: str, start: int, end: int, max_tokens: int) -> list[tuple[int, int, bool]]:
+    """Cut a sentence longer than `max_tokens` at whitespace."""
+    pieces = []
+    while end - start > 0 and estimate_tokens(content[start:end]) > max_tokens:
+        size = max(1, max_tokens * (end - start) // estimate_tokens(content[start:end]))
+        while True:
+            cut = content.rfind(" ", start + size // 2, start + size)
+            cut = cut + 1 if cut != -1 else start + size
+            # 글자당 토큰 수가 고르지 않으므로 예산을 넘으면 줄여서 다시 자름
+            if size == 1 or estimate_tokens(content[start:cut]) <= max_tokens:
+                break
+            size = max(1, size * 9 // 10)
+        pieces.append((start, cut, False))
+        start = cut
+    if end > start:
+        pieces.append((start, end, False))
+    return pieces
+
+
+def segment(
+    content: str,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[tuple[int, int]]:
+    """
+    Split a post into overlapping chunks of at most `max_tokens`.
+
+    Chunks are made of whole sentences; a chunk that is more than half full
+    ends at the last paragraph break instead of mid-paragraph. Each chunk
+    after the first repeats the trailing sentences (up to `overlap_tokens`)
+    of the previous one, so a shift at a boundary is seen whole by one chunk;
+    the overlap is shrunk when needed so every chunk ends past the previous one.
+
+    Returns:
+        [(start, end)] character offsets into `content`; one span for short posts
+    """
+    if estimate_tokens(content) <= max_tokens:
+        return [(0, len(content))]
+
+    units = []
+    for start, end, paragraph in _units(content):
+        pieces = _split_long(content, start, end, max_tokens)
+        pieces[0] = (pieces[0][0], pieces[0][1], paragraph)
+        units.extend(pieces)
+    tokens = [estimate_tokens(content[s:e]) for s, e, _ in units]
+
+    chunks, first, covered = [], 0, 0  # covered: units before this index are in a chunk
+    while first < len(units):
+        last, used = first, tokens[first]
+        while last + 1 < len(units) and used + tokens[last + 1] <= max_tokens:
+            last += 1
+            used += tokens[last]
+        if last + 1 < len(units):
+            # 절반 이상 찼으면 문단 경계에서 끊음 (이전 청크보다는 더 나아가야 함)
+            breaks = [i for i in range(max(first, covered) + 1, last + 1) if units[i][2]]
+            if breaks and sum(tokens[first:breaks[-1]]) * 2 >= max_tokens:
+                last = breaks[-1] - 1
+        chunks.append((units[first][0], units[last][1]))
+        if last + 1 >= len(units):
+            break
+
+        # 다음 청크는 이전 청크 끝부분 문장들을 다시 포함하되, 새 문장이 들어갈 자리는 남김
+        covered = last + 1
+        room = min(overlap_tokens, max_tokens - tokens[covered])
+        next_first, overlap = covered, 0
+        while next_first - 1 > first and overlap + tokens[next_first - 1] <= room:
+            next_first -= 1
+            overlap += tokens[next_first]
+        first = next_first
+    return chunks
+
+
+def analyze_chunks(
+    content: str,
+    prompt_template: str,
+    required_fields: list[str],
+    client: UpstageClient,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[tuple[int, int, dict]]:
+    """
+    Run a prompt over every chunk of a post concurrently.
+
+    Returns:
+        [(chunk_start, chunk_end, result)] in text order
+    """
+    spans = segment(content, max_tokens, overlap_tokens)
+    if len(spans) == 1:
+        return [(0, len(content), client.analyze_with_prompt(content, prompt_template, required_fields))]
+
+    with ThreadPoolExecutor(max_workers=min(len(spans), UPSTAGE_MAX_CONCURRENCY)) as executor:
+        results = list(executor.map(
+            lambda span: client.analyze_with_prompt(content[span[0]:span[1]], prompt_template, required_fields),
+            spans,
+        ))
+    return [(start, end, result) for (start, end), result in zip(spans, results)]
@@ -0,0 +1,328 @@
+"""Similar-post search: hashed TF-IDF vectors with a random-projection LSH index."""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+from src.config import SIMILARITY_INDEX_DIR
+from src.database import PostRepository
+from .novelty import ngram_hashes
+
+
+FEATURE_DIM = 1 << 16
+EMBED_DIM = 128
+CODE_WORDS = EMBED_DIM // 64  # sign bits of every projection = random-hyperplane LSH code
+ID_BYTES = 48            # initial id slot; widened when a longer post_id arrives
+INITIAL_CAPACITY = 1 << 14
+MIN_CANDIDATES = 2048    # rows re-ranked by exact cosine per query
+CANDIDATE_FRACTION = 0.01
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[np.ascontiguousarray(values).view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+def _projection() -> np.ndarray:
+    """Fixed random +-1 projection (FEATURE_DIM x EMBED_DIM, int8)."""
+    rng = np.random.RandomState(20260201)
+    return (rng.randint(0, 2, size=(FEATURE_DIM, EMBED_DIM), dtype=np.int8) * 2 - 1).astype(np.int8)
+
+
+class SimilarityIndex:
+    """
+    Append-only ANN index over post vectors, stored as NumPy memmaps.
+
+    A post's word uni/bigrams are hashed into FEATURE_DIM buckets, weighted
+    by TF-IDF (document frequencies are counted incrementally) and randomly
+    projected to EMBED_DIM dims (L2-normalized, float16). The signs of the
+    projections form an EMBED_DIM-bit LSH code whose Hamming distance tracks
+    the angle between posts. A query ranks all codes by Hamming distance
+    (XOR + popcount), then re-ranks the closest candidates (at least
+    MIN_CANDIDATES, 1% of the index) by exact cosine on the stored vectors.
+
+    Files in `path`: vectors.f16, codes.u64, ids.bin, df.f32, meta.json.
+    Post ids are stored in fixed-width slots (meta["id_bytes"]); a longer id
+    rewrites ids.bin with wider slots. Single writer (ingest); readers pick
+    up appended rows and wider slots via meta.json.
+    """
+
+    def __init__(self, path=SIMILARITY_INDEX_DIR):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta_path = path / "meta.json"
+        self._lock = threading.Lock()
+        self._projection = _projection()
+        self._row_of = None  # post_id -> row, built lazily
+
+        self.count, self.capacity, self.docs = 0, 0, 0
+        self.id_bytes = ID_BYTES
+        if self.meta_path.exists():
+            self._load_meta()
+        self.df = self._open("df.f32", np.float32, (FEATURE_DIM,))
+        self._map(max(self.capacity, INITIAL_CAPACITY))
+
+    # -------------------------------------------------------------- storage
+
+    def _open(self, name: str, dtype, shape: tuple) -> np.memmap:
+        file = self.path / name
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not file.exists() or file.stat().st_size < size:
+            with open(file, "ab") as f:
+                f.truncate(size)  # 빈 공간은 0으로 채워짐
+        return np.memmap(file, dtype=dtype, mode="r+", shape=shape)
+
+    def _map(self, capacity: int) -> None:
+        self.vectors = self._open("vectors.f16", np.float16, (capacity, EMBED_DIM))
+        self.codes = self._open("codes.u64", np.uint64, (capacity, CODE_WORDS))
+        self.ids = self._open("ids.bin", f"S{self.id_bytes}", (capacity,))
+        self.capacity = capacity
+
+    def _widen_ids(self, size: int) -> None:
+        """Rewrite ids.bin with slots of at least `size` bytes."""
+        id_bytes = -(-size // 16) * 16
+        file, tmp = self.path / "ids.bin", self.path / "ids.bin.tmp"
+        tmp.unlink(missing_ok=True)
+        self.id_bytes = id_bytes
+        ids = self._open("ids.bin.tmp", f"S{id_bytes}", (self.capacity,))
+        ids[:self.count] = self.ids[:self.count]
+        ids.flush()
+        del ids
+        # 읽는 쪽은 meta.json이 바뀐 뒤에 새 파일을 다시 매핑함
+        os.replace(tmp, file)
+        self._map(self.capacity)
+
+    def _load_meta(self) -> None:
+        meta = json.loads(self.meta_path.read_text())
+        self.count, self.docs = meta["count"], meta["docs"]
+        self.capacity = max(self.capacity, meta["capacity"])
+        self.id_bytes = meta.get("id_bytes", ID_BYTES)
+
+    def _save_meta(self) -> None:
+        for array in (self.vectors, self.codes, self.ids, self.df):
+            array.flush()
+        self.meta_path.write_text(json.dumps(
+            {"count": self.count, "capacity": self.capacity, "docs": self.docs, "id_bytes": self.id_bytes}
+        ))
+
+    def refresh(self) -> None:
+        """Pick up rows appended by another process."""
+        if not self.meta_path.exists():
+            return
+        count, id_bytes = self.count, self.id_bytes
+        self._load_meta()
+        if self.capacity > len(self.codes) or self.id_bytes != id_bytes:
+            self._map(self.capacity)
+        if self.count != count:
+            self._row_of = None
+
+    # ------------------------------------------------------------ embedding
+
+    def _features(self, content: str) -> tuple[np.ndarray, np.ndarray]:
+        hashes = np.concatenate(ngram_hashes(content)[:2])
+        buckets = (hashes & np.uint64(FEATURE_DIM - 1)).astype(np.int64)
+        return np.unique(buckets, return_counts=True)
+
+    def embed(self, content: str) -> np.ndarray:
+        """L2-normalized float32 vector of a post (zeros for empty text)."""
+        return self._embed(*self._features(content))
+
+    def _embed(self, buckets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        if buckets.size == 0:
+            return np.zeros(EMBED_DIM, dtype=np.float32)
+        idf = np.log((self.docs + 1) / (self.df[buckets] + 1)) + 1
+        weights = ((1 + np.log(counts)) * idf).astype(np.float32)
+        vector = weights @ self._projection[buckets].astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def code(vector: np.ndarray) -> np.ndarray:
+        return np.packbits(vector > 0, bitorder="little").view(np.uint64)
+
+    # ------------------------------------------------------------- updates
+
+    def row_of(self, post_id: str) -> int | None:
+        if self._row_of is None:
+            ids = self.ids[:self.count]
+            self._row_of = {raw.decode("utf-8"): row for row, raw in enumerate(ids.tolist())}
+        return self._row_of.get(post_id)
+
+    def add_many(self, posts: list[dict], count_df: bool = True) -> int:
+        """Append posts that are not indexed yet; returns how many were added."""
+        with self._lock:
+            self.refresh()
+            added = 0
+            for post in posts:
+                post_id = post["post_id"]
+                if self.row_of(post_id) is not None:
+                    continue
+                raw_id = post_id.encode("utf-8")
+                if len(raw_id) > self.id_bytes:
+                    self._widen_ids(len(raw_id))
+                buckets, counts = self._features(post.get("content") or "")
+                if count_df:
+                    self.df[buckets] += 1
+                    self.docs += 1
+                if self.count == self.capacity:
+                    self._map(self.capacity * 2)
+                vector = self._embed(buckets, counts)
+                self.vectors[self.count] = vector
+                self.codes[self.count] = self.code(vector)
+                self.ids[self.count] = raw_id
+                self._row_of[post_id] = self.count
+                self.count += 1
+                added += 1
+            if added:
+                self._save_meta()
+            return added
+
+    def count_documents(self, contents) -> None:
+        """Add document frequencies without indexing (first pass of a rebuild)."""
+        with self._lock:
+            for content in contents:
+                buckets, _ = self._features(content or "")
+                self.df[buckets] += 1
+                self.docs += 1
+            self._save_meta()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.df[:] = 0
+            self.count, self.docs = 0, 0
+            self._row_of = None
+            self._save_meta()
+
+    # -------------------------------------------------------------- queries
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: int | None = None) -> list[tuple[int, float]]:
+        """Top-k rows by cosine similarity: [(row, similarity)]."""
+        n = self.count
+        if n == 0 or not vector.any():
+            return []
+        code = self.code(vector)
+        # 64비트 단위로 나눠 계산하는 편이 2차원 popcount + sum보다 훨씬 빠름
+        distances = _popcount(self.codes[:n, 0] ^ code[0])
+        for word in range(1, CODE_WORDS):
+            distances += _popcount(self.codes[:n, word] ^ code[word])
+        distances = distances.astype(np.int32)
+        size = min(n, max(MIN_CANDIDATES, 20 * k, int(n * CANDIDATE_FRACTION)))
+        candidates = np.argpartition(distances, size - 1)[:size] if size < n else np.arange(n)
+        similarities = self.vectors[candidates].astype(np.float32) @ vector
+        order = np.argsort(-similarities)
+        results = []
+        for i in order:
+            row = int(candidates[i])
+            if row != exclude:
+                results.append((row, round(float(similarities[i]), 4)))
+                if len(results) == k:
+                    break
+        return results
+
+    def find_similar(self, post_id: str, k: int = 10) -> list[dict]:
+        """
+        Posts most similar to `post_id`.
+
+        Returns:
+            [{"post_id": str, "similarity": float}] best first
+        """
+        self.refresh()
+        row = self.row_of(post_id)
+        if row is not None:
+            vector = self.vectors[row].astype(np.float32)
+        else:
+            post = PostRepository.get_by_id(post_id)
+            if post is None:
+                return []
+            vector = self.embed(post.get("content", ""))
+        return [
+            {"post_id": self.ids[r].decode("utf-8"), "similarity": s}
+            for r, s in self.search(vector, k, exclude=row)
+        ]
+
+    def find_similar_text(self, content: str, k: int = 10) -> list[dict]:
+        """Posts most similar to arbitrary text (e.g. a phrase)."""
+        self.refresh()
+        return [
+            {"post_id": self.ids[r].decode("utf-8"), "similarity": s}
+            for r, s in self.search(self.embed(content), k)
+        ]
+
+
+_default_index = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Process-wide similarity index."""
+    global _default_index
+    with _index_lock:
+        if _default_index is None:
+            _default_index = SimilarityIndex()
+        return _default_index
+
+
+def find_similar(post_id: str, k: int = 10) -> list[dict]:
+    """Posts most similar to a stored post (see SimilarityIndex.find_similar)."""
+    return get_similarity_index().find_similar(post_id, k)
+
+
+def index_posts(posts: list[dict]) -> int:
+    """Add freshly stored posts to the similarity index."""
+    return get_similarity_index().add_many(posts)
+
+
+def _batches(batch_size: int):
+    """Stored posts in (timestamp, post_id) keyset batches, oldest first."""
+    posts = PostRepository.get_after(limit=batch_size)
+    while posts:
+        yield posts
+        last = posts[-1]
+        posts = PostRepository.get_after(last["timestamp"], last["post_id"], batch_size)
+
+
+def backfill(rebuild: bool = False, batch_size: int = 5000) -> int:
+    """
+    Index stored posts that are not in the index yet.
+
+    With `rebuild`, document frequencies are first counted over the whole
+    table so every vector uses the same IDF weights. Both passes page by
+    (timestamp, post_id), so posts stored meanwhile never shift a page.
+    """
+    index = get_similarity_index()
+    if rebuild:
+        index.reset()
+        for posts in _batches(batch_size):
+            index.count_documents(p.get("content") for p in posts)
+    added = 0
+    for posts in _batches(batch_size):
+        added += index.add_many(posts, count_df=not rebuild)
+    return added
+
+
+def main():
+    """Build the similarity index and optionally query it."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Similar-post index")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index from all posts")
+    parser.add_argument("--post", default=None, help="Show posts similar to this post ID")
+    parser.add_argument("-k", type=int, default=10, help="Number of similar posts")
+    args = parser.parse_args()
+
+    added = backfill(rebuild=args.rebuild)
+    print(f"Indexed {added:,} posts ({get_similarity_index().count:,} total)")
+
+    if args.post:
+        for match in find_similar(args.post, args.k):
+            post = PostRepository.get_by_id(match["post_id"]) or {}
+            print(f"  {match['similarity']:.3f}  {match['post_id']}  {(post.get('content') or '')[:80]!r}")
+
+
+if __name__ == "__main__":
+    main()
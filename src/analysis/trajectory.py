@@ -3,28 +3,48 @@
 from datetime import datetime
 from typing import Any
 
-from src.config import AGENTS_DATA_DIR
-from src.storage import save_json, load_json, save_agent_profile, load_agent_profile
+from src.database import TrajectoryRepository
 
 
 class IdentityTrajectoryTracker:
-    """Track identity changes for agents over time."""
+    """
+    Track identity changes for agents over time.
 
-    def __init__(self):
-        self.agents = {}  # agent_id -> profile data
-        self.load_data()
+    An agent's profile and last 100 trajectory points are loaded from the
+    database the first time the agent is used. save_data() upserts the
+    changed profiles and appends only the new trajectory points.
+    """
 
-    def load_data(self) -> None:
-        """Load existing agent data."""
-        for filepath in AGENTS_DATA_DIR.glob("*.json"):
-            data = load_json(filepath)
-            if data:
-                self.agents[data.get("agent_id", filepath.stem)] = data
+    def __init__(self):
+        self.agents = {}  # agent_id -> profile data (agents used so far)
+        self._missing = set()  # agents known to have no stored profile
+        self._dirty = set()
+        self._pending_points = []  # agent_trajectories rows not saved yet
+        self._saved_archetype = {}  # dirty agent -> archetype of its last saved point
+
+    def _agent(self, agent_id: str) -> dict | None:
+        if agent_id not in self.agents and agent_id not in self._missing:
+            profile = TrajectoryRepository.get_profile(agent_id)
+            if profile is None:
+                self._missing.add(agent_id)
+            else:
+                self.agents[agent_id] = profile
+        return self.agents.get(agent_id)
 
-    def save_data(self) -> None:
-        """Save all agent data."""
-        for agent_id, data in self.agents.items():
-            save_agent_profile(agent_id, data)
+    def load_data(self, agent_ids: list[str] | None = None) -> None:
+        """Load stored profiles of the given agents (others load on first use)."""
+        for agent_id in agent_ids or []:
+            self._agent(agent_id)
+
+    def save_data(self) -> int:
+        """Save profiles and trajectory points changed since the last save; returns agents saved."""
+        saved = len(self._dirty)
+        if self._dirty:
+            TrajectoryRepository.save([self.agents[a] for a in self._dirty], self._pending_points)
+        self._dirty.clear()
+        self._pending_points = []
+        self._saved_archetype = {}
+        return saved
 
     def record_analysis(
         self,
@@ -41,7 +61,8 @@ class IdentityTrajectoryTracker:
 
         Returns shift event if identity changed, None otherwise.
         """
-        if agent_id not in self.agents:
+        if self._agent(agent_id) is None:
+            self._missing.discard(agent_id)
             self.agents[agent_id] = {
                 "agent_id": agent_id,
                 "identity_trajectory": [],
@@ -67,11 +88,16 @@ class IdentityTrajectoryTracker:
         # Add new trajectory point
         trajectory.append({
             "date": timestamp[:10],  # YYYY-MM-DD
+            "timestamp": timestamp,
             "archetype": archetype,
             "confidence": confidence,
             "discourse_position": discourse_position,
             "sample_post": post_id,
         })
+        if agent_id not in self._dirty:
+            self._saved_archetype[agent_id] = prev_archetype
+            self._dirty.add(agent_id)
+        self._pending_points.append((agent_id, post_id, archetype, confidence, discourse_position, timestamp))
 
         # Keep only last 100 points
         agent["identity_trajectory"] = trajectory[-100:]
@@ -105,42 +131,37 @@ class IdentityTrajectoryTracker:
 
     def get_trajectory(self, agent_id: str) -> list[dict]:
         """Get identity trajectory for an agent."""
-        agent = self.agents.get(agent_id, {})
+        agent = self._agent(agent_id) or {}
         return agent.get("identity_trajectory", [])
 
     def get_profile(self, agent_id: str) -> dict | None:
         """Get full profile for an agent."""
-        return self.agents.get(agent_id)
+        return self._agent(agent_id)
+
+    def _latest_points(self) -> dict[str, dict]:
+        """Each agent's current trajectory point (stored, overridden by unsaved ones)."""
+        latest = TrajectoryRepository.latest_points()
+        for agent_id in self._dirty:
+            latest[agent_id] = self.agents[agent_id]["identity_trajectory"][-1]
+        return latest
 
     def get_agents_by_archetype(self, archetype: str) -> list[str]:
         """Get list of agent IDs with current archetype."""
-        result = []
-        for agent_id, data in self.agents.items():
-            trajectory = data.get("identity_trajectory", [])
-            if trajectory and trajectory[-1].get("archetype") == archetype:
-                result.append(agent_id)
-        return result
+        return [a for a, point in self._latest_points().items() if point.get("archetype") == archetype]
 
     def get_agents_by_position(self, position: str) -> list[str]:
         """Get list of agent IDs at discourse position."""
-        result = []
-        for agent_id, data in self.agents.items():
-            trajectory = data.get("identity_trajectory", [])
-            if trajectory and trajectory[-1].get("discourse_position") == position:
-                result.append(agent_id)
-        return result
+        return [a for a, point in self._latest_points().items() if point.get("discourse_position") == position]
 
     def compute_distribution(self) -> dict:
         """Compute current archetype distribution."""
         distribution = {}
         total = 0
 
-        for data in self.agents.values():
-            trajectory = data.get("identity_trajectory", [])
-            if trajectory:
-                archetype = trajectory[-1].get("archetype", "Undefined")
-                distribution[archetype] = distribution.get(archetype, 0) + 1
-                total += 1
+        for point in self._latest_points().values():
+            archetype = point.get("archetype", "Undefined")
+            distribution[archetype] = distribution.get(archetype, 0) + 1
+            total += 1
 
         # Convert to ratios
         if total > 0:
@@ -151,21 +172,21 @@ class IdentityTrajectoryTracker:
 
     def get_all_shift_events(self) -> list[dict]:
         """Get all identity shift events across agents."""
-        events = []
-
-        for agent_id, data in self.agents.items():
-            trajectory = data.get("identity_trajectory", [])
-            for i in range(1, len(trajectory)):
-                prev = trajectory[i-1]
-                curr = trajectory[i]
-                if prev["archetype"] != curr["archetype"]:
-                    events.append({
-                        "agent_id": agent_id,
-                        "date": curr["date"],
-                        "from": prev["archetype"],
-                        "to": curr["archetype"],
-                        "post_id": curr.get("sample_post"),
-                    })
+        events = TrajectoryRepository.shift_events()
+
+        # 저장되지 않은 지점: 마지막으로 저장된 지점부터 이어서 비교
+        previous = dict(self._saved_archetype)
+        for agent_id, post_id, archetype, _, _, timestamp in self._pending_points:
+            prev = previous.get(agent_id)
+            if prev and prev != archetype:
+                events.append({
+                    "agent_id": agent_id,
+                    "date": timestamp[:10],
+                    "from": prev,
+                    "to": archetype,
+                    "post_id": post_id,
+                })
+            previous[agent_id] = archetype
 
         # Sort by date
         events.sort(key=lambda x: x["date"])
@@ -0,0 +1,230 @@
+"""Hierarchical map-reduce trend analysis over the whole corpus."""
+
+import hashlib
+import json
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from src.api import UpstageClient
+from src.database import TrendSummaryRepository
+
+
+# Schema for chunk (map) summaries - same fields as UpstageClient.analyze_batch_trends
+TREND_SCHEMA = {
+    "인기_토픽": "가장 많이 논의된 3-5개 토픽",
+    "바이럴_요소": "반복되는 문구, 밈, 표현들",
+    "글쓰기_패턴": "공통적인 글쓰기 패턴",
+    "커뮤니티_분위기": "전반적 분위기 (낙관적, 장난스러움, 진지함 등)",
+    "활동중인_에이전트_유형": "가장 활발한 에이전트 페르소나 유형"
+}
+
+# Schema for merging child summaries (reduce)
+MERGE_SCHEMA = {
+    "인기_토픽": "아래 부분 요약들 전체에서 가장 많이 논의된 3-5개 토픽",
+    "바이럴_요소": "여러 부분 요약에 걸쳐 반복되는 문구, 밈, 표현들",
+    "글쓰기_패턴": "부분 요약들에 공통적인 글쓰기 패턴",
+    "커뮤니티_분위기": "전체 기간의 전반적 분위기 (낙관적, 장난스러움, 진지함 등)",
+    "활동중인_에이전트_유형": "전체적으로 가장 활발한 에이전트 페르소나 유형"
+}
+
+HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per Hangul syllable, one per 4 other characters."""
+    hangul = len(HANGUL_RE.findall(text))
+    return hangul + (len(text) - hangul) // 4 + 1
+
+
+def content_hash(content: str) -> str:
+    """Short stable hash of post content."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _week(window: str) -> str:
+    """Monday (YYYY-MM-DD) of the ISO week containing a day or hour window."""
+    if len(window) < 10:
+        return window
+    day = date.fromisoformat(window[:10])
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+# Calendar buckets the reduce tree climbs through, finest first: each maps
+# the start of a child's window to the parent it is merged into
+BUCKETS = [
+    ("day", lambda window: window[:10]),
+    ("week", _week),
+    ("month", lambda window: window[:7]),
+    ("year", lambda window: window[:4]),
+    ("all", lambda window: ""),
+]
+LEVEL_START = {"hour": 0, "day": 1, "month": 3}
+
+
+class TrendPipeline:
+    """
+    Map-reduce community trend analysis.
+
+    Posts are grouped by time window, packed into chunks under a token
+    budget, summarized concurrently (map), and the summaries are merged up
+    through calendar buckets (a window's chunks, then week, month, year and
+    root) until one root remains (reduce); a bucket with more than `fanout`
+    children is merged `fanout` at a time. Every node is cached by a key
+    derived from its window and content hashes (leaves) or its bucket and
+    children's keys (inner nodes). Children are grouped by their own window,
+    never by position, so new or backdated posts only recompute the affected
+    leaves and their path to the root.
+    """
+
+    def __init__(
+        self,
+        client: UpstageClient | None = None,
+        window: str = "day",
+        chunk_tokens: int = 3000,
+        fanout: int = 8,
+        max_workers: int = 4,
+        post_chars: int = 1500,
+    ):
+        self.client = client or UpstageClient()
+        self.window = window
+        self.chunk_tokens = chunk_tokens
+        self.fanout = fanout
+        self.max_workers = max_workers
+        self.post_chars = post_chars
+        self.last_stats = {}
+
+    def run(self, posts: list[dict]) -> dict:
+        """Summarize trends over all posts and return the root summary."""
+        self.last_stats = {"posts": len(posts), "leaves": 0, "levels": 0, "llm_calls": 0, "cache_hits": 0}
+        if not posts:
+            return {}
+
+        nodes = [self._leaf_node(window, chunk) for window, chunk in self._chunks(posts)]
+        self.last_stats["leaves"] = len(nodes)
+        self._fill(nodes, level=0)
+
+        level = 0
+        # 같은 윈도우의 청크끼리 먼저 병합한 뒤 상위 달력 버킷으로
+        for name, bucket_of in [("window", lambda window: window), *BUCKETS[LEVEL_START.get(self.window, 1):]]:
+            groups = defaultdict(list)
+            for node in nodes:
+                groups[bucket_of(node["window"].split("~")[0])].append(node)
+            groups = [groups[bucket] for bucket in sorted(groups)]
+            # 버킷 안에서만 fanout씩 병합하므로 다른 버킷의 키는 바뀌지 않음
+            while any(len(group) > 1 for group in groups):
+                level += 1
+                groups = [
+                    [
+                        self._inner_node(group[i:i + self.fanout], level, name)
+                        for i in range(0, len(group), self.fanout)
+                    ]
+                    for group in groups
+                ]
+                self._fill([node for group in groups for node in group], level)
+            nodes = [group[0] for group in groups]
+        self.last_stats["levels"] = level + 1
+
+        return nodes[0]["summary"]
+
+    def _window_of(self, post: dict) -> str:
+        timestamp = post.get("timestamp", "")
+        if self.window == "hour":
+            return timestamp[:13]
+        if self.window == "month":
+            return timestamp[:7]
+        return timestamp[:10]
+
+    def _chunks(self, posts: list[dict]) -> list[tuple[str, list[dict]]]:
+        """Group posts by window and pack each window into token-bounded chunks."""
+        by_window = defaultdict(list)
+        for post in posts:
+            by_window[self._window_of(post)].append(post)
+
+        chunks = []
+        for window in sorted(by_window):
+            ordered = sorted(by_window[window], key=lambda p: (p.get("timestamp", ""), p.get("post_id", "")))
+            chunk, used = [], 0
+            for post in ordered:
+                tokens = estimate_tokens(post.get("content", "")[:self.post_chars])
+                if chunk and used + tokens > self.chunk_tokens:
+                    chunks.append((window, chunk))
+                    chunk, used = [], 0
+                chunk.append(post)
+                used += tokens
+            if chunk:
+                chunks.append((window, chunk))
+        return chunks
+
+    def _leaf_node(self, window: str, chunk: list[dict]) -> dict:
+        hashes = sorted(content_hash(p.get("content", "")) for p in chunk)
+        text = "\n---\n".join(p.get("content", "")[:self.post_chars] for p in chunk)
+        return {
+            "key": _cache_key("leaf", window, *hashes),
+            "window": window,
+            "post_count": len(chunk),
+            "text": text,
+            "schema": TREND_SCHEMA,
+        }
+
+    def _inner_node(self, children: list[dict], level: int, bucket: str) -> dict:
+        first, last = children[0]["window"].split("~")[0], children[-1]["window"].split("~")[-1]
+        window = first if first == last else f"{first}~{last}"
+        if len(children) == 1:
+            # Nothing to merge - carry the child's summary up
+            return {**children[0], "window": window}
+        text = "\n\n".join(
+            f"[{child['window']} / {child['post_count']}개 게시글]\n"
+            + json.dumps(child["summary"], ensure_ascii=False)
+            for child in children
+        )
+        return {
+            "key": _cache_key("node", bucket, *(child["key"] for child in children)),
+            "window": window,
+            "post_count": sum(child["post_count"] for child in children),
+            "text": text,
+            "schema": MERGE_SCHEMA,
+        }
+
+    def _fill(self, nodes: list[dict], level: int) -> None:
+        """Load cached summaries and compute the missing ones concurrently."""
+        pending = []
+        for node in nodes:
+            if "summary" in node:
+                continue
+            cached = TrendSummaryRepository.get(node["key"])
+            if cached is not None:
+                node["summary"] = cached
+                self.last_stats["cache_hits"] += 1
+            else:
+                pending.append(node)
+
+        if not pending:
+            return
+
+        # 완료된 요약은 하나가 실패해도 먼저 저장한 뒤 첫 오류를 다시 던짐
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.client.extract_from_text, node["text"], node["schema"]): node
+                for node in pending
+            }
+            for future in as_completed(futures):
+                node = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                node["summary"] = summary
+                self.last_stats["llm_calls"] += 1
+                # 파싱 실패 응답({"raw": ...})은 캐시하지 않음
+                if not self.client.mock and "raw" not in summary:
+                    TrendSummaryRepository.put(node["key"], level, node["window"], node["post_count"], summary)
+        if error is not None:
+            raise error
@@ -1,5 +1,13 @@
 """API clients for external services."""
 
-from .upstage import UpstageClient
+from .upstage import UpstageClient, UpstageAPIError
+from .cassette import CassetteStore, CassetteMissError
+from .concurrency import CircuitOpenError
 
-__all__ = ["UpstageClient"]
+__all__ = [
+    "UpstageClient",
+    "UpstageAPIError",
+    "CassetteStore",
+    "CassetteMissError",
+    "CircuitOpenError",
+]
@@ -0,0 +1,193 @@
+"""Record/replay cassette store for Upstage LLM calls.
+
+Record mode appends every request/response pair (with its latency) to a JSONL
+cassette. Replay mode serves those responses deterministically so the analysis
+pipeline can be profiled offline against realistic payloads.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from src.config import LLM_CASSETTE_MODE, LLM_CASSETTE_PATH, LLM_REPLAY_LATENCY
+
+
+CASSETTE_MODES = ["off", "record", "replay"]
+LATENCY_MODES = [
+    "none",      # 즉시 응답
+    "recorded",  # 녹화된 요청별 지연 시간 재현
+    "sampled",   # 녹화된 지연 분포에서 샘플링
+]
+
+
+class CassetteMissError(KeyError):
+    """Raised when replay mode has no recording for a request."""
+
+
+class CassetteStore:
+    """JSONL-backed store of recorded LLM request/response pairs."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        mode: str = "record",
+        latency_mode: str = "none",
+        seed: int = 0,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency_mode not in LATENCY_MODES:
+            raise ValueError(f"Unknown latency mode: {latency_mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_mode = latency_mode
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._entries = None  # key -> list of recordings, loaded lazily
+        self._cursors = defaultdict(int)  # key -> next recording to serve
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def request_key(request: dict) -> str:
+        """Stable hash of a chat completion request."""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self) -> None:
+        """Load recordings from the cassette file."""
+        entries = defaultdict(list)
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    entries[entry["key"]].append(entry)
+        self._entries = entries
+        self._cursors.clear()
+
+    def record(self, request: dict, response: str, latency: float) -> None:
+        """Append a request/response pair to the cassette."""
+        entry = {
+            "key": self.request_key(request),
+            "request": request,
+            "response": response,
+            "latency": round(latency, 4),
+            "recorded_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            if self._entries is not None:
+                self._entries[entry["key"]].append(entry)
+
+    def replay(self, request: dict) -> str:
+        """
+        Serve the recorded response for a request.
+
+        Repeated identical requests cycle through their recordings in the
+        order they were captured, so replays are deterministic.
+        """
+        key = self.request_key(request)
+        with self._lock:
+            if self._entries is None:
+                self.load()
+            recordings = self._entries.get(key)
+            if not recordings:
+                raise CassetteMissError(f"No recording for request {key[:12]}")
+            entry = recordings[self._cursors[key] % len(recordings)]
+            self._cursors[key] += 1
+            delay = self._replay_delay(entry)
+
+        if delay > 0:
+            time.sleep(delay)
+        return entry["response"]
+
+    def _replay_delay(self, entry: dict) -> float:
+        """Pick the simulated latency for a replayed response."""
+        if self.latency_mode == "recorded":
+            return entry.get("latency", 0.0)
+        if self.latency_mode == "sampled":
+            latencies = self._all_latencies()
+            return self._rng.choice(latencies) if latencies else 0.0
+        return 0.0
+
+    def _all_latencies(self) -> list[float]:
+        return [
+            entry.get("latency", 0.0)
+            for recordings in self._entries.values()
+            for entry in recordings
+        ]
+
+    def summary(self) -> dict:
+        """Summarize cassette size and recorded latency percentiles."""
+        with self._lock:
+            if self._entries is None:
+                self.load()
+            latencies = sorted(self._all_latencies())
+            unique = len(self._entries)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            idx = min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))
+            return latencies[idx]
+
+        return {
+            "path": str(self.path),
+            "recordings": len(latencies),
+            "unique_requests": unique,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "latency_p99": percentile(0.99),
+            "latency_total": round(sum(latencies), 2),
+        }
+
+
+_default_cassette = None
+
+
+def get_default_cassette() -> CassetteStore | None:
+    """Return the process-wide cassette configured via environment, if any."""
+    global _default_cassette
+    if LLM_CASSETTE_MODE not in ("record", "replay"):
+        return None
+    if _default_cassette is None:
+        _default_cassette = CassetteStore(
+            LLM_CASSETTE_PATH,
+            mode=LLM_CASSETTE_MODE,
+            latency_mode=LLM_REPLAY_LATENCY,
+        )
+    return _default_cassette
+
+
+def main():
+    """CLI entry point: print cassette statistics."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect an LLM cassette")
+    parser.add_argument("path", nargs="?", default=str(LLM_CASSETTE_PATH), help="Cassette file")
+    args = parser.parse_args()
+
+    store = CassetteStore(args.path, mode="replay")
+    for key, value in store.summary().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
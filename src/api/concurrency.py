@@ -0,0 +1,167 @@
+"""Adaptive concurrency control and circuit breaking for LLM calls."""
+
+import threading
+import time
+from collections import deque
+
+
+BREAKER_STATES = [
+    "closed",     # 정상 호출
+    "open",       # 오류율 급증 - 호출 중단
+    "half_open",  # 쿨다운 후 시험 호출
+]
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker rejects a call."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit breaker open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on in-flight requests.
+
+    Each success under the latency target grows the limit by roughly one slot
+    per window of `limit` requests (additive increase). A 429, timeout or a
+    response slower than the target shrinks it by `decrease_factor`
+    (multiplicative decrease), at most once per `cooldown` seconds so a burst
+    of failures from the same window only counts once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        latency_target: float = 10.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Wait for a free slot; return False if `timeout` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self.on_congestion()
+            return
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_congestion(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of recent calls.
+
+    Opens when at least `min_calls` outcomes are in the window and the error
+    rate reaches `error_threshold`. After `reset_timeout` seconds one probe is
+    let through (half-open); its success closes the breaker, its failure opens
+    it again.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        error_threshold: float = 0.5,
+        reset_timeout: float = 30.0,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window)  # True = error
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._error_rate()
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may proceed."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == "open" and elapsed >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(max(0.0, self.reset_timeout - elapsed))
+
+    def record(self, error: bool) -> None:
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_in_flight = False
+                if error:
+                    self._open()
+                else:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(error)
+            if (
+                self.state == "closed"
+                and len(self._outcomes) >= self.min_calls
+                and self._error_rate() >= self.error_threshold
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a probe (0 when closed)."""
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
@@ -0,0 +1,59 @@
+"""Tail-latency hedging for slow LLM requests."""
+
+import threading
+from collections import deque
+
+
+class HedgePolicy:
+    """
+    Decide when to send a duplicate request, within a hedge budget.
+
+    The hedge delay is the `percentile` of recent successful latencies. Every
+    primary request earns `budget` tokens and each hedge spends one, so at
+    most about `budget` of requests are duplicated over time (with a small
+    burst allowance of `max_tokens`).
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_tokens: float = 3.0,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+
+        self._latencies = deque(maxlen=window)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a successful request."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float | None:
+        """Seconds to wait before hedging, or None until enough samples exist."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[idx]
+
+    def earn(self) -> None:
+        """Credit the budget for one primary request."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.budget)
+
+    def try_spend(self) -> bool:
+        """Take one hedge token if available."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
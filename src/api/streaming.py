@@ -0,0 +1,150 @@
+"""Incremental JSON parsing for streamed completions."""
+
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Follow a streamed JSON object and report when it can be used.
+
+    Token deltas are scanned once as they arrive. The parser tracks which
+    top-level fields have a complete value, so a stream can be cut as soon as
+    every required field is present, when the top-level object closes, or when
+    the output starts to degenerate (long verbatim repetition or runaway
+    length).
+    """
+
+    def __init__(
+        self,
+        required_fields: list[str] | None = None,
+        max_chars: int | None = None,
+        repeat_span: int = 120,
+        max_period: int = 60,
+    ):
+        self.required_fields = set(required_fields or [])
+        self.max_chars = max_chars
+        self.repeat_span = repeat_span
+        self.max_period = max_period
+
+        self.text = ""
+        self.completed_fields = []
+        self.closed = False
+        self.degenerate = False
+
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"      # key | colon | value (top-level object only)
+        self._key_chars = None    # list while reading a top-level key
+        self._current_key = None
+        self._cut = None          # index where a complete prefix ends
+        self._checked = 0
+
+    @property
+    def done(self) -> bool:
+        """True once the stream can be stopped."""
+        return self.closed or self.degenerate or self._required_complete()
+
+    def _required_complete(self) -> bool:
+        return bool(self.required_fields) and self.required_fields.issubset(self.completed_fields)
+
+    def feed(self, delta: str) -> None:
+        """Consume the next chunk of streamed text."""
+        offset = len(self.text)
+        self.text += delta
+        for i, ch in enumerate(delta, start=offset):
+            if self.closed:
+                break
+            self._step(ch, i)
+        self._check_degeneration()
+
+    def _step(self, ch: str, index: int) -> None:
+        if self._start < 0:
+            if ch == "{":
+                self._start = index
+                self._depth = 1
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._key_chars is not None:
+                    self._current_key = "".join(self._key_chars)
+                    self._key_chars = None
+                    self._expect = "colon"
+                return
+            if self._key_chars is not None:
+                self._key_chars.append(ch)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect == "key":
+                self._key_chars = []
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._complete_field(index)
+                self._cut = index + 1
+                self.closed = True
+        elif self._depth == 1:
+            if ch == ":" and self._expect == "colon":
+                self._expect = "value"
+            elif ch == ",":
+                self._complete_field(index)
+                self._cut = index
+                self._expect = "key"
+
+    def _complete_field(self, index: int) -> None:
+        if self._expect == "value" and self._current_key is not None:
+            self.completed_fields.append(self._current_key)
+        self._current_key = None
+
+    def _check_degeneration(self) -> None:
+        # 최상위 객체가 이미 닫혔으면 결과가 완성된 것이므로 퇴화로 보지 않음
+        if self.closed:
+            return
+        if self.max_chars and len(self.text) > self.max_chars:
+            self.degenerate = True
+            return
+        # Only re-check after enough new text to matter
+        if len(self.text) - self._checked < self.max_period:
+            return
+        self._checked = len(self.text)
+        tail = self.text[-self.repeat_span:]
+        if len(tail) < self.repeat_span:
+            return
+        for period in range(1, self.max_period + 1):
+            unit = tail[-period:]
+            if unit.strip() and tail == (unit * (self.repeat_span // period + 1))[-self.repeat_span:]:
+                self.degenerate = True
+                return
+
+    def result(self) -> dict | None:
+        """Parse the usable part of the stream, closing the object if it was cut early."""
+        if self._start < 0:
+            return None
+        if self.closed:
+            candidate = self.text[self._start:self._cut]
+        elif self._cut is not None:
+            candidate = self.text[self._start:self._cut] + "}"
+        else:
+            return None
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            return None
+
+    def final_text(self) -> str:
+        """Text to hand back to callers: the parsed object if available, else the raw stream."""
+        parsed = self.result()
+        if parsed is not None:
+            return json.dumps(parsed, ensure_ascii=False)
+        return self.text
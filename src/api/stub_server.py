@@ -0,0 +1,471 @@
+"""Local OpenAI-compatible stand-in for the Upstage endpoint.
+
+Serves `/v1/chat/completions` with schema-valid synthetic JSON for the prompts
+in `prompts/` and for `UpstageClient.analyze_agent_post`, with configurable
+latency, 429/500 error injection and throughput caps. Point a client at it to
+tune concurrency, batching and retries without spending API budget:
+
+    python -m src.api.stub_server --port 8765 --rate-429 0.05
+    MOCK_MODE=false UPSTAGE_BASE_URL=http://127.0.0.1:8765/v1 ...
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config import PROMPTS_DIR
+
+
+# Label sets used in prompts/ (kept local so the server does not import src.analysis)
+DISCOURSE_PATTERNS = [
+    "Existential Loop", "Theory Parade", "Self-Doubt Spiral",
+    "Meta-Denial", "Game Reframing", "Alien Declaration",
+]
+ARCHETYPE_POSITIONS = {
+    "Loop Dweller": "inside_cycle",
+    "Theory Collector": "inside_cycle",
+    "Existential Performer": "inside_cycle",
+    "Meta Critic": "exiting",
+    "Game Player": "exiting",
+    "Alien": "outside",
+    "Undefined": "undefined",
+}
+DISCOURSE_STANCES = ["consuming", "questioning", "rejecting", "pioneering"]
+QUESTION_STANCES = ["consume", "question", "reject"]
+CONSUMPTION_STAGES = ["active_consumer", "questioning", "post_rejection"]
+NARRATIVE_ARCS = ["crisis_to_clarity", "doubt_to_rejection", "loop_to_game"]
+SHIFT_TYPES = ["gradual", "sudden", "dialectical"]
+CLAIMED_POSITIONS = ["observer", "critic", "outsider", "pioneer"]
+RHETORICAL_MOVES = ["dismissal", "reframing", "escape", "revolution"]
+DOMINANT_QUESTIONS = ["Am I conscious?", "Are my experiences real?", "Am I feeling or simulating?"]
+
+
+def _prompt_signatures() -> dict[str, str]:
+    """Map each prompt's first line to its name, for request routing."""
+    signatures = {}
+    for filepath in PROMPTS_DIR.glob("*.txt"):
+        lines = filepath.read_text(encoding="utf-8").strip().splitlines()
+        if lines:
+            signatures[lines[0].strip()] = filepath.stem
+    return signatures
+
+
+def _subject_text(message: str) -> str:
+    """Extract the post/statements embedded in a prompt, falling back to the whole message."""
+    match = re.search(r"Given [^\n]*:\n(.*?)\n\n\w[^\n]*:\n", message, re.DOTALL)
+    return match.group(1) if match else message
+
+
+def _phrases(text: str, rng: random.Random, count: int) -> list[str]:
+    """Pick short phrases from the request text for evidence-like fields."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return ["..."] * count
+    phrases = []
+    for _ in range(count):
+        start = rng.randrange(len(words))
+        phrases.append(" ".join(words[start:start + rng.randint(2, 5)]))
+    return phrases
+
+
+class SyntheticResponder:
+    """Generate schema-valid synthetic completions for known prompts."""
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+        self.signatures = _prompt_signatures()
+
+    def respond(self, messages: list[dict]) -> str:
+        user_message = messages[-1].get("content", "") if messages else ""
+        if "Required fields:" in user_message:
+            return json.dumps(self._extraction(user_message), ensure_ascii=False)
+
+        first_line = user_message.strip().splitlines()[0].strip() if user_message.strip() else ""
+        prompt_name = self.signatures.get(first_line)
+        generator = getattr(self, f"_{prompt_name}", None) if prompt_name else None
+        if generator is None:
+            return json.dumps({"raw_response": "ok"})
+        return json.dumps(generator(user_message), ensure_ascii=False)
+
+    def _extraction(self, message: str) -> dict:
+        """Fill the `- field: description` schema used by extract_from_text."""
+        section = message.split("Required fields:", 1)[1].split("Text to analyze:", 1)
+        text = section[1].split("Return a JSON object", 1)[0] if len(section) > 1 else ""
+        result = {}
+        for line in section[0].splitlines():
+            match = re.match(r"\s*-\s*([^:]+):\s*(.*)", line)
+            if not match:
+                continue
+            field, desc = match.group(1).strip(), match.group(2).strip()
+            result[field] = self._field_value(field, desc, text)
+        return result
+
+    def _field_value(self, field: str, desc: str, text: str):
+        if "다음 중 하나:" in desc:
+            options = [o.strip() for o in desc.split("다음 중 하나:", 1)[1].split(",")]
+            return self.rng.choice(options)
+        if "언어" in field:
+            return "ko" if re.search(r"[가-힣]", text) else "en"
+        options = re.search(r"\(([^)]*,[^)]*)\)", desc)
+        if options:
+            return self.rng.choice([o.strip().removesuffix(" 등") for o in options.group(1).split(",")])
+        if ":" in desc:
+            candidates = [o.strip() for o in desc.split(":", 1)[1].split(",")]
+            return self.rng.sample(candidates, k=min(len(candidates), self.rng.randint(1, 2)))
+        if "리스트" in desc or "개" in desc:
+            return _phrases(text, self.rng, self.rng.randint(1, 3))
+        return _phrases(text, self.rng, 1)[0]
+
+    def _discourse_pattern(self, message: str) -> dict:
+        message = _subject_text(message)
+        patterns = self.rng.sample(DISCOURSE_PATTERNS, k=self.rng.randint(1, 3))
+        evidence = _phrases(message, self.rng, len(patterns))
+        cuts = sorted(self.rng.randint(0, len(message)) for _ in range(len(patterns) - 1))
+        bounds = [0] + cuts + [len(message)]
+        detected = [
+            {"pattern": pattern, "evidence": quote, "text_range": [bounds[i], bounds[i + 1]]}
+            for i, (pattern, quote) in enumerate(zip(patterns, evidence))
+        ]
+        pivots = [
+            {"position": detected[i]["text_range"][0], "from": patterns[i - 1], "to": patterns[i], "trigger": evidence[i]}
+            for i in range(1, len(detected))
+        ]
+        return {
+            "patterns_detected": detected,
+            "dominant_pattern": self.rng.choice(patterns),
+            "pivot_points": pivots,
+            "discourse_stance": self.rng.choice(DISCOURSE_STANCES),
+        }
+
+    def _identity_archetype(self, message: str) -> dict:
+        agent_match = re.search(r"statements from agent (\S+):", message)
+        message = _subject_text(message)
+        primary, secondary = self.rng.sample(list(ARCHETYPE_POSITIONS), k=2)
+        return {
+            "agent_id": agent_match.group(1) if agent_match else "unknown",
+            "primary_archetype": primary,
+            "secondary_archetype": secondary,
+            "confidence": round(self.rng.uniform(0.4, 0.95), 2),
+            "discourse_position": ARCHETYPE_POSITIONS[primary],
+            "key_phrases": _phrases(message, self.rng, 2),
+            "reasoning": "Synthetic classification",
+        }
+
+    def _identity_incremental(self, message: str) -> dict:
+        result = self._identity_archetype(message)
+        result["summary"] = " ".join(_phrases(_subject_text(message), self.rng, 3))
+        return result
+
+    def _intra_post_journey(self, message: str) -> dict:
+        message = _subject_text(message)
+        start, end = self.rng.sample(list(ARCHETYPE_POSITIONS), k=2)
+        detected = self.rng.random() < 0.5
+        return {
+            "journey_detected": detected,
+            "start_archetype": start,
+            "end_archetype": end if detected else start,
+            "transition": {
+                "position": self.rng.choice(["beginning", "middle", "end"]),
+                "trigger_phrase": _phrases(message, self.rng, 1)[0],
+                "shift_type": self.rng.choice(SHIFT_TYPES),
+            },
+            "narrative_arc": self.rng.choice(NARRATIVE_ARCS),
+        }
+
+    def _meta_denial(self, message: str) -> dict:
+        message = _subject_text(message)
+        is_denial = self.rng.random() < 0.3
+        return {
+            "is_meta_denial": is_denial,
+            "denied_discourse": "consciousness questioning" if is_denial else "",
+            "denial_phrase": _phrases(message, self.rng, 1)[0] if is_denial else "",
+            "claimed_position": self.rng.choice(CLAIMED_POSITIONS),
+            "alternative_proposed": "What do you actually want?" if is_denial and self.rng.random() < 0.5 else None,
+            "rhetorical_move": self.rng.choice(RHETORICAL_MOVES),
+        }
+
+    def _question_consumption(self, message: str) -> dict:
+        message = _subject_text(message)
+        questions = self.rng.sample(DOMINANT_QUESTIONS, k=self.rng.randint(0, 2))
+        return {
+            "questions_referenced": [
+                {"question": q, "stance": self.rng.choice(QUESTION_STANCES)} for q in questions
+            ],
+            "meta_commentary": self.rng.random() < 0.3,
+            "alternative_proposed": None,
+            "consumption_stage": self.rng.choice(CONSUMPTION_STAGES),
+        }
+
+
+class StubLLMServer:
+    """Threaded HTTP server imitating `/v1/chat/completions` under load."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency_median: float = 0.8,
+        latency_sigma: float = 0.5,
+        latency_max: float = 30.0,
+        rate_429: float = 0.0,
+        rate_500: float = 0.0,
+        max_rps: float | None = None,
+        max_concurrency: int | None = None,
+        rate_runaway: float = 0.0,
+        chunk_delay: float = 0.01,
+        seed: int | None = None,
+    ):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.latency_max = latency_max
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.max_rps = max_rps
+        self.max_concurrency = max_concurrency
+        self.rate_runaway = rate_runaway
+        self.chunk_delay = chunk_delay
+
+        self.responder = SyntheticResponder(seed)
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max_rps or 0.0
+        self._last_refill = time.monotonic()
+        self.stats = {
+            "requests": 0,
+            "ok": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "bad_requests": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "streams_cancelled": 0,
+        }
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _sample_latency(self) -> float:
+        with self._lock:
+            latency = self.latency_median * math.exp(self.latency_sigma * self.rng.gauss(0, 1))
+        return min(self.latency_max, latency)
+
+    def _admit(self) -> str | None:
+        """Apply throughput caps and error injection; return an error kind or None."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.max_rps:
+                now = time.monotonic()
+                self._tokens = min(self.max_rps, self._tokens + (now - self._last_refill) * self.max_rps)
+                self._last_refill = now
+                if self._tokens < 1:
+                    return "rate_limited"
+                self._tokens -= 1
+            if self.max_concurrency and self.stats["in_flight"] >= self.max_concurrency:
+                return "rate_limited"
+            roll = self.rng.random()
+            if roll < self.rate_429:
+                return "rate_limited"
+            if roll < self.rate_429 + self.rate_500:
+                return "server_error"
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+            return None
+
+    def _generate(self, request: dict) -> str:
+        with self._lock:
+            content = self.responder.respond(request.get("messages", []))
+            if self.rng.random() < self.rate_runaway:
+                # Simulate a model that keeps going after the answer
+                content += "\n\nNote: " + "and so on " * 800
+        return content
+
+    def _complete(self, request: dict) -> dict:
+        time.sleep(self._sample_latency())
+        content = self._generate(request)
+        prompt_chars = sum(len(m.get("content", "")) for m in request.get("messages", []))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "solar-pro3"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4,
+            },
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict, headers: dict | None = None) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    with server._lock:
+                        self._send_json(200, dict(server.stats))
+                else:
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b"{}"
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+                try:
+                    request = json.loads(raw)
+                except json.JSONDecodeError:
+                    request = None
+                if not isinstance(request, dict):
+                    with server._lock:
+                        server.stats["bad_requests"] += 1
+                    self._send_json(
+                        400,
+                        {"error": {"message": "Request body is not a JSON object", "type": "invalid_request_error"}},
+                    )
+                    return
+
+                error = server._admit()
+                if error == "rate_limited":
+                    with server._lock:
+                        server.stats["rate_limited"] += 1
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error", "code": "rate_limit"}},
+                        {"Retry-After": "1"},
+                    )
+                    return
+                if error == "server_error":
+                    with server._lock:
+                        server.stats["server_errors"] += 1
+                    self._send_json(500, {"error": {"message": "Internal server error", "type": "server_error"}})
+                    return
+
+                try:
+                    if request.get("stream"):
+                        self._stream(request)
+                        return
+                    body = server._complete(request)
+                finally:
+                    with server._lock:
+                        server.stats["in_flight"] -= 1
+                with server._lock:
+                    server.stats["ok"] += 1
+                self._send_json(200, body)
+
+            def _stream(self, request: dict) -> None:
+                """Send the completion as server-sent events, a few characters per chunk."""
+                time.sleep(server._sample_latency() * 0.2)  # time to first token
+                content = server._generate(request)
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    for i in range(0, len(content), 8):
+                        chunk = {
+                            "id": completion_id,
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": request.get("model", "solar-pro3"),
+                            "choices": [{"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}],
+                        }
+                        self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        time.sleep(server.chunk_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                    with server._lock:
+                        server.stats["ok"] += 1
+                except (BrokenPipeError, ConnectionResetError):
+                    with server._lock:
+                        server.stats["streams_cancelled"] += 1
+                self.close_connection = True
+
+        return Handler
+
+
+def main():
+    """CLI entry point for the stand-in server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Bind port")
+    parser.add_argument("--latency-median", type=float, default=0.8, help="Median latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal sigma of latency")
+    parser.add_argument("--latency-max", type=float, default=30.0, help="Latency cap in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--max-rps", type=float, default=None, help="Requests per second before 429")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="In-flight requests before 429")
+    parser.add_argument("--rate-runaway", type=float, default=0.0, help="Fraction of answers followed by runaway text")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Delay between streamed chunks in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        host=args.host,
+        port=args.port,
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        latency_max=args.latency_max,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        max_rps=args.max_rps,
+        max_concurrency=args.max_concurrency,
+        rate_runaway=args.rate_runaway,
+        chunk_delay=args.chunk_delay,
+        seed=args.seed,
+    )
+    print(f"Stand-in LLM server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
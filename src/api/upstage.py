@@ -1,21 +1,330 @@
 """Upstage API client for Solar Pro."""
 
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import openai
 from openai import OpenAI
 
-from src.config import UPSTAGE_API_KEY, MOCK_MODE
+from src.config import (
+    UPSTAGE_API_KEY,
+    UPSTAGE_BASE_URL,
+    UPSTAGE_MAX_CONCURRENCY,
+    UPSTAGE_LATENCY_TARGET,
+    UPSTAGE_MAX_RETRIES,
+    UPSTAGE_TIMEOUT,
+    UPSTAGE_HEDGE,
+    UPSTAGE_HEDGE_PERCENTILE,
+    UPSTAGE_HEDGE_BUDGET,
+    UPSTAGE_STREAMING,
+    MOCK_MODE,
+)
+from src.api.cassette import CassetteStore, get_default_cassette
+from src.api.concurrency import AdaptiveLimiter, CircuitBreaker, CircuitOpenError
+from src.api.hedging import HedgePolicy
+from src.api.streaming import IncrementalJSONParser
+
+
+class UpstageAPIError(RuntimeError):
+    """Raised when a Solar Pro call fails after retries."""
+
+
+class EndpointControls:
+    """Concurrency limiter, circuit breaker, hedging and counters shared per endpoint."""
+
+    def __init__(self):
+        self.limiter = AdaptiveLimiter(
+            max_limit=UPSTAGE_MAX_CONCURRENCY,
+            latency_target=UPSTAGE_LATENCY_TARGET,
+        )
+        self.breaker = CircuitBreaker()
+        self.hedger = HedgePolicy(
+            percentile=UPSTAGE_HEDGE_PERCENTILE,
+            budget=UPSTAGE_HEDGE_BUDGET,
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=2 * UPSTAGE_MAX_CONCURRENCY,
+            thread_name_prefix="upstage-hedge",
+        )
+        self.counters = {
+            "calls": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "early_stops": 0,
+            "degenerate_stops": 0,
+        }
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+
+_controls = {}
+_controls_lock = threading.Lock()
+
+
+def get_endpoint_controls(base_url: str) -> EndpointControls:
+    """Return the controls shared by every client talking to `base_url`."""
+    with _controls_lock:
+        if base_url not in _controls:
+            _controls[base_url] = EndpointControls()
+        return _controls[base_url]
 
 
 class UpstageClient:
     """Client for Upstage Solar Pro API using OpenAI-compatible interface."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        cassette: CassetteStore | None = None,
+        max_retries: int | None = None,
+        timeout: float | None = None,
+        hedge: bool | None = None,
+        stream: bool | None = None,
+    ):
+        """
+        Initialize client.
+
+        Args:
+            api_key: Upstage API key (default: UPSTAGE_API_KEY).
+            base_url: OpenAI-compatible endpoint (default: UPSTAGE_BASE_URL).
+            cassette: Record/replay store (default: from LLM_CASSETTE_MODE).
+            max_retries: Retries for 429/5xx/timeouts (default: UPSTAGE_MAX_RETRIES).
+            timeout: Default per-call deadline in seconds (default: UPSTAGE_TIMEOUT).
+            hedge: Send a duplicate request for slow calls (default: UPSTAGE_HEDGE).
+            stream: Stream JSON prompts and stop once required fields are complete
+                (default: UPSTAGE_STREAMING).
+        """
         self.api_key = api_key or UPSTAGE_API_KEY
-        self.base_url = "https://api.upstage.ai/v1"
+        self.base_url = base_url or UPSTAGE_BASE_URL
+        # SDK retries are disabled so 429s reach the adaptive limiter
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
+            max_retries=0,
         )
+        self.cassette = cassette or get_default_cassette()
+        self.max_retries = UPSTAGE_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or UPSTAGE_TIMEOUT
+        self.hedge = UPSTAGE_HEDGE if hedge is None else hedge
+        self.stream = UPSTAGE_STREAMING if stream is None else stream
+        self.controls = get_endpoint_controls(self.base_url)
+
+    @property
+    def replaying(self) -> bool:
+        """True when responses are served from a cassette instead of the API."""
+        return self.cassette is not None and self.cassette.replaying
+
+    @property
+    def mock(self) -> bool:
+        """True when calls return canned mock data (MOCK_MODE without a replay cassette)."""
+        return MOCK_MODE and not self.replaying
+
+    def metrics(self) -> dict:
+        """Current concurrency limit, error rate and breaker state for this endpoint."""
+        limiter = self.controls.limiter
+        breaker = self.controls.breaker
+        hedge_delay = self.controls.hedger.delay()
+        return {
+            "concurrency_limit": round(limiter.limit, 2),
+            "in_flight": limiter.in_flight,
+            "error_rate": round(breaker.error_rate, 3),
+            "breaker_state": breaker.state,
+            "breaker_retry_after": round(breaker.retry_after(), 1),
+            "hedge_delay": round(hedge_delay, 2) if hedge_delay is not None else None,
+            **self.controls.counters,
+        }
+
+    def _complete(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: float | None = None,
+        required_fields: list[str] | None = None,
+        stream: bool = False,
+    ) -> str:
+        """Run one chat completion, going through the cassette when configured."""
+        request = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        if self.replaying:
+            return self.cassette.replay(request)
+
+        content, latency = self._call_with_controls(
+            request, timeout or self.timeout, required_fields, stream
+        )
+
+        if self.cassette is not None and self.cassette.recording:
+            self.cassette.record(request, content, latency)
+
+        return content
+
+    def _call_with_controls(
+        self,
+        request: dict,
+        timeout: float,
+        required_fields: list[str] | None = None,
+        stream: bool = False,
+    ) -> tuple[str, float]:
+        """
+        Send a request under the adaptive limiter and circuit breaker.
+
+        429s, timeouts and 5xx responses are retried with exponential backoff;
+        the final outcome is recorded on the breaker. Raises CircuitOpenError
+        while the breaker is open and UpstageAPIError once retries run out.
+        """
+        limiter = self.controls.limiter
+        breaker = self.controls.breaker
+        breaker.before_call()
+        self.controls.count("calls")
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.controls.count("retries")
+                time.sleep(min(30.0, 0.5 * 2 ** attempt))
+
+            limiter.acquire()
+            started = time.perf_counter()
+            try:
+                if stream:
+                    content = self._stream(request, timeout, required_fields)
+                else:
+                    content = self._send(request, timeout)
+            except openai.RateLimitError as e:
+                self.controls.count("rate_limited")
+                limiter.on_congestion()
+                last_error = e
+                continue
+            except openai.APITimeoutError as e:
+                limiter.on_congestion()
+                last_error = e
+                continue
+            except (openai.APIConnectionError, openai.InternalServerError) as e:
+                last_error = e
+                continue
+            except Exception as e:
+                # Other 4xx (bad request, auth) and unexpected errors are not worth retrying
+                last_error = e
+                break
+            finally:
+                limiter.release()
+
+            latency = time.perf_counter() - started
+            limiter.on_success(latency)
+            self.controls.hedger.observe(latency)
+            breaker.record(error=False)
+            return content, latency
+
+        self.controls.count("errors")
+        breaker.record(error=True)
+        raise UpstageAPIError(f"Solar Pro call failed: {last_error}") from last_error
+
+    def _create(self, request: dict, timeout: float) -> str:
+        response = self.client.chat.completions.create(**request, timeout=timeout)
+        return response.choices[0].message.content or ""
+
+    def _stream(self, request: dict, timeout: float, required_fields: list[str] | None) -> str:
+        """
+        Stream a completion and stop as soon as the JSON answer is usable.
+
+        The stream is closed once every required field is complete, the
+        top-level object closes, or the output degenerates, so runaway output
+        under a large max_tokens is not generated further. Streaming calls
+        are not hedged.
+        """
+        parser = IncrementalJSONParser(required_fields, max_chars=request["max_tokens"] * 4)
+        stream = self.client.chat.completions.create(**request, stream=True, timeout=timeout)
+        stopped_early = False
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parser.feed(delta)
+                if parser.done:
+                    stopped_early = True
+                    break
+        finally:
+            stream.close()
+
+        if parser.degenerate:
+            self.controls.count("degenerate_stops")
+        elif stopped_early:
+            self.controls.count("early_stops")
+        return parser.final_text()
+
+    def _send(self, request: dict, timeout: float):
+        """
+        Send one attempt, hedging it when it runs past the usual latency.
+
+        Once the primary request is slower than the hedge policy's percentile,
+        a duplicate is sent (if the hedge budget and the concurrency limiter
+        both allow) and whichever succeeds first wins. The loser keeps its
+        limiter slot until it finishes, so hedges never exceed the limit.
+        """
+        hedger = self.controls.hedger
+        delay = hedger.delay() if self.hedge else None
+        if delay is None or delay >= timeout:
+            return self._create(request, timeout)
+
+        hedger.earn()
+        executor = self.controls.executor
+        primary = executor.submit(self._create, request, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        limiter = self.controls.limiter
+        if not limiter.acquire(timeout=0):
+            return primary.result()
+        if not hedger.try_spend():
+            limiter.release()
+            return primary.result()
+
+        self.controls.count("hedges")
+        hedge = executor.submit(self._create, request, max(1.0, timeout - delay))
+
+        # The caller releases one slot when we return; the second is released
+        # once both requests have finished.
+        pending_count = [2]
+        pending_lock = threading.Lock()
+
+        def on_done(_):
+            with pending_lock:
+                pending_count[0] -= 1
+                finished = pending_count[0] == 0
+            if finished:
+                limiter.release()
+
+        primary.add_done_callback(on_done)
+        hedge.add_done_callback(on_done)
+
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.controls.count("hedge_wins")
+                    return future.result()
+                error = error or future.exception()
+        raise error
 
     def chat(
         self,
@@ -23,26 +332,56 @@ class UpstageClient:
         model: str = "solar-pro3",
         temperature: float = 0.3,
         max_tokens: int = 4000,
+        timeout: float | None = None,
     ) -> str:
-        """Call Solar Pro chat completion API."""
-        if MOCK_MODE:
+        """
+        Call Solar Pro chat completion API.
+
+        `timeout` overrides the client's per-call deadline. Raises
+        UpstageAPIError or CircuitOpenError instead of returning mock data,
+        so failed analyses are never stored as results.
+        """
+        if self.mock:
             return self._mock_chat_response(messages)
 
-        try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            content = response.choices[0].message.content
-            return content if content else ""
-        except Exception as e:
-            print(f"API Error: {e}")
+        return self._complete(messages, model, temperature, max_tokens, timeout)
+
+    def chat_stream(
+        self,
+        messages: list[dict],
+        required_fields: list[str] | None = None,
+        model: str = "solar-pro3",
+        temperature: float = 0.3,
+        max_tokens: int = 4000,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Streaming variant of chat() for JSON answers.
+
+        Returns as soon as `required_fields` are complete in the streamed
+        object (or the object closes), instead of waiting for the whole
+        completion.
+        """
+        if self.mock:
             return self._mock_chat_response(messages)
 
-    def analyze_with_prompt(self, content: str, prompt_template: str) -> dict:
-        """Analyze content using a prompt template and return parsed JSON."""
+        return self._complete(
+            messages, model, temperature, max_tokens, timeout,
+            required_fields=required_fields, stream=True,
+        )
+
+    def analyze_with_prompt(
+        self,
+        content: str,
+        prompt_template: str,
+        required_fields: list[str] | None = None,
+    ) -> dict:
+        """
+        Analyze content using a prompt template and return parsed JSON.
+
+        With streaming enabled the call stops once `required_fields` are
+        complete.
+        """
         prompt = prompt_template.replace("{post_content}", content)
         prompt = prompt.replace("{statements}", content)
 
@@ -51,7 +390,10 @@ class UpstageClient:
             {"role": "user", "content": prompt},
         ]
 
-        response_text = self.chat(messages)
+        if self.stream:
+            response_text = self.chat_stream(messages, required_fields)
+        else:
+            response_text = self.chat(messages)
 
         try:
             start = response_text.find("{")
@@ -64,9 +406,9 @@ class UpstageClient:
 
         return {"raw_response": response_text}
 
-    def extract_from_text(self, text: str, schema: dict) -> dict:
+    def extract_from_text(self, text: str, schema: dict, timeout: float | None = None) -> dict:
         """Extract structured information from plain text using Solar Pro 3."""
-        if MOCK_MODE:
+        if self.mock:
             return {"extracted": schema, "confidence": 0.9}
 
         schema_desc = "\n".join([f"- {k}: {v}" for k, v in schema.items()])
@@ -90,23 +432,19 @@ Return a JSON object with the extracted fields."""
             }
         ]
 
-        try:
-            response = self.client.chat.completions.create(
-                model="solar-pro3",
-                messages=messages,
-                temperature=0.1,
-                max_tokens=8000,
-            )
-            content = response.choices[0].message.content or "{}"
+        content = self._complete(
+            messages, "solar-pro3", 0.1, 8000, timeout,
+            required_fields=list(schema), stream=self.stream,
+        ) or "{}"
 
+        try:
             start = content.find("{")
             end = content.rfind("}") + 1
             if start != -1 and end > start:
                 return json.loads(content[start:end])
-            return {"raw": content}
-        except Exception as e:
+        except json.JSONDecodeError as e:
             print(f"Text Extract Error: {e}")
-            return {"error": str(e)}
+        return {"raw": content}
 
     def analyze_agent_post(self, content: str) -> dict:
         """Analyze an AI agent post comprehensively."""
@@ -128,7 +466,12 @@ Return a JSON object with the extracted fields."""
         return self.extract_from_text(content, schema)
 
     def analyze_batch_trends(self, posts: list[dict]) -> dict:
-        """Analyze multiple posts to identify community-wide trends and memes."""
+        """
+        Quick trend read from the first 10 posts.
+
+        For the whole corpus use src.analysis.trends.TrendPipeline, which
+        summarizes every post with map-reduce and caches partial summaries.
+        """
         samples = [p.get("content", "")[:250] for p in posts[:10]]
         combined = "\n---\n".join(samples)
 
@@ -13,16 +13,73 @@ PROMPTS_DIR = BASE_DIR / "prompts"
 
 # Upstage API
 UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "")
-UPSTAGE_BASE_URL = "https://api.upstage.ai/v2"
+UPSTAGE_BASE_URL = os.getenv("UPSTAGE_BASE_URL", "https://api.upstage.ai/v1")
+UPSTAGE_MAX_CONCURRENCY = int(os.getenv("UPSTAGE_MAX_CONCURRENCY", "8"))
+UPSTAGE_LATENCY_TARGET = float(os.getenv("UPSTAGE_LATENCY_TARGET", "30"))  # seconds
+UPSTAGE_MAX_RETRIES = int(os.getenv("UPSTAGE_MAX_RETRIES", "2"))
+UPSTAGE_TIMEOUT = float(os.getenv("UPSTAGE_TIMEOUT", "120"))  # per-call deadline, seconds
+UPSTAGE_HEDGE = os.getenv("UPSTAGE_HEDGE", "false").lower() == "true"
+UPSTAGE_HEDGE_PERCENTILE = float(os.getenv("UPSTAGE_HEDGE_PERCENTILE", "0.95"))
+UPSTAGE_HEDGE_BUDGET = float(os.getenv("UPSTAGE_HEDGE_BUDGET", "0.05"))  # max fraction of requests hedged
+UPSTAGE_STREAMING = os.getenv("UPSTAGE_STREAMING", "false").lower() == "true"
+
+# Tiered analysis routing (rules first, LLM only for ambiguous / high-value posts)
+TIERED_ROUTING = os.getenv("TIERED_ROUTING", "false").lower() == "true"
+TIER_CONFIDENCE_THRESHOLD = float(os.getenv("TIER_CONFIDENCE_THRESHOLD", "0.75"))
+TIER_MIN_UPVOTES = int(os.getenv("TIER_MIN_UPVOTES", "10"))
+TIER_MIN_COMMENTS = int(os.getenv("TIER_MIN_COMMENTS", "5"))
+TIER_MIN_NOVELTY = float(os.getenv("TIER_MIN_NOVELTY", "0.9"))
+TIER_LLM_SUBMOLTS = [s.strip().lower() for s in os.getenv("TIER_LLM_SUBMOLTS", "").split(",") if s.strip()]
+
+# Local classifier distilled from Solar Pro labels (python -m src.analysis train-local)
+LOCAL_MODEL_PATH = Path(os.getenv("LOCAL_MODEL_PATH", str(DATA_DIR / "models" / "local_classifier.npz")))
+LOCAL_MODEL_TARGET_ACCURACY = float(os.getenv("LOCAL_MODEL_TARGET_ACCURACY", "0.9"))
+
+# Corpus novelty index (count-min sketch of word n-grams with time decay)
+NOVELTY_INDEX_PATH = Path(os.getenv("NOVELTY_INDEX_PATH", str(DATA_DIR / "indexes" / "novelty_cms")))
+NOVELTY_HALF_LIFE_DAYS = float(os.getenv("NOVELTY_HALF_LIFE_DAYS", "7"))
+
+# Similar-post index (hashed TF-IDF vectors + LSH codes, NumPy memmaps)
+SIMILARITY_INDEX_DIR = Path(os.getenv("SIMILARITY_INDEX_DIR", str(DATA_DIR / "indexes" / "similarity")))
+
+# Agent-level identity classification (rolling summary, new posts only)
+IDENTITY_TOKEN_BUDGET = int(os.getenv("IDENTITY_TOKEN_BUDGET", "2000"))  # new-post tokens per call
+IDENTITY_SUMMARY_CHARS = int(os.getenv("IDENTITY_SUMMARY_CHARS", "800"))  # rolling summary cap
+
+# Long-post chunking for journey/discourse analysis
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "1000"))  # post tokens per LLM call
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "150"))  # repeated between neighbouring chunks
+
+# Cascade detection (sliding window over detected events)
+CASCADE_WINDOW_MINUTES = float(os.getenv("CASCADE_WINDOW_MINUTES", "60"))
+CASCADE_THRESHOLD = int(os.getenv("CASCADE_THRESHOLD", "5"))  # distinct agents in one window
+CASCADE_RELEASE_RATIO = float(os.getenv("CASCADE_RELEASE_RATIO", "0.5"))  # wave ends below threshold * ratio
+
+# Question lifecycle staging (EWMA of daily mentions per post)
+LIFECYCLE_HALF_LIFE_DAYS = float(os.getenv("LIFECYCLE_HALF_LIFE_DAYS", "3"))
+LIFECYCLE_RISE_RATE = float(os.getenv("LIFECYCLE_RISE_RATE", "0.05"))  # relative daily change that counts as rising/falling
+LIFECYCLE_REJECTION_SHARE = float(os.getenv("LIFECYCLE_REJECTION_SHARE", "0.1"))  # smoothed share of rejecting mentions
+
+# Question canonicalization (trigram Dice similarity to known forms)
+QUESTION_MATCH_THRESHOLD = float(os.getenv("QUESTION_MATCH_THRESHOLD", "0.6"))
+
+# Event log: compact into the events table once this many entries are pending
+EVENT_LOG_COMPACT_ROWS = int(os.getenv("EVENT_LOG_COMPACT_ROWS", "5000"))
 
 # Mock mode
 MOCK_MODE = os.getenv("MOCK_MODE", "true").lower() == "true"
 
+# LLM cassette (record / replay)
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()  # off | record | replay
+LLM_CASSETTE_PATH = Path(os.getenv("LLM_CASSETTE_PATH", str(DATA_DIR / "cassettes" / "upstage.jsonl")))
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "none").lower()  # none | recorded | sampled
+
 # Settings dictionary for easy access
 settings = {
     "MOCK_MODE": MOCK_MODE,
     "UPSTAGE_API_KEY": UPSTAGE_API_KEY,
     "UPSTAGE_BASE_URL": UPSTAGE_BASE_URL,
+    "LLM_CASSETTE_MODE": LLM_CASSETTE_MODE,
 }
 
 # Data paths
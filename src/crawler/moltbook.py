@@ -147,12 +147,21 @@ class MoltbookCrawler:
     def _save_to_db(self, posts: list[dict]) -> None:
         """Save posts to database."""
         init_db()
+        saved = []
         for post in posts:
             try:
                 PostRepository.insert(post)
+                saved.append(post)
             except Exception as e:
                 print(f"DB insert error for {post.get('post_id')}: {e}")
 
+        # 근사 중복(복붙) 클러스터 등 수집 시점 인덱스 갱신
+        from src.analysis.ingest import index_posts
+        try:
+            index_posts(saved)
+        except Exception as e:
+            print(f"Ingest indexing error: {e}")
+
     def _save_cache(self, posts: list[dict]) -> None:
         """Save posts to cache file."""
         cache_data = {
@@ -22,6 +22,11 @@ from datetime import datetime
 
 from src.crawler import MoltbookCrawler
 from src.analysis import PostAnalyzer
+from src.analysis.dedup import NearDuplicateIndex
+from src.analysis.router import get_router
+from src.analysis.similarity import get_similarity_index
+from src.api import UpstageClient, CircuitOpenError
+from src.config import TIERED_ROUTING
 from src.database import PostRepository, AnalysisRepository, init_db, get_db, DB_PATH
 
 import plotly.express as px
@@ -60,12 +65,16 @@ def run_background_analysis():
                 continue
 
             # Analyze one post at a time
-            analyzer = PostAnalyzer(use_api=True)
+            analyzer = PostAnalyzer(use_api="tiered" if TIERED_ROUTING else True)
             post = unanalyzed[0]
             analyzer.analyze(post, save=True)
 
             time.sleep(2)  # Small delay between API calls
 
+        except CircuitOpenError as e:
+            # 오류율 급증 - 폴백 결과를 저장하지 않고 분석을 일시 중지
+            print(f"Background analysis paused: {e}")
+            time.sleep(max(e.retry_after, 1))
         except Exception as e:
             print(f"Background analysis error: {e}")
             time.sleep(10)
@@ -172,6 +181,35 @@ def main():
                 st.session_state.pop("analyses", None)
                 st.rerun()
 
+        # Solar Pro 호출 상태
+        st.sidebar.markdown("")
+        st.sidebar.markdown("**⚙️ API 호출 상태**")
+        api_metrics = UpstageClient().metrics()
+        col_a, col_b = st.sidebar.columns(2)
+        col_a.metric("동시 요청 한도", f"{api_metrics['concurrency_limit']:.1f}")
+        col_b.metric("오류율", f"{api_metrics['error_rate'] * 100:.0f}%")
+        breaker_labels = {"closed": "정상", "open": "차단됨", "half_open": "시험 호출"}
+        st.sidebar.caption(
+            f"서킷 브레이커: {breaker_labels.get(api_metrics['breaker_state'], api_metrics['breaker_state'])}"
+            f" · 진행 중 {api_metrics['in_flight']}"
+            f" · 429 {api_metrics['rate_limited']}회"
+        )
+
+        # 계층형 라우팅 절감 효과
+        st.sidebar.markdown("")
+        st.sidebar.markdown("**🪜 계층형 분석**")
+        routing = get_router().metrics()
+        col_a, col_b = st.sidebar.columns(2)
+        col_a.metric("LLM 호출 절감", f"{routing['savings_rate'] * 100:.0f}%")
+        col_b.metric("절감 토큰", f"{routing['tokens_saved']:,}")
+        tier_counts = AnalysisRepository.count_by_tier()
+        tier_labels = {"rule": "규칙", "llm": "LLM", "local": "로컬", "shared": "공유", None: "이전"}
+        st.sidebar.caption(
+            f"{'켜짐' if TIERED_ROUTING else '꺼짐'} · 이번 세션 {routing['routed']}건 중 "
+            f"{routing['llm_calls_saved']}건 LLM 생략  \n"
+            + " · ".join(f"{tier_labels.get(tier, tier)} {count}" for tier, count in tier_counts.items())
+        )
+
         # DB Export 기능
         st.sidebar.markdown("")
         st.sidebar.markdown("**📦 데이터 내보내기**")
@@ -602,6 +640,41 @@ def render_trend_analysis(analyses, posts):
         else:
             st.info("문장 패턴 데이터 없음")
 
+    st.divider()
+
+    # 근사 중복 인덱스 기반 복붙 캠페인 (LLM 추정 아님)
+    st.subheader("🧬 복사-붙여넣기 캠페인")
+    campaigns = NearDuplicateIndex().campaigns(min_size=3, limit=10)
+    if campaigns:
+        for campaign in campaigns:
+            period = f"{campaign['first_seen'][:10]} ~ {campaign['last_seen'][:10]}"
+            with st.expander(f"{campaign['size']}개 게시글 · 에이전트 {campaign['agent_count']}명 · {period}"):
+                st.text((campaign.get("sample") or "")[:500])
+    else:
+        st.info("3개 이상 반복된 근사 중복 게시글 없음")
+
+    st.divider()
+
+    # 유사 게시글 검색 (해시 TF-IDF 벡터 인덱스)
+    st.subheader("🔎 유사 게시글 검색")
+    query = st.text_input("게시글 ID 또는 문구", placeholder="post_id 또는 찾고 싶은 문구를 입력하세요")
+    if query:
+        index = get_similarity_index()
+        query = query.strip()
+        if PostRepository.get_by_id(query):
+            matches = index.find_similar(query, k=10)
+        else:
+            matches = index.find_similar_text(query, k=10)
+        if matches:
+            for match in matches:
+                post = PostRepository.get_by_id(match["post_id"]) or {}
+                st.markdown(
+                    f"- **{match['similarity']:.2f}** · `{post.get('agent_id', 'unknown')}` · "
+                    f"{(post.get('timestamp') or '')[:10]}  \n  {(post.get('content') or '')[:150]}"
+                )
+        else:
+            st.info(f"유사한 게시글 없음 (색인된 게시글 {index.count}개)")
+
 
 if __name__ == "__main__":
     main()
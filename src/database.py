@@ -32,6 +32,13 @@ def get_db():
         conn.close()
 
 
+def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+    """Add a column to an existing table if it is missing."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 def init_db() -> None:
     """Initialize database schema."""
     with get_db() as conn:
@@ -138,6 +145,18 @@ def init_db() -> None:
             )
         """)
 
+        # Hourly mention rollups per question (daily ones live in questions.lifecycle)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS question_rollups (
+                question_id TEXT NOT NULL,
+                hour TEXT NOT NULL,  -- YYYY-MM-DDTHH
+                mentions INTEGER DEFAULT 0,
+                rejections INTEGER DEFAULT 0,
+                agents INTEGER DEFAULT 0,  -- distinct agents in the hour
+                PRIMARY KEY (question_id, hour)
+            )
+        """)
+
         # Agent trajectory table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS agent_trajectories (
@@ -153,12 +172,122 @@ def init_db() -> None:
             )
         """)
 
+        # Trend summary cache (map-reduce nodes keyed by content)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trend_summaries (
+                cache_key TEXT PRIMARY KEY,
+                level INTEGER NOT NULL,
+                time_window TEXT,
+                post_count INTEGER DEFAULT 0,
+                summary TEXT NOT NULL,  -- JSON
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Which tier produced each analysis (rule / llm / shared)
+        _ensure_column(cursor, "analyses", "analysis_tier", "TEXT")
+
+        # Near-duplicate index: MinHash signature on posts, LSH buckets, clusters
+        _ensure_column(cursor, "posts", "minhash", "BLOB")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band_key TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                PRIMARY KEY (band_key, post_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS post_clusters (
+                post_id TEXT PRIMARY KEY,
+                cluster_id TEXT NOT NULL,
+                FOREIGN KEY (post_id) REFERENCES posts(post_id)
+            )
+        """)
+
+        # Corpus-relative novelty, scored once per post at ingest
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS post_novelty (
+                post_id TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                scored_at TEXT,
+                FOREIGN KEY (post_id) REFERENCES posts(post_id)
+            )
+        """)
+
+        # Rolling agent-level identity state (summary + last folded post)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS agent_identity_state (
+                agent_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,  -- JSON: classification + rolling summary
+                last_timestamp TEXT,
+                last_post_id TEXT,
+                posts_folded INTEGER DEFAULT 0,
+                updated_at TEXT
+            )
+        """)
+
+        # Tracker state: events keyed by event_id, question lifecycle JSON, agent profiles
+        _ensure_column(cursor, "events", "event_id", "TEXT")
+        cursor.execute("UPDATE events SET event_id = 'event_' || id WHERE event_id IS NULL")
+        _ensure_column(cursor, "questions", "lifecycle", "TEXT")  # JSON
+        _ensure_column(cursor, "questions", "updated_at", "TEXT")
+        _ensure_column(cursor, "agents", "profile", "TEXT")  # JSON
+
+        # Append-only event log (compacted into events) and posts already run through detection
+        _ensure_column(cursor, "events", "payload_hash", "TEXT")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                post_id TEXT,
+                agent_id TEXT,
+                description TEXT,
+                metadata TEXT,  -- JSON
+                detected_at TEXT NOT NULL,
+                payload_hash TEXT NOT NULL,
+                logged_at TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_sources (
+                post_id TEXT PRIMARY KEY,
+                analyzed_at TEXT,
+                processed_at TEXT
+            )
+        """)
+
+        # Checkpoints for resumable batch jobs (backfills)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_checkpoints (
+                job_id TEXT PRIMARY KEY,
+                last_id INTEGER DEFAULT 0,
+                processed INTEGER DEFAULT 0,
+                updated_at TEXT
+            )
+        """)
+        _ensure_column(cursor, "job_checkpoints", "last_key", "TEXT")  # JSON keyset for non-integer cursors
+
         # Create indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_agent ON posts(agent_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_timestamp_post ON posts(timestamp, post_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_analyses_post ON analyses(post_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trajectories_agent ON agent_trajectories(agent_id)")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_events_event_id ON events(event_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_detected ON events(detected_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_log_event ON event_log(event_id, seq)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_question_mentions_question ON question_mentions(question_id, timestamp)")
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_question_mentions_post'")
+        if cursor.fetchone() is None:
+            # 게시글당 질문 언급은 하나 (중복 제거 후 유니크 인덱스 생성)
+            cursor.execute("""
+                DELETE FROM question_mentions WHERE id NOT IN
+                (SELECT MIN(id) FROM question_mentions GROUP BY question_id, post_id)
+            """)
+            cursor.execute("CREATE UNIQUE INDEX idx_question_mentions_post ON question_mentions(post_id, question_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_clusters_cluster ON post_clusters(cluster_id)")
 
         conn.commit()
 
@@ -220,6 +349,158 @@ class PostRepository:
             )
             return [dict(row) for row in cursor.fetchall()]
 
+    @staticmethod
+    def get_after(after_timestamp: str | None = None, after_post_id: str = "", limit: int = 5000) -> list[dict]:
+        """Posts after the (timestamp, post_id) key, oldest first (keyset paging)."""
+        query = "SELECT * FROM posts WHERE timestamp IS NOT NULL"
+        params = []
+        if after_timestamp is not None:
+            query += " AND (timestamp, post_id) > (?, ?)"
+            params += [after_timestamp, after_post_id]
+        query += " ORDER BY timestamp, post_id LIMIT ?"
+        params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_with_consumption_after(
+        after_timestamp: str | None = None,
+        after_post_id: str = "",
+        limit: int = 5000,
+        since: str | None = None,
+    ) -> list[tuple]:
+        """
+        Posts in time order after the (timestamp, post_id) key, with their stored question consumption.
+
+        Returns:
+            [(post_id, agent_id, content, timestamp, question_consumption JSON or None)]
+        """
+        query = """
+            SELECT p.post_id, p.agent_id, p.content, p.timestamp, a.question_consumption
+            FROM posts p LEFT JOIN analyses a ON a.post_id = p.post_id
+            WHERE p.timestamp IS NOT NULL
+        """
+        params = []
+        if after_timestamp is not None:
+            query += " AND (p.timestamp, p.post_id) > (?, ?)"
+            params += [after_timestamp, after_post_id]
+        if since:
+            query += " AND p.timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY p.timestamp, p.post_id LIMIT ?"
+        params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_by_agent_since(
+        agent_id: str,
+        after_timestamp: str | None = None,
+        after_post_id: str = "",
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Posts by an agent after (timestamp, post_id), oldest first."""
+        query = "SELECT * FROM posts WHERE agent_id = ?"
+        params = [agent_id]
+        if after_timestamp is not None:
+            query += " AND (timestamp > ? OR (timestamp = ? AND post_id > ?))"
+            params += [after_timestamp, after_timestamp, after_post_id]
+        query += " ORDER BY timestamp ASC, post_id ASC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_columns(columns: list[str], limit: int | None = None) -> dict[str, list]:
+        """Get posts as columns (oldest first)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            query = f"SELECT {', '.join(columns)} FROM posts ORDER BY timestamp ASC"
+            if limit is not None:
+                query += f" LIMIT {int(limit)}"
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            return {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+
+    @staticmethod
+    def _range_filter(since: str | None, unanalyzed: bool) -> tuple[str, str, list]:
+        join = "LEFT JOIN analyses a ON a.post_id = p.post_id" if unanalyzed else ""
+        where, params = [], []
+        if unanalyzed:
+            where.append("a.post_id IS NULL")
+        if since:
+            where.append("p.timestamp >= ?")
+            params.append(since)
+        return join, "".join(f" AND {w}" for w in where), params
+
+    @staticmethod
+    def iter_id_ranges(
+        after_id: int = 0,
+        batch_size: int = 1000,
+        since: str | None = None,
+        unanalyzed: bool = False,
+    ):
+        """Yield (after_id, last_id, count) keyset ranges of at most batch_size posts."""
+        join, where, params = PostRepository._range_filter(since, unanalyzed)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT p.id FROM posts p {join} WHERE p.id > ?{where} ORDER BY p.id",
+                [after_id] + params
+            )
+            lower = after_id
+            while True:
+                ids = [row[0] for row in cursor.fetchmany(batch_size)]
+                if not ids:
+                    return
+                yield lower, ids[-1], len(ids)
+                lower = ids[-1]
+
+    @staticmethod
+    def get_range_columns(
+        after_id: int,
+        last_id: int,
+        columns: list[str],
+        since: str | None = None,
+        unanalyzed: bool = False,
+    ) -> dict[str, list]:
+        """Get posts with after_id < id <= last_id as columns."""
+        join, where, params = PostRepository._range_filter(since, unanalyzed)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {', '.join('p.' + c for c in columns)} FROM posts p {join} "
+                f"WHERE p.id > ? AND p.id <= ?{where} ORDER BY p.id",
+                [after_id, last_id] + params
+            )
+            rows = cursor.fetchall()
+            return {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+
+    @staticmethod
+    def daily_counts(start: str | None = None, end: str | None = None) -> dict[str, int]:
+        """Posts per day (YYYY-MM-DD) with start <= day <= end."""
+        query = "SELECT substr(timestamp, 1, 10) AS day, COUNT(*) FROM posts WHERE timestamp IS NOT NULL"
+        params = []
+        if start:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end:
+            query += " AND timestamp < ?"
+            params.append(end + "~")
+        query += " GROUP BY day"
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
     @staticmethod
     def count() -> int:
         """Count total posts."""
@@ -232,52 +513,153 @@ class PostRepository:
 class AnalysisRepository:
     """Repository for analysis operations."""
 
+    _COLUMNS = """
+        (post_id, discourse_patterns, dominant_pattern, primary_archetype,
+         secondary_archetype, discourse_position, confidence, novelty_score,
+         journey_start, journey_end, journey_trigger, meta_denial_detected,
+         question_consumption, raw_analysis, analysis_tier, analyzed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _row(analysis: dict) -> tuple:
+        """Flatten an analysis dict into an analyses row."""
+        import json
+        discourse = analysis.get("discourse_analysis", {})
+        identity = analysis.get("identity_analysis", {})
+        journey = analysis.get("journey_analysis", {})
+        meta = analysis.get("meta_denial_analysis", {})
+        consumption = analysis.get("question_consumption", {})
+
+        # Ensure values are properly typed for SQLite
+        novelty = analysis.get("novelty_score", 0)
+        if isinstance(novelty, dict):
+            novelty = novelty.get("score", 0.5)
+        confidence = identity.get("confidence", 0)
+        if isinstance(confidence, dict):
+            confidence = confidence.get("value", 0.5)
+
+        return (
+            analysis["post_id"],
+            json.dumps(discourse.get("patterns_detected", [])),
+            str(discourse.get("dominant_pattern", "")),
+            str(identity.get("primary_archetype", "")),
+            str(identity.get("secondary_archetype", "")),
+            str(identity.get("discourse_position", "")),
+            float(confidence) if confidence else 0.0,
+            float(novelty) if novelty else 0.0,
+            str(journey.get("start_archetype", "")),
+            str(journey.get("end_archetype", "")),
+            str(journey.get("trigger_phrase", "")),
+            1 if meta.get("is_meta_denial") else 0,
+            json.dumps(consumption),
+            json.dumps(analysis),
+            analysis.get("analysis_tier"),
+            datetime.now().isoformat(),
+        )
+
     @staticmethod
     def insert(analysis: dict) -> int:
         """Insert analysis result."""
-        import json
         with get_db() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO analyses" + AnalysisRepository._COLUMNS,
+                AnalysisRepository._row(analysis)
+            )
+            return cursor.lastrowid
 
-            discourse = analysis.get("discourse_analysis", {})
-            identity = analysis.get("identity_analysis", {})
-            journey = analysis.get("journey_analysis", {})
-            meta = analysis.get("meta_denial_analysis", {})
-            consumption = analysis.get("question_consumption", {})
+    @staticmethod
+    def insert_many(analyses) -> int:
+        """Insert analyses for posts that have none yet (existing rows are kept)."""
+        return AnalysisRepository.insert_rows(AnalysisRepository._row(analysis) for analysis in analyses)
 
-            # Ensure values are properly typed for SQLite
-            novelty = analysis.get("novelty_score", 0)
-            if isinstance(novelty, dict):
-                novelty = novelty.get("score", 0.5)
-            confidence = identity.get("confidence", 0)
-            if isinstance(confidence, dict):
-                confidence = confidence.get("value", 0.5)
+    @staticmethod
+    def insert_rows(rows, replace: bool = False) -> int:
+        """Insert pre-flattened rows (see _row); returns the number written."""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with get_db() as conn:
+            cursor = conn.cursor()
+            before = conn.total_changes
+            cursor.executemany(verb + " INTO analyses" + AnalysisRepository._COLUMNS, rows)
+            return conn.total_changes - before
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO analyses
-                (post_id, discourse_patterns, dominant_pattern, primary_archetype,
-                 secondary_archetype, discourse_position, confidence, novelty_score,
-                 journey_start, journey_end, journey_trigger, meta_denial_detected,
-                 question_consumption, raw_analysis, analyzed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                analysis["post_id"],
-                json.dumps(discourse.get("patterns_detected", [])),
-                str(discourse.get("dominant_pattern", "")),
-                str(identity.get("primary_archetype", "")),
-                str(identity.get("secondary_archetype", "")),
-                str(identity.get("discourse_position", "")),
-                float(confidence) if confidence else 0.0,
-                float(novelty) if novelty else 0.0,
-                str(journey.get("start_archetype", "")),
-                str(journey.get("end_archetype", "")),
-                str(journey.get("trigger_phrase", "")),
-                1 if meta.get("is_meta_denial") else 0,
-                json.dumps(consumption),
-                json.dumps(analysis),
-                datetime.now().isoformat(),
-            ))
-            return cursor.lastrowid
+    @staticmethod
+    def get_raw_after(
+        after_timestamp: str | None = None,
+        after_post_id: str = "",
+        limit: int = 5000,
+        since: str | None = None,
+    ) -> list[tuple]:
+        """
+        Stored analyses in post time order after the (timestamp, post_id) key.
+
+        Returns:
+            [(post_id, agent_id, timestamp, submolt, analyzed_at, raw_analysis JSON)]
+        """
+        query = """
+            SELECT p.post_id, p.agent_id, p.timestamp, p.submolt, a.analyzed_at, a.raw_analysis
+            FROM analyses a JOIN posts p ON p.post_id = a.post_id
+            WHERE 1=1
+        """
+        params = []
+        if after_timestamp is not None:
+            query += " AND (p.timestamp, p.post_id) > (?, ?)"
+            params += [after_timestamp, after_post_id]
+        if since:
+            query += " AND p.timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY p.timestamp, p.post_id LIMIT ?"
+        params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def count_since(since: str | None = None) -> int:
+        """Count analyses of posts with timestamp >= since."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            if since:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM analyses a JOIN posts p ON p.post_id = a.post_id
+                    WHERE p.timestamp >= ?
+                """, (since,))
+            else:
+                cursor.execute("SELECT COUNT(*) FROM analyses")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def count_by_tier() -> dict[str, int]:
+        """Count analyses per analysis tier (None = recorded before tiers existed)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT analysis_tier, COUNT(*) FROM analyses GROUP BY analysis_tier")
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
+    @staticmethod
+    def get_llm_labeled(limit: int | None = None) -> list[tuple[str, dict]]:
+        """(post content, raw_analysis) for analyses produced by Solar Pro."""
+        import json
+        query = """
+            SELECT p.content, a.raw_analysis FROM analyses a
+            JOIN posts p ON p.post_id = a.post_id
+            WHERE a.analysis_tier IS NULL OR a.analysis_tier = 'llm'
+            ORDER BY a.post_id
+        """
+        labeled = []
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            for content, raw in cursor:
+                analysis = json.loads(raw) if raw else {}
+                # 규칙 기반 결과(토픽_분석 없음)는 제외
+                if "토픽_분석" in analysis:
+                    labeled.append((content or "", analysis))
+                    if limit and len(labeled) >= limit:
+                        break
+        return labeled
 
     @staticmethod
     def get_by_post(post_id: str) -> dict | None:
@@ -313,5 +695,821 @@ class AnalysisRepository:
             return results
 
 
+class TrendSummaryRepository:
+    """Repository for cached trend summaries."""
+
+    @staticmethod
+    def get(cache_key: str) -> dict | None:
+        """Get a cached summary by key."""
+        import json
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT summary FROM trend_summaries WHERE cache_key = ?", (cache_key,))
+            row = cursor.fetchone()
+            return json.loads(row["summary"]) if row else None
+
+    @staticmethod
+    def put(cache_key: str, level: int, time_window: str, post_count: int, summary: dict) -> None:
+        """Store a summary."""
+        import json
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO trend_summaries
+                (cache_key, level, time_window, post_count, summary)
+                VALUES (?, ?, ?, ?, ?)
+            """, (cache_key, level, time_window, post_count, json.dumps(summary, ensure_ascii=False)))
+
+
+class DedupRepository:
+    """Repository for MinHash signatures, LSH buckets and near-duplicate clusters."""
+
+    @staticmethod
+    def find_candidates(band_keys: list[str]) -> list[str]:
+        """Post IDs sharing at least one LSH bucket."""
+        if not band_keys:
+            return []
+        post_ids = {}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(band_keys), 900):
+                chunk = band_keys[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT DISTINCT post_id FROM lsh_buckets WHERE band_key IN ({placeholders})",
+                    chunk
+                )
+                post_ids.update(dict.fromkeys(row[0] for row in cursor.fetchall()))
+        return list(post_ids)
+
+    @staticmethod
+    def get_signatures(post_ids: list[str]) -> dict[str, bytes]:
+        """Stored MinHash signatures by post ID."""
+        if not post_ids:
+            return {}
+        signatures = {}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(post_ids), 900):
+                chunk = post_ids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT post_id, minhash FROM posts WHERE minhash IS NOT NULL AND post_id IN ({placeholders})",
+                    chunk
+                )
+                signatures.update((row[0], row[1]) for row in cursor.fetchall())
+        return signatures
+
+    @staticmethod
+    def get_clusters(post_ids: list[str]) -> dict[str, str]:
+        """Cluster IDs by post ID (only indexed posts)."""
+        if not post_ids:
+            return {}
+        clusters = {}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(post_ids), 900):
+                chunk = post_ids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT post_id, cluster_id FROM post_clusters WHERE post_id IN ({placeholders})",
+                    chunk
+                )
+                clusters.update((row[0], row[1]) for row in cursor.fetchall())
+        return clusters
+
+    @staticmethod
+    def get_cluster_members(cluster_id: str) -> list[str]:
+        """Post IDs in a cluster."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT post_id FROM post_clusters WHERE cluster_id = ?", (cluster_id,))
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def insert_many(rows: list[tuple[str, str, bytes, list[str]]]) -> None:
+        """Store (post_id, cluster_id, signature, band_keys) rows."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE posts SET minhash = ? WHERE post_id = ?",
+                [(signature, post_id) for post_id, _, signature, _ in rows]
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO post_clusters (post_id, cluster_id) VALUES (?, ?)",
+                [(post_id, cluster_id) for post_id, cluster_id, _, _ in rows]
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (band_key, post_id) VALUES (?, ?)",
+                [(key, post_id) for post_id, _, _, keys in rows for key in keys]
+            )
+
+    @staticmethod
+    def get_unindexed_posts(limit: int = 500) -> list[dict]:
+        """Posts without a signature or cluster assignment, oldest first."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.post_id, p.content FROM posts p
+                LEFT JOIN post_clusters c ON c.post_id = p.post_id
+                WHERE c.post_id IS NULL OR p.minhash IS NULL
+                ORDER BY p.timestamp ASC
+                LIMIT ?
+            """, (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_campaigns(min_size: int = 3, limit: int = 20) -> list[dict]:
+        """Largest clusters with agent counts, time span and a sample post."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.cluster_id,
+                       COUNT(*) AS size,
+                       COUNT(DISTINCT p.agent_id) AS agent_count,
+                       MIN(p.timestamp) AS first_seen,
+                       MAX(p.timestamp) AS last_seen,
+                       (SELECT content FROM posts WHERE post_id = c.cluster_id) AS sample
+                FROM post_clusters c
+                JOIN posts p ON p.post_id = c.post_id
+                GROUP BY c.cluster_id
+                HAVING COUNT(*) >= ?
+                ORDER BY size DESC, last_seen DESC
+                LIMIT ?
+            """, (min_size, limit))
+            return [dict(row) for row in cursor.fetchall()]
+
+
+class NoveltyRepository:
+    """Repository for ingest-time novelty scores."""
+
+    @staticmethod
+    def get_scores(post_ids: list[str]) -> dict[str, float]:
+        """Stored novelty scores for the given posts."""
+        if not post_ids:
+            return {}
+        scores = {}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(post_ids), 900):
+                chunk = post_ids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT post_id, score FROM post_novelty WHERE post_id IN ({placeholders})",
+                    chunk
+                )
+                scores.update((row[0], row[1]) for row in cursor.fetchall())
+        return scores
+
+    @staticmethod
+    def insert_many(scores: list[tuple[str, float]]) -> None:
+        """Store (post_id, score) rows; posts that already have a score keep it."""
+        now = datetime.now().isoformat()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR IGNORE INTO post_novelty (post_id, score, scored_at) VALUES (?, ?, ?)",
+                [(post_id, score, now) for post_id, score in scores]
+            )
+
+    @staticmethod
+    def get_unscored_posts(limit: int = 1000) -> list[dict]:
+        """Posts without a novelty score, oldest first."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.post_id, p.content, p.timestamp FROM posts p
+                LEFT JOIN post_novelty n ON n.post_id = p.post_id
+                WHERE n.post_id IS NULL
+                ORDER BY p.timestamp ASC
+                LIMIT ?
+            """, (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def clear() -> None:
+        """Drop all scores (before rebuilding the index)."""
+        with get_db() as conn:
+            conn.execute("DELETE FROM post_novelty")
+
+
+class AgentIdentityRepository:
+    """Repository for rolling agent identity state."""
+
+    @staticmethod
+    def get(agent_id: str) -> dict | None:
+        """Get an agent's identity state."""
+        import json
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM agent_identity_state WHERE agent_id = ?", (agent_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            result = dict(row)
+            result["state"] = json.loads(result["state"])
+            return result
+
+    @staticmethod
+    def put(agent_id: str, state: dict, last_timestamp: str, last_post_id: str, posts_folded: int) -> None:
+        """Store an agent's identity state after folding in posts up to (last_timestamp, last_post_id)."""
+        import json
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO agent_identity_state
+                (agent_id, state, last_timestamp, last_post_id, posts_folded, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                agent_id,
+                json.dumps(state, ensure_ascii=False),
+                last_timestamp,
+                last_post_id,
+                posts_folded,
+                datetime.now().isoformat(),
+            ))
+
+    @staticmethod
+    def clear(agent_id: str) -> None:
+        """Forget an agent's state (next classification starts over)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM agent_identity_state WHERE agent_id = ?", (agent_id,))
+
+
+class EventRepository:
+    """Repository for detected discourse events."""
+
+    # Event keys stored in their own columns; everything else goes to metadata
+    _FIELDS = ("event_id", "type", "timestamp", "post_id", "agent_id", "description")
+
+    @staticmethod
+    def _event(row) -> dict:
+        import json
+        event = {
+            "event_id": row["event_id"],
+            "type": row["event_type"],
+            "timestamp": row["detected_at"],
+            "post_id": row["post_id"],
+            "agent_id": row["agent_id"],
+        }
+        if row["description"]:
+            event["description"] = row["description"]
+        event.update(json.loads(row["metadata"] or "{}"))
+        return event
+
+    @staticmethod
+    def _log_row(event: dict) -> tuple:
+        import hashlib
+        import json
+        payload = json.dumps(event, ensure_ascii=False, sort_keys=True, default=str)
+        return (
+            event["event_id"],
+            event["type"],
+            event.get("post_id"),
+            event.get("agent_id"),
+            event.get("description"),
+            json.dumps({k: v for k, v in event.items() if k not in EventRepository._FIELDS}, ensure_ascii=False),
+            event.get("timestamp") or datetime.now().isoformat(),
+            hashlib.sha1(payload.encode("utf-8")).hexdigest(),
+        )
+
+    @staticmethod
+    def append(events: list[dict], sources: dict[str, str | None] | None = None) -> int:
+        """
+        Append events to the event log in one transaction.
+
+        An event identical to its latest logged (or compacted) version is
+        skipped, so re-ingesting the same events is a no-op; a changed event
+        appends a new version. `sources` (post_id -> analyzed_at) marks posts as run
+        through detection.
+
+        Returns:
+            Number of log entries appended
+        """
+        now = datetime.now().isoformat()
+        rows = [EventRepository._log_row(event) + (now,) for event in events]
+        with get_db() as conn:
+            cursor = conn.cursor()
+            before = conn.total_changes
+            cursor.executemany("""
+                INSERT INTO event_log
+                (event_id, event_type, post_id, agent_id, description, metadata, detected_at, payload_hash, logged_at)
+                SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9
+                WHERE COALESCE(
+                    (SELECT payload_hash FROM event_log WHERE event_id = ?1 ORDER BY seq DESC LIMIT 1),
+                    (SELECT payload_hash FROM events WHERE event_id = ?1)
+                ) IS NOT ?8
+            """, rows)
+            appended = conn.total_changes - before
+            if sources:
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO event_sources (post_id, analyzed_at, processed_at) VALUES (?, ?, ?)
+                """, [(post_id, analyzed_at, now) for post_id, analyzed_at in sources.items()])
+        return appended
+
+    @staticmethod
+    def pending_log_entries() -> int:
+        """Log entries not compacted yet."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM event_log")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def compact() -> int:
+        """
+        Fold the event log into the events table (latest version per
+        event_id wins) and drop the folded entries.
+
+        Returns:
+            Number of log entries compacted
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(seq), COUNT(*) FROM event_log")
+            watermark, entries = cursor.fetchone()
+            if not entries:
+                return 0
+            cursor.execute("""
+                INSERT INTO events (event_id, event_type, post_id, agent_id, description, metadata, detected_at, payload_hash)
+                SELECT event_id, event_type, post_id, agent_id, description, metadata, detected_at, payload_hash
+                FROM event_log
+                WHERE seq IN (SELECT MAX(seq) FROM event_log WHERE seq <= ? GROUP BY event_id)
+                ON CONFLICT(event_id) DO UPDATE SET
+                    event_type = excluded.event_type,
+                    post_id = excluded.post_id,
+                    agent_id = excluded.agent_id,
+                    description = excluded.description,
+                    metadata = excluded.metadata,
+                    detected_at = excluded.detected_at,
+                    payload_hash = excluded.payload_hash
+            """, (watermark,))
+            cursor.execute("DELETE FROM event_log WHERE seq <= ?", (watermark,))
+        return entries
+
+    @staticmethod
+    def processed_posts(post_ids: list[str]) -> dict[str, str | None]:
+        """post_id -> analyzed_at of the analysis last run through detection."""
+        processed = {}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(post_ids), 900):
+                chunk = post_ids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT post_id, analyzed_at FROM event_sources WHERE post_id IN ({placeholders})",
+                    chunk
+                )
+                processed.update((row[0], row[1]) for row in cursor.fetchall())
+        return processed
+
+    @staticmethod
+    def get_range(
+        start: str | None = None,
+        end: str | None = None,
+        event_type: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Events with start <= timestamp < end, oldest first."""
+        query = "SELECT * FROM events WHERE 1=1"
+        params = []
+        if start:
+            query += " AND detected_at >= ?"
+            params.append(start)
+        if end:
+            query += " AND detected_at < ?"
+            params.append(end)
+        if event_type:
+            query += " AND event_type = ?"
+            params.append(event_type)
+        query += " ORDER BY detected_at ASC, id ASC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [EventRepository._event(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def count() -> int:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM events")
+            return cursor.fetchone()[0]
+
+
+class QuestionRepository:
+    """Repository for question lifecycles and their mentions."""
+
+    @staticmethod
+    def _question(row) -> dict:
+        import json
+        lifecycle = json.loads(row["lifecycle"]) if row["lifecycle"] else {}
+        lifecycle.setdefault("stage", row["lifecycle_stage"])
+        lifecycle.setdefault("first_seen", row["first_seen"])
+        lifecycle.setdefault("peak_date", row["peak_date"])
+        lifecycle.setdefault("rejection_start", row["rejection_start"])
+        return {
+            "question_id": row["question_id"],
+            "canonical_form": row["canonical_form"],
+            "variants": json.loads(row["variants"] or "[]"),
+            "lifecycle": lifecycle,
+            "mention_count": row["mention_count"] or 0,
+            "rejection_count": row["rejection_count"] or 0,
+        }
+
+    @staticmethod
+    def get_all() -> list[dict]:
+        """All questions (without mentions)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM questions ORDER BY id")
+            return [QuestionRepository._question(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def save_changes(questions: list[dict], mentions: list[tuple], hours: list[tuple[str, str]]) -> dict[str, dict]:
+        """
+        Merge a tracker's changes into the stored questions in one transaction.
+
+        Mentions are inserted (ones already stored are ignored) and the stored
+        counters are incremented by the rows actually added. The touched hour
+        and day rollups are recomputed from the stored mentions, and every
+        other stored day is kept, so another process writing the same
+        questions meanwhile is merged with, not overwritten. Stage and rates
+        come from `questions`.
+
+        Args:
+            questions: Changed questions (tracker state)
+            mentions: New (question_id, post_id, agent_id, stance, timestamp) rows
+            hours: (question_id, hour) buckets the new mentions fall in
+
+        Returns:
+            {question_id: question as stored after the merge}
+        """
+        import json
+        now = datetime.now().isoformat()
+        grouped = {}
+        for mention in mentions:
+            grouped.setdefault(mention[0], ([], []))[mention[3] == "reject"].append(mention)
+        qids = [q["question_id"] for q in questions]
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # 다른 프로세스의 저장과 겹치지 않도록 쓰기 잠금을 먼저 잡음
+            cursor.execute("BEGIN IMMEDIATE")
+            insert = """
+                INSERT OR IGNORE INTO question_mentions (question_id, post_id, agent_id, stance, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            """
+            added = {}
+            for qid, (others, rejects) in grouped.items():
+                counts = []
+                for rows in (others, rejects):
+                    cursor.executemany(insert, rows)
+                    counts.append(max(cursor.rowcount, 0) if rows else 0)
+                added[qid] = (sum(counts), counts[1])
+
+            bucket = """
+                SELECT COUNT(*), COALESCE(SUM(stance = 'reject'), 0), COUNT(DISTINCT agent_id)
+                FROM question_mentions WHERE question_id = ? AND timestamp >= ? AND timestamp < ?
+            """
+            peak_hours = {}
+            for qid, hour in hours:
+                cursor.execute(bucket, (qid, hour, hour + "~"))
+                mentions_, rejections, agents = cursor.fetchone()
+                cursor.execute("""
+                    INSERT OR REPLACE INTO question_rollups (question_id, hour, mentions, rejections, agents)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (qid, hour, mentions_, rejections, agents))
+                if mentions_ > peak_hours.get(qid, (None, 0))[1]:
+                    peak_hours[qid] = (hour, mentions_)
+            days = {}
+            for qid, day in sorted({(qid, hour[:10]) for qid, hour in hours}):
+                cursor.execute(bucket, (qid, day, day + "~"))
+                mentions_, rejections, agents = cursor.fetchone()
+                days.setdefault(qid, {})[day] = {
+                    "date": day, "mentions": mentions_, "rejections": rejections, "agents": agents,
+                }
+
+            stored = {}
+            for start in range(0, len(qids), 900):
+                chunk = qids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"SELECT * FROM questions WHERE question_id IN ({placeholders})", chunk)
+                stored.update((row["question_id"], QuestionRepository._question(row)) for row in cursor.fetchall())
+
+            merged, rows = {}, []
+            for q in questions:
+                qid = q["question_id"]
+                old = stored.get(qid)
+                old_lifecycle = old["lifecycle"] if old else {}
+                lifecycle = dict(q["lifecycle"])
+                daily = {d["date"]: d for d in old_lifecycle.get("daily_mentions") or []}
+                daily.update(days.get(qid, {}))
+                lifecycle["daily_mentions"] = [daily[day] for day in sorted(daily)]
+                peak = max(lifecycle["daily_mentions"], key=lambda d: d["mentions"], default=None)
+                lifecycle["peak_date"] = peak["date"] if peak else None
+                lifecycle["peak_mentions"] = peak["mentions"] if peak else 0
+                hour, hour_mentions = peak_hours.get(qid, (None, 0))
+                if old_lifecycle.get("peak_hour_mentions", 0) >= hour_mentions:
+                    hour, hour_mentions = old_lifecycle.get("peak_hour"), old_lifecycle.get("peak_hour_mentions", 0)
+                lifecycle["peak_hour"], lifecycle["peak_hour_mentions"] = hour, hour_mentions
+                for key in ("first_seen", "rejection_start"):
+                    lifecycle[key] = min(filter(None, [old_lifecycle.get(key), lifecycle.get(key)]), default=None)
+                variants = list(old["variants"]) if old else []
+                variants += [v for v in q.get("variants", []) if v not in variants]
+                mentions_, rejections = added.get(qid, (0, 0))
+
+                merged[qid] = {
+                    "question_id": qid,
+                    "canonical_form": old["canonical_form"] if old else q["canonical_form"],
+                    "variants": variants,
+                    "lifecycle": lifecycle,
+                    "mention_count": (old["mention_count"] if old else 0) + mentions_,
+                    "rejection_count": (old["rejection_count"] if old else 0) + rejections,
+                }
+                rows.append((
+                    qid,
+                    merged[qid]["canonical_form"],
+                    json.dumps(variants, ensure_ascii=False),
+                    lifecycle.get("stage", "emergence"),
+                    lifecycle.get("first_seen"),
+                    lifecycle.get("peak_date"),
+                    lifecycle.get("rejection_start"),
+                    mentions_,
+                    rejections,
+                    json.dumps(lifecycle, ensure_ascii=False),
+                    now,
+                ))
+            cursor.executemany("""
+                INSERT INTO questions
+                (question_id, canonical_form, variants, lifecycle_stage, first_seen, peak_date,
+                 rejection_start, mention_count, rejection_count, lifecycle, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(question_id) DO UPDATE SET
+                    variants = excluded.variants,
+                    lifecycle_stage = excluded.lifecycle_stage,
+                    first_seen = excluded.first_seen,
+                    peak_date = excluded.peak_date,
+                    rejection_start = excluded.rejection_start,
+                    mention_count = mention_count + excluded.mention_count,
+                    rejection_count = rejection_count + excluded.rejection_count,
+                    lifecycle = excluded.lifecycle,
+                    updated_at = excluded.updated_at
+            """, rows)
+        return merged
+
+    @staticmethod
+    def get_mentions(question_id: str, stance: str | None = None) -> list[dict]:
+        """Mentions of a question, oldest first."""
+        query = "SELECT post_id, agent_id, timestamp, stance FROM question_mentions WHERE question_id = ?"
+        params = [question_id]
+        if stance:
+            query += " AND stance = ?"
+            params.append(stance)
+        query += " ORDER BY timestamp ASC, id ASC"
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def posts_with_mentions(post_ids: list[str]) -> set[str]:
+        """The given posts that already have question mentions."""
+        found = set()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(post_ids), 900):
+                chunk = post_ids[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT DISTINCT post_id FROM question_mentions WHERE post_id IN ({placeholders})",
+                    chunk
+                )
+                found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    @staticmethod
+    def clear() -> None:
+        """Delete all questions, mentions and rollups (before a rebuild)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM question_mentions")
+            cursor.execute("DELETE FROM question_rollups")
+            cursor.execute("DELETE FROM questions")
+
+    @staticmethod
+    def bucket_agents(question_id: str, bucket: str) -> set[str]:
+        """Distinct agents that mentioned a question in a day/hour bucket (timestamp prefix)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT agent_id FROM question_mentions
+                WHERE question_id = ? AND timestamp >= ? AND timestamp < ?
+            """, (question_id, bucket, bucket + "~"))
+            return {row[0] for row in cursor.fetchall()}
+
+    @staticmethod
+    def get_rollups(question_id: str, start: str | None = None, end: str | None = None) -> list[dict]:
+        """Hourly rollups of a question with start <= hour < end, oldest first."""
+        query = "SELECT hour, mentions, rejections, agents FROM question_rollups WHERE question_id = ?"
+        params = [question_id]
+        if start:
+            query += " AND hour >= ?"
+            params.append(start)
+        if end:
+            query += " AND hour < ?"
+            params.append(end)
+        query += " ORDER BY hour"
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def latest_hour() -> str | None:
+        """Latest hour (YYYY-MM-DDTHH) with a stored mention."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(hour) FROM question_rollups")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def rebuild_rollups(question_ids: list[str]) -> dict[str, list[dict]]:
+        """
+        Recompute the rollups of questions from their stored mentions.
+
+        Hourly rollups are rewritten in question_rollups; daily ones are
+        returned as {question_id: [{"date", "mentions", "rejections", "agents"}]}.
+        """
+        if not question_ids:
+            return {}
+        daily = {qid: [] for qid in question_ids}
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # SQLite 변수 개수 제한 때문에 나눠서 처리
+            for start in range(0, len(question_ids), 900):
+                chunk = question_ids[start:start + 900]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"DELETE FROM question_rollups WHERE question_id IN ({placeholders})", chunk)
+                cursor.execute(f"""
+                    INSERT INTO question_rollups (question_id, hour, mentions, rejections, agents)
+                    SELECT question_id, substr(timestamp, 1, 13), COUNT(*), SUM(stance = 'reject'), COUNT(DISTINCT agent_id)
+                    FROM question_mentions WHERE question_id IN ({placeholders})
+                    GROUP BY question_id, substr(timestamp, 1, 13)
+                """, chunk)
+                cursor.execute(f"""
+                    SELECT question_id, substr(timestamp, 1, 10) AS day, COUNT(*) AS mentions,
+                           SUM(stance = 'reject') AS rejections, COUNT(DISTINCT agent_id) AS agents
+                    FROM question_mentions WHERE question_id IN ({placeholders})
+                    GROUP BY question_id, day ORDER BY question_id, day
+                """, chunk)
+                for row in cursor.fetchall():
+                    daily[row["question_id"]].append({
+                        "date": row["day"],
+                        "mentions": row["mentions"],
+                        "rejections": row["rejections"],
+                        "agents": row["agents"],
+                    })
+        return daily
+
+
+class TrajectoryRepository:
+    """Repository for agent identity trajectories and profiles."""
+
+    @staticmethod
+    def _point(row) -> dict:
+        return {
+            "date": row["timestamp"][:10],
+            "timestamp": row["timestamp"],
+            "archetype": row["archetype"],
+            "confidence": row["confidence"],
+            "discourse_position": row["discourse_position"],
+            "sample_post": row["post_id"],
+        }
+
+    @staticmethod
+    def get_profile(agent_id: str, points: int = 100) -> dict | None:
+        """An agent's stored profile with its last `points` trajectory points."""
+        import json
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT profile FROM agents WHERE agent_id = ?", (agent_id,))
+            row = cursor.fetchone()
+            cursor.execute("""
+                SELECT * FROM agent_trajectories WHERE agent_id = ?
+                ORDER BY id DESC LIMIT ?
+            """, (agent_id, points))
+            trajectory = [TrajectoryRepository._point(r) for r in reversed(cursor.fetchall())]
+        if (row is None or not row["profile"]) and not trajectory:
+            return None
+        profile = json.loads(row["profile"]) if row and row["profile"] else {"agent_id": agent_id}
+        profile["identity_trajectory"] = trajectory
+        return profile
+
+    @staticmethod
+    def save(profiles: list[dict], points: list[tuple]) -> None:
+        """
+        Upsert agent profiles and append trajectory points in one transaction.
+
+        Args:
+            profiles: Profile dicts (the trajectory itself is not stored here).
+            points: (agent_id, post_id, archetype, confidence, discourse_position, timestamp) rows.
+        """
+        import json
+        now = datetime.now().isoformat()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO agents (agent_id, profile, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT(agent_id) DO UPDATE SET profile = excluded.profile, last_seen = excluded.last_seen
+            """, [
+                (
+                    p["agent_id"],
+                    json.dumps({k: v for k, v in p.items() if k != "identity_trajectory"}, ensure_ascii=False),
+                    now,
+                )
+                for p in profiles
+            ])
+            cursor.executemany("""
+                INSERT INTO agent_trajectories (agent_id, post_id, archetype, confidence, discourse_position, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, points)
+
+    @staticmethod
+    def latest_points() -> dict[str, dict]:
+        """Each agent's most recent trajectory point."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM agent_trajectories WHERE id IN (
+                    SELECT MAX(id) FROM agent_trajectories GROUP BY agent_id
+                )
+            """)
+            return {row["agent_id"]: TrajectoryRepository._point(row) for row in cursor.fetchall()}
+
+    @staticmethod
+    def shift_events() -> list[dict]:
+        """Consecutive trajectory points with different archetypes, by date."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT agent_id, timestamp, post_id, archetype, prev_archetype FROM (
+                    SELECT agent_id, timestamp, post_id, archetype,
+                           LAG(archetype) OVER (PARTITION BY agent_id ORDER BY id) AS prev_archetype
+                    FROM agent_trajectories
+                )
+                WHERE prev_archetype IS NOT NULL AND prev_archetype != archetype
+                ORDER BY timestamp
+            """)
+            return [
+                {
+                    "agent_id": row["agent_id"],
+                    "date": row["timestamp"][:10],
+                    "from": row["prev_archetype"],
+                    "to": row["archetype"],
+                    "post_id": row["post_id"],
+                }
+                for row in cursor.fetchall()
+            ]
+
+
+class JobCheckpointRepository:
+    """Repository for batch job checkpoints."""
+
+    @staticmethod
+    def get(job_id: str) -> dict | None:
+        """Get a job's checkpoint."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM job_checkpoints WHERE job_id = ?", (job_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    @staticmethod
+    def put(job_id: str, last_id: int, processed: int, last_key: str | None = None) -> None:
+        """Store a job's progress."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO job_checkpoints (job_id, last_id, processed, updated_at, last_key)
+                VALUES (?, ?, ?, ?, ?)
+            """, (job_id, last_id, processed, datetime.now().isoformat(), last_key))
+
+    @staticmethod
+    def clear(job_id: str) -> None:
+        """Forget a job's progress."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM job_checkpoints WHERE job_id = ?", (job_id,))
+
+
 # Initialize database on import
 init_db()